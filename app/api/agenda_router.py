@@ -0,0 +1,49 @@
+# En este archivo definimos las rutas o endpoints de la vista de agenda (dashboard de cada profesional).
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.schemas.agenda_schema import AgendaOut
+from app.services.agenda_service import agenda_profesional, rango_dia, rango_semana
+
+from app.core.deps import get_current_user, require_permission
+
+agenda_router = APIRouter(prefix="/agenda", tags=["agenda"])
+
+
+def _verificar_acceso(user, scope: str, profesional_id: int):
+    if scope == "OWN":
+        if not getattr(user, "profesional_id", None):
+            raise HTTPException(status_code=403, detail="Usuario sin profesional asociado.")
+        if profesional_id != user.profesional_id:
+            raise HTTPException(status_code=403, detail="No tenés acceso a esta agenda.")
+
+
+@agenda_router.get("/{profesional_id}/dia", response_model=AgendaOut)
+def obtener_agenda_dia(
+    profesional_id: int,
+    fecha: date = Query(...),
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user),
+    scope: str = Depends(require_permission("turnos.ver")),
+):
+    """
+    Turnos, bloqueos y huecos libres del día, ordenados por hora, más la cantidad de turnos por estado.
+    """
+    _verificar_acceso(user, scope, profesional_id)
+    desde, hasta = rango_dia(fecha)
+    return agenda_profesional(db, profesional_id, desde, hasta)
+
+
+@agenda_router.get("/{profesional_id}/semana", response_model=AgendaOut)
+def obtener_agenda_semana(
+    profesional_id: int,
+    fecha: date = Query(..., description="cualquier día de la semana (lunes a domingo)"),
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user),
+    scope: str = Depends(require_permission("turnos.ver")),
+):
+    _verificar_acceso(user, scope, profesional_id)
+    desde, hasta = rango_semana(fecha)
+    return agenda_profesional(db, profesional_id, desde, hasta)
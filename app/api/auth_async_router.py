@@ -0,0 +1,44 @@
+# Variante async de auth_router (se usa con DB_ASYNC_METHOD, ver app/main.py).
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+
+from app.database import get_async_db
+from app.core.security import (
+    verify_password,
+    create_access_token,
+    AUTH_PERMISOS_EN_TOKEN,
+    ACCESS_TOKEN_PERMISOS_EXPIRE_MINUTES,
+)
+from app.services.rbac_service import obtener_usuario_autenticado, claims_de_permisos
+from app.schemas.auth_schema import TokenResponse
+from app.models.usuario_model import Usuario
+
+router = APIRouter(prefix="/auth", tags=["auth"])
+
+@router.post("/login", response_model=TokenResponse)
+async def login(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+):
+    user = (await db.execute(
+        select(Usuario).where(Usuario.username == form_data.username, Usuario.activo == True)
+    )).scalar_one_or_none()
+
+    # bcrypt es CPU puro (~100 ms): afuera del event loop para no frenar al resto de los requests
+    if not user or not await run_in_threadpool(verify_password, form_data.password, user.password_hash):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Credenciales inválidas")
+
+    if AUTH_PERMISOS_EN_TOKEN:
+        usuario = await db.run_sync(obtener_usuario_autenticado, user.id)
+        token = create_access_token(
+            subject=str(user.id),
+            expires_minutes=ACCESS_TOKEN_PERMISOS_EXPIRE_MINUTES,
+            extra=claims_de_permisos(usuario),
+        )
+        return TokenResponse(access_token=token)
+
+    token = create_access_token(subject=str(user.id))
+    return TokenResponse(access_token=token)
@@ -4,7 +4,13 @@ from sqlalchemy.orm import Session
 from sqlalchemy import select
 
 from app.database import get_db
-from app.core.security import verify_password, create_access_token
+from app.core.security import (
+    verify_password,
+    create_access_token,
+    AUTH_PERMISOS_EN_TOKEN,
+    ACCESS_TOKEN_PERMISOS_EXPIRE_MINUTES,
+)
+from app.services.rbac_service import obtener_usuario_autenticado, claims_de_permisos
 from app.schemas.auth_schema import TokenResponse
 from app.models.usuario_model import Usuario
 
@@ -22,5 +28,15 @@ def login(
     if not user or not verify_password(form_data.password, user.password_hash):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Credenciales inválidas")
 
+    if AUTH_PERMISOS_EN_TOKEN:
+        # El token lleva los permisos compilados y sus versiones: require_permission no carga roles ni permisos
+        usuario = obtener_usuario_autenticado(db, user.id)
+        token = create_access_token(
+            subject=str(user.id),
+            expires_minutes=ACCESS_TOKEN_PERMISOS_EXPIRE_MINUTES,
+            extra=claims_de_permisos(usuario),
+        )
+        return TokenResponse(access_token=token)
+
     token = create_access_token(subject=str(user.id))
     return TokenResponse(access_token=token)
@@ -1,11 +1,20 @@
 # En este archivo definimos las rutas o endpoints relacionados con los bloqueos de agenda para los profesionales.
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from datetime import datetime
 
-from app.database import get_db
-from app.schemas.bloqueo_agenda_schema import BloqueoAgendaCreate, BloqueoAgendaOut
+from app.database import get_db, get_read_db
+from app.schemas.bloqueo_agenda_schema import BloqueoAgendaCreate, BloqueoAgendaOut, BloqueoRecurrenteCreate, BloqueoRecurrenteOut
 from app.models.bloqueo_agenda_model import BloqueoAgenda
+from app.models.bloqueo_recurrente_model import BloqueoRecurrente
+from app.services.perfiles_carga import opciones_bloqueo, PERFIL_LISTA
+from app.services.bloqueos_cache import invalidar_bloqueos
+from app.services.bloqueos_recurrentes_service import (
+    codificar_dias,
+    ocurrencias_recurrentes,
+    validar_rango_expansion,
+    invalidar_reglas_recurrentes,
+)
 from app.core.deps import get_current_user, require_permission
 
 bloqueos_agenda_router = APIRouter(prefix="/bloqueos_agenda", tags=["bloqueos_agenda"])
@@ -40,25 +49,150 @@ def crear_bloqueo_agenda(
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=400, detail="Error al crear el bloqueo de agenda\n" + str(e))
+    invalidar_bloqueos(bloqueo_agenda.profesional_id)
     db.refresh(bloqueo_agenda)
     return bloqueo_agenda
 
 # Agregar metodos get que devuelvan todos los bloqueos de agenda y bloqueos por id, y metodos put para actualizar bloqueos de agenda
 @bloqueos_agenda_router.get("", response_model=list[BloqueoAgendaOut])
 def obtener_bloqueos_agenda(
+    profesional_id: int | None = Query(default=None),
+    desde: datetime | None = Query(default=None),
+    hasta: datetime | None = Query(default=None),
+    limit: int = Query(default=200, ge=1, le=1000),
+    offset: int = Query(default=0, ge=0),
+    db: Session = Depends(get_read_db),
+    user = Depends(get_current_user),
+    scope: str = Depends(require_permission("agenda.bloqueos.ver")),
+):
+    """
+    Bloqueos activos ordenados por inicio, paginados con limit/offset.
+    - desde/hasta: solo los que se solapan con ese rango (sirve idx_bloq_prof_activo_rango / idx_bloq_activo_rango).
+      Con los dos, se incluyen también las ocurrencias de los bloqueos recurrentes (id None, recurrente_id seteado).
+    """
+    if desde and hasta and hasta <= desde:
+        raise HTTPException(status_code=400, detail="hasta debe ser mayor que desde")
+
+    q = db.query(BloqueoAgenda).options(*opciones_bloqueo(PERFIL_LISTA)).filter(BloqueoAgenda.activo == True)
+
+    if scope == "OWN":
+        if not getattr(user, "profesional_id", None):
+            raise HTTPException(status_code=403, detail="Usuario sin profesional asociado.")
+        profesional_id = user.profesional_id
+    if profesional_id:
+        q = q.filter(BloqueoAgenda.profesional_id == profesional_id)
+
+    if desde:
+        q = q.filter(BloqueoAgenda.fecha_hora_fin > desde)
+    if hasta:
+        q = q.filter(BloqueoAgenda.fecha_hora_inicio < hasta)
+
+    q = q.order_by(BloqueoAgenda.fecha_hora_inicio, BloqueoAgenda.id)
+
+    if not (desde and hasta):
+        return q.limit(limit).offset(offset).all()
+
+    # Mezcla de dos fuentes ordenadas: de cada una alcanza con los primeros offset + limit
+    validar_rango_expansion(desde, hasta)
+    bloqueos = [BloqueoAgendaOut.model_validate(b) for b in q.limit(offset + limit).all()]
+    ocurrencias = [
+        BloqueoAgendaOut(
+            profesional_id=o.profesional_id,
+            fecha_hora_inicio=o.fecha_hora_inicio,
+            fecha_hora_fin=o.fecha_hora_fin,
+            motivo=o.motivo,
+            recurrente_id=o.recurrente_id,
+        )
+        for o in ocurrencias_recurrentes(db, profesional_id or None, desde, hasta)[:offset + limit]
+    ]
+    todos = sorted(bloqueos + ocurrencias, key=lambda b: b.fecha_hora_inicio)
+    return todos[offset:offset + limit]
+
+@bloqueos_agenda_router.post("/recurrentes", response_model=BloqueoRecurrenteOut)
+def crear_bloqueo_recurrente(
+    payload: BloqueoRecurrenteCreate,
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user),
+    scope: str = Depends(require_permission("agenda.bloqueos.crear")),
+):
+    if payload.hora_fin <= payload.hora_inicio:
+        raise HTTPException(status_code=400, detail="hora_fin debe ser mayor que hora_inicio")
+    if payload.vigente_hasta and payload.vigente_hasta < payload.vigente_desde:
+        raise HTTPException(status_code=400, detail="vigente_hasta no puede ser anterior a vigente_desde")
+    if not payload.dias_semana or any(d < 0 or d > 6 for d in payload.dias_semana):
+        raise HTTPException(status_code=400, detail="dias_semana debe tener valores entre 0 (lunes) y 6 (domingo)")
+
+    profesional_id = payload.profesional_id
+    if scope == "OWN":
+        if not getattr(user, "profesional_id", None):
+            raise HTTPException(status_code=403, detail="Usuario sin profesional asociado.")
+        profesional_id = user.profesional_id
+
+    bloqueo = BloqueoRecurrente(
+        profesional_id = profesional_id,
+        dias_semana = codificar_dias(payload.dias_semana),
+        hora_inicio = payload.hora_inicio,
+        hora_fin = payload.hora_fin,
+        vigente_desde = payload.vigente_desde,
+        vigente_hasta = payload.vigente_hasta,
+        motivo = payload.motivo,
+        creado_por_usuario_id = user.id,
+    )
+
+    db.add(bloqueo)
+    invalidar_reglas_recurrentes(db, profesional_id)
+    try:
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Error al crear el bloqueo recurrente\n" + str(e))
+    invalidar_bloqueos(bloqueo.profesional_id)
+    db.refresh(bloqueo)
+    return bloqueo
+
+@bloqueos_agenda_router.get("/recurrentes", response_model=list[BloqueoRecurrenteOut])
+def obtener_bloqueos_recurrentes(
+    profesional_id: int | None = Query(default=None),
     db: Session = Depends(get_db),
     user = Depends(get_current_user),
     scope: str = Depends(require_permission("agenda.bloqueos.ver")),
 ):
+    q = db.query(BloqueoRecurrente).filter(BloqueoRecurrente.activo == True)
+
+    if scope == "OWN":
+        if not getattr(user, "profesional_id", None):
+            raise HTTPException(status_code=403, detail="Usuario sin profesional asociado.")
+        profesional_id = user.profesional_id
+    if profesional_id:
+        q = q.filter(BloqueoRecurrente.profesional_id == profesional_id)
 
-    q = db.query(BloqueoAgenda).filter(BloqueoAgenda.activo == True)
+    return q.order_by(BloqueoRecurrente.profesional_id, BloqueoRecurrente.id).all()
+
+@bloqueos_agenda_router.delete("/recurrentes/{recurrente_id}")
+def eliminar_bloqueo_recurrente(
+    recurrente_id: int,
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user),
+    scope: str = Depends(require_permission("agenda.bloqueos.eliminar")),
+):
+    bloqueo = db.get(BloqueoRecurrente, recurrente_id)
+    if not bloqueo or not bloqueo.activo:
+        raise HTTPException(status_code=404, detail="Bloqueo recurrente no encontrado.")
 
     if scope == "OWN":
         if not getattr(user, "profesional_id", None):
             raise HTTPException(status_code=403, detail="Usuario sin profesional asociado.")
-        q = q.filter(BloqueoAgenda.profesional_id == user.profesional_id)
+        if bloqueo.profesional_id != user.profesional_id:
+            raise HTTPException(status_code=403, detail="No tenés acceso a este bloqueo.")
 
-    return q.all()
+    bloqueo.activo = False
+    bloqueo.eliminado_en = datetime.utcnow()
+    bloqueo.eliminado_por_usuario_id = user.id
+    invalidar_reglas_recurrentes(db, bloqueo.profesional_id)
+
+    db.commit()
+    invalidar_bloqueos(bloqueo.profesional_id)
+    return {"ok": True}
 
 @bloqueos_agenda_router.get("/{bloqueo_id}", response_model=BloqueoAgendaOut)
 def obtener_bloqueo_por_id(
@@ -101,4 +235,5 @@ def eliminar_bloqueo(
     bloqueo.eliminado_por_usuario_id = user.id
 
     db.commit()
+    invalidar_bloqueos(bloqueo.profesional_id)
     return {"ok": True}
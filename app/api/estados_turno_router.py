@@ -7,6 +7,7 @@ estados_turno_router = APIRouter(prefix="/estados_turno", tags=["estados_turno"]
 from app.models.estado_turno_model import EstadoTurno
 from app.schemas.estado_turno_schema import EstadoTurnoOut
 from app.database import get_db
+from app.services.estados_turno_service import refrescar_estados_turno
 
 from app.core.deps import get_current_user, require_permission
 
@@ -18,4 +19,19 @@ def obtener_estados_turno(
     scope: str = Depends(require_permission("estados_turno.ver")),
 ):
     estados = db.query(EstadoTurno).all()
-    return estados
\ No newline at end of file
+    return estados
+
+
+@estados_turno_router.post("/refrescar", response_model=list[EstadoTurnoOut])
+def refrescar_estados(
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user),
+    scope: str = Depends(require_permission("estados_turno.editar")),
+):
+    """
+    Recarga el registro en memoria codigo <-> id (por ej. después de agregar un estado a mano en la base).
+    Solo refresca el proceso que atiende el request: los demás workers cargan un estado nuevo
+    la primera vez que lo piden (estado_id_por_codigo / codigo_por_estado_id refrescan si no lo encuentran).
+    """
+    refrescar_estados_turno(db)
+    return db.query(EstadoTurno).all()
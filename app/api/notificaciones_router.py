@@ -0,0 +1,62 @@
+# En este archivo definimos las rutas o endpoints para consultar y reencolar notificaciones.
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from sqlalchemy import select
+
+from app.database import get_db
+from app.models.notificacion_model import Notificacion
+from app.schemas.notificacion_schema import NotificacionOut, ReencolarNotificaciones, ReencolarNotificacionesOut
+from app.services.notificaciones_service import reencolar_notificaciones
+
+from app.core.deps import get_current_user, require_permission
+
+notificaciones_router = APIRouter(prefix="/notificaciones", tags=["notificaciones"])
+
+@notificaciones_router.get("", response_model=list[NotificacionOut])
+def obtener_notificaciones(
+    estado: Literal["PENDIENTE", "ENVIADA", "FALLIDA", "CANCELADA"] = Query(default="FALLIDA"),
+    turno_id: int | None = Query(default=None),
+    limit: int = Query(default=100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user),
+    scope: str = Depends(require_permission("notificaciones.ver")),
+):
+    q = select(Notificacion).where(Notificacion.estado == estado)
+    if turno_id is not None:
+        q = q.where(Notificacion.turno_id == turno_id)
+    return db.execute(q.order_by(Notificacion.programada_para.desc()).limit(limit)).scalars().all()
+
+
+@notificaciones_router.post("/reintentar", response_model=ReencolarNotificacionesOut)
+def reintentar_notificaciones(
+    payload: ReencolarNotificaciones,
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user),
+    scope: str = Depends(require_permission("notificaciones.reintentar")),
+):
+    """
+    Vuelve a encolar notificaciones FALLIDA: intentos en cero y programadas para ahora.
+    Las que no están FALLIDA (ni agotaron los intentos) se ignoran.
+    """
+    if not payload.ids:
+        raise HTTPException(status_code=400, detail="No se enviaron ids.")
+    return ReencolarNotificacionesOut(reencoladas=reencolar_notificaciones(db, payload.ids))
+
+
+@notificaciones_router.post("/{notificacion_id}/reintentar", response_model=NotificacionOut)
+def reintentar_notificacion(
+    notificacion_id: int,
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user),
+    scope: str = Depends(require_permission("notificaciones.reintentar")),
+):
+    notificacion = db.get(Notificacion, notificacion_id)
+    if not notificacion:
+        raise HTTPException(status_code=404, detail="Notificación no encontrada.")
+
+    if not reencolar_notificaciones(db, [notificacion_id]):
+        raise HTTPException(status_code=409, detail=f"La notificación está {notificacion.estado}: solo se reintentan las FALLIDA.")
+
+    db.refresh(notificacion)
+    return notificacion
@@ -0,0 +1,76 @@
+# Variante async de pacientes_router (se usa con DB_ASYNC_METHOD, ver app/main.py).
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_db, get_read_async_db
+from app.schemas.paciente_schema import PacienteCreate, PacienteOut, PacienteUpdate, ImportacionPacientesOut
+from app.services.pacientes_service import (
+    buscar_pacientes_async,
+    crear_paciente_async,
+    obtener_paciente_async,
+    editar_paciente_async,
+)
+from app.api.pacientes_router import importar_pacientes_archivo
+
+from app.core.deps import get_current_user_async, require_permission_async
+
+paciente_async_router = APIRouter(prefix = "/pacientes", tags=["pacientes"])
+
+@paciente_async_router.post("", response_model=PacienteOut)
+async def crear_paciente(
+    payload: PacienteCreate,
+    db: AsyncSession = Depends(get_async_db),
+    user  = Depends(get_current_user_async),
+    scope: str = Depends(require_permission_async("pacientes.crear")),
+):
+    return await crear_paciente_async(db, payload)
+
+# La importación lee el archivo de forma sincrónica en streaming: queda en el threadpool con la sesión sync
+paciente_async_router.add_api_route(
+    "/importar", importar_pacientes_archivo, methods=["POST"], response_model=ImportacionPacientesOut,
+)
+
+@paciente_async_router.get("", response_model=list[PacienteOut])
+async def obtener_pacientes(
+    q: str | None = Query(default=None, max_length=100),
+    dni: str | None = Query(default=None),
+    cuil: str | None = Query(default=None),
+    telefono: str | None = Query(default=None),
+    solo_activos: bool = Query(default=False),
+    limit: int = Query(default=50, ge=1, le=500),
+    offset: int = Query(default=0, ge=0),
+    db: AsyncSession = Depends(get_read_async_db),
+    user  = Depends(get_current_user_async),
+    scope: str = Depends(require_permission_async("pacientes.crear")),
+):
+    return await buscar_pacientes_async(
+        db,
+        q = q,
+        dni = dni,
+        cuil = cuil,
+        telefono = telefono,
+        solo_activos = solo_activos,
+        limit = limit,
+        offset = offset,
+    )
+
+
+@paciente_async_router.get("/{paciente_id}", response_model=PacienteOut)
+async def obtener_paciente_por_id(
+    paciente_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    user  = Depends(get_current_user_async),
+    scope: str = Depends(require_permission_async("pacientes.crear")),
+):
+    return await obtener_paciente_async(db, paciente_id)
+
+
+@paciente_async_router.patch("/{paciente_id}", response_model=PacienteOut)
+async def editar_paciente(
+    paciente_id: int,
+    payload: PacienteUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    user=Depends(get_current_user_async),
+    scope: str = Depends(require_permission_async("pacientes.editar")),
+):
+    return await editar_paciente_async(db, paciente_id, payload)
@@ -1,11 +1,19 @@
 #En este archivo definimos las rutas o endpoints relacionados con la gestión de pacientes.
-from fastapi import APIRouter, Depends, HTTPException
+import io
+from typing import Literal
+from fastapi import APIRouter, Depends, UploadFile, File, Query
 from sqlalchemy.orm import Session
 from datetime import datetime
 
-from app.database import get_db
-from app.models.paciente_model import Paciente
-from app.schemas.paciente_schema import PacienteCreate, PacienteOut, PacienteUpdate
+from app.database import get_db, get_read_db
+from app.schemas.paciente_schema import PacienteCreate, PacienteOut, PacienteUpdate, ImportacionPacientesOut
+from app.services.pacientes_import_service import importar_pacientes
+from app.services.pacientes_service import (
+    buscar_pacientes,
+    crear_paciente as crear_paciente_service,
+    obtener_paciente,
+    editar_paciente as editar_paciente_service,
+)
 
 from app.core.deps import get_current_user, require_permission
 
@@ -19,39 +27,62 @@ def crear_paciente(
     scope: str = Depends(require_permission("pacientes.crear")),
 ):
     #crea exitosamente los pacientes pero queda modificar la tabla pacientes para que se agregen dni y cuit, y se valide que no se repitan
+    return crear_paciente_service(db, payload)
 
-    if payload.canal_contacto not in ['whatsapp', 'telegram', 'sms']:
-        raise HTTPException(
-            status_code=400, 
-            detail="Canal de contacto inválido. Debe ser 'whatsapp', 'telegram' o 'sms'."
-        )
-    
-    paciente = Paciente(
-        nombre = payload.nombre,
-        dni = payload.dni,
-        cuil = payload.cuil,
-        telefono = payload.telefono,
-        canal_contacto = payload.canal_contacto,
-    )
-    db.add(paciente)
+@paciente_router.post("/importar", response_model=ImportacionPacientesOut)
+def importar_pacientes_archivo(
+    archivo: UploadFile = File(...),
+    formato: Literal["csv", "ndjson"] | None = Query(default=None),
+    db: Session = Depends(get_db),
+    user  = Depends(get_current_user),
+    scope: str = Depends(require_permission("pacientes.crear")),
+):
+    """
+    Alta masiva de pacientes desde CSV (con encabezado nombre,dni,cuil,telefono,canal_contacto) o NDJSON.
+    Las filas inválidas o con dni/cuil repetido se rechazan y se informan sin cortar la importación.
+    También disponible por consola: python -m app.importar_pacientes archivo.csv
+    """
+    if formato is None:
+        nombre = (archivo.filename or "").lower()
+        formato = "ndjson" if nombre.endswith((".ndjson", ".jsonl")) else "csv"
+
+    texto = io.TextIOWrapper(archivo.file, encoding="utf-8-sig", newline="")
     try:
-        db.commit()
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(status_code=400, detail= "Error al crear paciente\n" + str(e))
-    db.refresh(paciente)
-    return paciente
+        return importar_pacientes(db, texto, formato)  # si hay bytes que no son UTF-8, devuelve el reporte parcial con "error"
+    finally:
+        texto.detach()
 
 # Agregar metodos get que devuelvan todos los pacientes y pacientes por id, y metodos patch para actualizar pacientes
 
 @paciente_router.get("", response_model=list[PacienteOut])
 def obtener_pacientes(
-    db: Session = Depends(get_db),
+    q: str | None = Query(default=None, max_length=100),
+    dni: str | None = Query(default=None),
+    cuil: str | None = Query(default=None),
+    telefono: str | None = Query(default=None),
+    solo_activos: bool = Query(default=False),
+    limit: int = Query(default=50, ge=1, le=500),
+    offset: int = Query(default=0, ge=0),
+    db: Session = Depends(get_read_db),
     user  = Depends(get_current_user),
     scope: str = Depends(require_permission("pacientes.crear")),
 ):
-    pacientes = db.query(Paciente).all()
-    return pacientes
+    """
+    Busca pacientes, ordenados por nombre y paginados con limit/offset.
+    - q: nombre (prefijo de cualquier palabra en MySQL, prefijo del nombre completo en otros motores)
+    - dni / cuil: exactos
+    - telefono: prefijo
+    """
+    return buscar_pacientes(
+        db,
+        q = q,
+        dni = dni,
+        cuil = cuil,
+        telefono = telefono,
+        solo_activos = solo_activos,
+        limit = limit,
+        offset = offset,
+    )
 
 
 @paciente_router.get("/{paciente_id}", response_model=PacienteOut)
@@ -61,10 +92,7 @@ def obtener_paciente_por_id(
     user  = Depends(get_current_user),
     scope: str = Depends(require_permission("pacientes.crear")),
 ):
-    paciente = db.get(Paciente, paciente_id)
-    if not paciente:
-        raise HTTPException(status_code=404, detail="Paciente no encontrado.")
-    return paciente
+    return obtener_paciente(db, paciente_id)
 
 
 @paciente_router.patch("/{paciente_id}", response_model=PacienteOut)
@@ -75,25 +103,4 @@ def editar_paciente(
     user=Depends(get_current_user),
     scope: str = Depends(require_permission("pacientes.editar")),
 ):
-    paciente = db.get(Paciente, paciente_id)
-    if not paciente:
-        raise HTTPException(status_code=404, detail="Paciente no encontrado.")
-
-    # PATCH parcial: solo se actualiza lo que vino
-    data = payload.model_dump(exclude_unset=True)
-
-    # Si no mandaron nada, evitamos un "update vacío"
-    if not data:
-        raise HTTPException(status_code=400, detail="No se enviaron campos para actualizar.")
-
-    for field, value in data.items():
-        setattr(paciente, field, value)
-
-    try:
-        db.commit()
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(status_code=400, detail="Error al editar paciente\n" + str(e))
-
-    db.refresh(paciente)
-    return paciente
\ No newline at end of file
+    return editar_paciente_service(db, paciente_id, payload)
@@ -1,10 +1,17 @@
 # En este archivo definimos las rutas o endpoints relacionados con la gestión de profesionales.
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date, datetime
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.schemas.profesional_schema import ProfesionalCreate, ProfesionalOut, ProfesionalUpdate
+from app.schemas.disponibilidad_schema import DisponibilidadOut, SlotLibreOut
+from app.schemas.horario_schema import FranjaHorarioIn, HorarioAtencionOut, ExcepcionHorarioCreate, ExcepcionHorarioOut
 from app.models.profesional_model import Profesional
+from app.models.horario_atencion_model import HorarioAtencion
+from app.models.excepcion_horario_model import ExcepcionHorario
+from app.services.disponibilidad_service import calcular_disponibilidad
+from app.services.horarios_service import invalidar_horarios
 
 from app.core.deps import get_current_user, require_permission
 
@@ -57,6 +64,37 @@ def obtener_profesional_por_id(
     return profesional
 
 
+@profesionales_router.get("/{profesional_id}/disponibilidad", response_model=DisponibilidadOut)
+def obtener_disponibilidad(
+    profesional_id: int,
+    desde: datetime = Query(...),
+    hasta: datetime = Query(...),
+    duracion_min: int | None = Query(default=None, ge=5, le=480),
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user),
+    scope: str = Depends(require_permission("turnos.ver")),
+):
+    """
+    Devuelve los slots libres del profesional entre desde y hasta.
+    - Los slots se arman sobre la grilla desde, desde + duración, ... (por defecto duracion_turno_min del profesional).
+    - Un slot está libre si no pisa ningún turno RESERVADO/CONFIRMADO ni un bloqueo de agenda activo.
+    - Si el profesional tiene horario de atención, solo hay slots dentro de sus franjas (la grilla arranca en cada franja).
+    """
+    if scope == "OWN":
+        if not getattr(user, "profesional_id", None):
+            raise HTTPException(status_code=403, detail="Usuario sin profesional asociado.")
+        if profesional_id != user.profesional_id:
+            raise HTTPException(status_code=403, detail="No tenés acceso a esta agenda.")
+
+    profesional, slots = calcular_disponibilidad(db, profesional_id, desde, hasta, duracion_min)
+
+    return DisponibilidadOut(
+        profesional_id=profesional.id,
+        duracion_turno_min=duracion_min or profesional.duracion_turno_min,
+        slots=[SlotLibreOut(fecha_hora_inicio=inicio, fecha_hora_fin=fin) for inicio, fin in slots],
+    )
+
+
 @profesionales_router.patch("/{profesional_id}", response_model=ProfesionalOut)
 def editar_profesional(
     profesional_id: int,
@@ -86,4 +124,146 @@ def editar_profesional(
         raise HTTPException(status_code=400, detail="Error al editar paciente\n" + str(e))
 
     db.refresh(profesional)
-    return profesional
\ No newline at end of file
+    return profesional
+
+
+def _profesional_o_404(db: Session, profesional_id: int) -> Profesional:
+    profesional = db.get(Profesional, profesional_id)
+    if not profesional:
+        raise HTTPException(status_code=404, detail="Profesional no encontrado.")
+    return profesional
+
+
+@profesionales_router.get("/{profesional_id}/horarios", response_model=list[HorarioAtencionOut])
+def obtener_horarios(
+    profesional_id: int,
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user),
+    scope: str = Depends(require_permission("profesionales.ver")),
+):
+    _profesional_o_404(db, profesional_id)
+    return (
+        db.query(HorarioAtencion)
+        .filter(HorarioAtencion.profesional_id == profesional_id)
+        .order_by(HorarioAtencion.dia_semana, HorarioAtencion.hora_inicio)
+        .all()
+    )
+
+
+@profesionales_router.put("/{profesional_id}/horarios", response_model=list[HorarioAtencionOut])
+def reemplazar_horarios(
+    profesional_id: int,
+    payload: list[FranjaHorarioIn],
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user),
+    scope: str = Depends(require_permission("profesionales.editar")),
+):
+    """
+    Reemplaza la plantilla semanal completa. Lista vacía = sin restricción de horario.
+    """
+    _profesional_o_404(db, profesional_id)
+
+    por_dia: dict[int, list[FranjaHorarioIn]] = {}
+    for franja in payload:
+        if franja.dia_semana < 0 or franja.dia_semana > 6:
+            raise HTTPException(status_code=400, detail="dia_semana debe estar entre 0 (lunes) y 6 (domingo)")
+        if franja.hora_fin <= franja.hora_inicio:
+            raise HTTPException(status_code=400, detail="hora_fin debe ser mayor que hora_inicio")
+        por_dia.setdefault(franja.dia_semana, []).append(franja)
+    for franjas in por_dia.values():
+        franjas.sort(key=lambda f: f.hora_inicio)
+        for anterior, siguiente in zip(franjas, franjas[1:]):
+            if siguiente.hora_inicio < anterior.hora_fin:
+                raise HTTPException(status_code=400, detail="Hay franjas superpuestas en el mismo día.")
+
+    db.query(HorarioAtencion).filter(HorarioAtencion.profesional_id == profesional_id).delete(synchronize_session=False)
+    db.add_all([
+        HorarioAtencion(
+            profesional_id=profesional_id,
+            dia_semana=f.dia_semana,
+            hora_inicio=f.hora_inicio,
+            hora_fin=f.hora_fin,
+        )
+        for f in payload
+    ])
+    invalidar_horarios(db, profesional_id)
+    try:
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Error al guardar el horario de atención\n" + str(e))
+
+    return (
+        db.query(HorarioAtencion)
+        .filter(HorarioAtencion.profesional_id == profesional_id)
+        .order_by(HorarioAtencion.dia_semana, HorarioAtencion.hora_inicio)
+        .all()
+    )
+
+
+@profesionales_router.get("/{profesional_id}/excepciones", response_model=list[ExcepcionHorarioOut])
+def obtener_excepciones(
+    profesional_id: int,
+    desde: date | None = Query(default=None),
+    hasta: date | None = Query(default=None),
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user),
+    scope: str = Depends(require_permission("profesionales.ver")),
+):
+    _profesional_o_404(db, profesional_id)
+    q = db.query(ExcepcionHorario).filter(ExcepcionHorario.profesional_id == profesional_id)
+    if desde:
+        q = q.filter(ExcepcionHorario.fecha >= desde)
+    if hasta:
+        q = q.filter(ExcepcionHorario.fecha <= hasta)
+    return q.order_by(ExcepcionHorario.fecha, ExcepcionHorario.hora_inicio).all()
+
+
+@profesionales_router.post("/{profesional_id}/excepciones", response_model=ExcepcionHorarioOut)
+def crear_excepcion(
+    profesional_id: int,
+    payload: ExcepcionHorarioCreate,
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user),
+    scope: str = Depends(require_permission("profesionales.editar")),
+):
+    _profesional_o_404(db, profesional_id)
+    if (payload.hora_inicio is None) != (payload.hora_fin is None):
+        raise HTTPException(status_code=400, detail="hora_inicio y hora_fin van juntas (o ninguna, para no atender ese día)")
+    if payload.hora_inicio is not None and payload.hora_fin <= payload.hora_inicio:
+        raise HTTPException(status_code=400, detail="hora_fin debe ser mayor que hora_inicio")
+
+    excepcion = ExcepcionHorario(
+        profesional_id=profesional_id,
+        fecha=payload.fecha,
+        hora_inicio=payload.hora_inicio,
+        hora_fin=payload.hora_fin,
+        motivo=payload.motivo,
+    )
+    db.add(excepcion)
+    invalidar_horarios(db, profesional_id)
+    try:
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Error al crear la excepción de horario\n" + str(e))
+    db.refresh(excepcion)
+    return excepcion
+
+
+@profesionales_router.delete("/{profesional_id}/excepciones/{excepcion_id}")
+def eliminar_excepcion(
+    profesional_id: int,
+    excepcion_id: int,
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user),
+    scope: str = Depends(require_permission("profesionales.editar")),
+):
+    excepcion = db.get(ExcepcionHorario, excepcion_id)
+    if not excepcion or excepcion.profesional_id != profesional_id:
+        raise HTTPException(status_code=404, detail="Excepción de horario no encontrada.")
+
+    db.delete(excepcion)
+    invalidar_horarios(db, profesional_id)
+    db.commit()
+    return {"ok": True}
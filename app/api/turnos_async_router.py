@@ -0,0 +1,179 @@
+# Variante async de turnos_router (se usa con DB_ASYNC_METHOD, ver app/main.py).
+# Mismos endpoints, mismos permisos y mismas respuestas; la lógica es la de turnos_service (ver turnos_async_service).
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas.turno_schema import TurnoOut, TurnoCreate, TurnoPaginaOut, TurnoLoteCreate, TurnoLoteOut
+from app.database import get_async_db, get_read_async_db
+from app.services.turnos_service import (
+    EVENTO_CONFIRMAR,
+    EVENTO_CANCELAR,
+    EVENTO_COMPLETAR,
+    EVENTO_NO_ASISTIO,
+    )
+from app.services.turnos_async_service import (
+    crear_turno_async,
+    crear_turnos_lote_async,
+    aplicar_evento_turno_async,
+    listar_turnos_async,
+    pagina_turnos_async,
+    obtener_turno_async,
+    )
+from app.api.turnos_router import exportar_turnos
+from app.core.deps import get_current_user_async, require_permission_async
+
+turnos_async_router = APIRouter(prefix="/turnos", tags=["turnos"])
+
+@turnos_async_router.post("", response_model = TurnoOut)
+async def crear_turno(
+    payload: TurnoCreate,
+    db: AsyncSession = Depends(get_async_db),
+    user = Depends(get_current_user_async),
+    scope: str = Depends(require_permission_async("turnos.crear")),
+):
+    return await crear_turno_async(
+        db,
+        paciente_id = payload.paciente_id,
+        profesional_id = payload.profesional_id,
+        inicio = payload.fecha_hora_inicio,
+        fin = payload.fecha_hora_fin,
+        user = user,
+        scope = scope,
+    )
+
+
+@turnos_async_router.post("/lote", response_model=TurnoLoteOut)
+async def crear_turnos_en_lote(
+    payload: TurnoLoteCreate,
+    db: AsyncSession = Depends(get_async_db),
+    user = Depends(get_current_user_async),
+    scope: str = Depends(require_permission_async("turnos.crear")),
+):
+    creados, conflictos = await crear_turnos_lote_async(
+        db,
+        paciente_id = payload.paciente_id,
+        profesional_id = payload.profesional_id,
+        slots = [(s.fecha_hora_inicio, s.fecha_hora_fin) for s in payload.slots] if payload.slots is not None else None,
+        recurrencia = payload.recurrencia,
+        modo = payload.modo,
+        user = user,
+        scope = scope,
+    )
+    return {"creados": creados, "conflictos": conflictos}
+
+
+@turnos_async_router.get("", response_model=list[TurnoOut])
+async def obtener_turnos(
+    db: AsyncSession = Depends(get_read_async_db),
+    profesional_id: int | None = Query(default=None),
+    paciente_id: int | None = Query(default=None),
+    desde: datetime | None = Query(default=None),
+    hasta: datetime | None = Query(default=None),
+    solo_activos: bool = Query(default=False),
+    limit: int = Query(default=200, ge=1, le=1000),
+    user = Depends(get_current_user_async),
+    scope: str = Depends(require_permission_async("turnos.ver")),
+):
+    return await listar_turnos_async(
+        db,
+        limit = limit,
+        user = user,
+        scope = scope,
+        profesional_id = profesional_id,
+        paciente_id = paciente_id,
+        desde = desde,
+        hasta = hasta,
+        solo_activos = solo_activos,
+    )
+
+
+@turnos_async_router.get("/pagina", response_model=TurnoPaginaOut)
+async def obtener_turnos_paginados(
+    db: AsyncSession = Depends(get_read_async_db),
+    profesional_id: int | None = Query(default=None),
+    paciente_id: int | None = Query(default=None),
+    desde: datetime | None = Query(default=None),
+    hasta: datetime | None = Query(default=None),
+    solo_activos: bool = Query(default=False),
+    cursor: str | None = Query(default=None),
+    limit: int = Query(default=200, ge=1, le=1000),
+    user = Depends(get_current_user_async),
+    scope: str = Depends(require_permission_async("turnos.ver")),
+):
+    items, siguiente = await pagina_turnos_async(
+        db,
+        limit = limit,
+        cursor = cursor,
+        user = user,
+        scope = scope,
+        profesional_id = profesional_id,
+        paciente_id = paciente_id,
+        desde = desde,
+        hasta = hasta,
+        solo_activos = solo_activos,
+    )
+    return {"items": items, "siguiente_cursor": siguiente}
+
+
+# El export es un stream largo con cursor del lado del servidor: queda en el threadpool con su propia sesión sync
+turnos_async_router.add_api_route("/exportar", exportar_turnos, methods=["GET"])
+
+
+@turnos_async_router.get("/{turno_id}", response_model=TurnoOut)
+async def obtener_turno_por_id(
+    turno_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    user = Depends(get_current_user_async),
+    scope: str = Depends(require_permission_async("turnos.ver")),
+):
+    turno = await obtener_turno_async(db, turno_id)
+    if not turno:
+        raise HTTPException(status_code=404, detail="Turno no encontrado.")
+
+    if scope == "OWN":
+        if not getattr(user, "profesional_id", None):
+            raise HTTPException(status_code=403, detail="Usuario sin profesional asociado.")
+        if turno.profesional_id != user.profesional_id:
+            raise HTTPException(status_code=403, detail="No tenés acceso a este turno.")
+
+    return turno
+
+@turnos_async_router.post("/{turno_id}/confirmar", response_model=TurnoOut)
+async def confirmar_turno(
+    turno_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    user = Depends(get_current_user_async),
+    scope: str = Depends(require_permission_async("turnos.confirmar")),
+):
+    return await aplicar_evento_turno_async(db, turno_id, EVENTO_CONFIRMAR, user=user, scope=scope)
+
+
+@turnos_async_router.post("/{turno_id}/cancelar", response_model=TurnoOut)
+async def cancelar_turno(
+    turno_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    user = Depends(get_current_user_async),
+    scope: str = Depends(require_permission_async("turnos.cancelar")),
+):
+    return await aplicar_evento_turno_async(db, turno_id, EVENTO_CANCELAR, user=user, scope=scope)
+
+
+@turnos_async_router.post("/{turno_id}/completar", response_model=TurnoOut)
+async def completar_turno(
+    turno_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    user = Depends(get_current_user_async),
+    scope: str = Depends(require_permission_async("turnos.completar")),
+):
+    return await aplicar_evento_turno_async(db, turno_id, EVENTO_COMPLETAR, user=user, scope=scope)
+
+
+@turnos_async_router.post("/{turno_id}/no_asistio", response_model=TurnoOut)
+async def marcar_no_asistio(
+    turno_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    user = Depends(get_current_user_async),
+    scope: str = Depends(require_permission_async("turnos.no_asistio")),
+):
+    return await aplicar_evento_turno_async(db, turno_id, EVENTO_NO_ASISTIO, user=user, scope=scope)
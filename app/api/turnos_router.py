@@ -1,29 +1,36 @@
 # En este archivo definimos las rutas o endpoints relacionados con los pedidos de turnos.
+import json
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session, joinedload
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
 from sqlalchemy import and_
 
-from app.schemas.turno_schema import TurnoOut, TurnoCreate
-from app.database import get_db
+from app.schemas.turno_schema import TurnoOut, TurnoCreate, TurnoPaginaOut, TurnoLoteCreate, TurnoLoteOut
+from app.database import get_db, get_read_db, fabrica_lectura
 from app.models.turno_model import Turno
 from app.models.paciente_model import Paciente
 from app.models.profesional_model import Profesional
 from app.services.notificaciones_service import programar_notifs_creacion_turno
 from app.services.turnos_service import (
     crear_turno as crear_turno_service,
+    crear_turnos_lote,
     validar_solapamiento_paciente,
     validar_solapamiento_profesional,
     hay_bloqueo_agenda,
     aplicar_evento_turno,
-    _estado_id_por_codigo,
     EVENTO_CONFIRMAR,
     EVENTO_CANCELAR,
     EVENTO_COMPLETAR,
     EVENTO_NO_ASISTIO,
     query_turnos_filtrados,
+    pagina_turnos,
+    select_turnos_keyset,
+    iterar_turnos,
     )
 
+from app.services.perfiles_carga import opciones_turno, PERFIL_LISTA
 from app.core.deps import get_current_user, require_permission
 from app.services.ownership_service import assert_turno_ownership
 
@@ -49,9 +56,34 @@ def crear_turno(
     return turno
 
 
+@turnos_router.post("/lote", response_model=TurnoLoteOut)
+def crear_turnos_en_lote(
+    payload: TurnoLoteCreate,
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user),
+    scope: str = Depends(require_permission("turnos.crear")),
+):
+    """
+    Crea una serie de turnos (plan de tratamiento) a partir de una lista de slots o de una recurrencia.
+    - modo todo_o_nada: si algún slot choca no se crea ninguno (409 con los conflictos).
+    - modo mejor_esfuerzo: crea los que se puedan y devuelve los conflictos por slot.
+    """
+    creados, conflictos = crear_turnos_lote(
+        db,
+        paciente_id = payload.paciente_id,
+        profesional_id = payload.profesional_id,
+        slots = [(s.fecha_hora_inicio, s.fecha_hora_fin) for s in payload.slots] if payload.slots is not None else None,
+        recurrencia = payload.recurrencia,
+        modo = payload.modo,
+        user = user,
+        scope = scope,
+    )
+    return {"creados": creados, "conflictos": conflictos}
+
+
 @turnos_router.get("", response_model=list[TurnoOut])
 def obtener_turnos(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     profesional_id: int | None = Query(default=None),
     paciente_id: int | None = Query(default=None),
     desde: datetime | None = Query(default=None),
@@ -84,6 +116,98 @@ def obtener_turnos(
     )
 
 
+@turnos_router.get("/pagina", response_model=TurnoPaginaOut)
+def obtener_turnos_paginados(
+    db: Session = Depends(get_read_db),
+    profesional_id: int | None = Query(default=None),
+    paciente_id: int | None = Query(default=None),
+    desde: datetime | None = Query(default=None),
+    hasta: datetime | None = Query(default=None),
+    solo_activos: bool = Query(default=False),
+    cursor: str | None = Query(default=None),
+    limit: int = Query(default=200, ge=1, le=1000),
+    user = Depends(get_current_user),
+    scope: str = Depends(require_permission("turnos.ver")),
+):
+    """
+    Igual que GET /turnos pero paginado por cursor sobre (fecha_hora_inicio, id).
+    Para la página siguiente se pasa el `siguiente_cursor` de la respuesta anterior; cada página
+    cuesta lo mismo sin importar cuán adelante esté.
+    """
+    items, siguiente = pagina_turnos(
+        db,
+        limit = limit,
+        cursor = cursor,
+        user = user,
+        scope = scope,
+        profesional_id = profesional_id,
+        paciente_id = paciente_id,
+        desde = desde,
+        hasta = hasta,
+        solo_activos = solo_activos,
+    )
+    return {"items": items, "siguiente_cursor": siguiente}
+
+
+def _json_default(valor):
+    if isinstance(valor, datetime):
+        return valor.isoformat()
+    raise TypeError(f"No serializable: {type(valor)}")
+
+
+@turnos_router.get("/exportar")
+def exportar_turnos(
+    request: Request,
+    db: Session = Depends(get_read_db),
+    profesional_id: int | None = Query(default=None),
+    paciente_id: int | None = Query(default=None),
+    desde: datetime | None = Query(default=None),
+    hasta: datetime | None = Query(default=None),
+    solo_activos: bool = Query(default=False),
+    formato: Literal["ndjson", "json"] = Query(default="ndjson"),
+    user = Depends(get_current_user),
+    scope: str = Depends(require_permission("turnos.ver")),
+):
+    """
+    Exporta todos los turnos del filtro en streaming (NDJSON, o un array JSON con formato=json).
+    Las filas se escriben a medida que salen del cursor de la base: la memoria no crece con el rango.
+    """
+    # armamos la consulta acá para que los errores de filtros/permisos salgan como HTTP antes de empezar a escribir
+    stmt = select_turnos_keyset(
+        db,
+        user = user,
+        scope = scope,
+        profesional_id = profesional_id,
+        paciente_id = paciente_id,
+        desde = desde,
+        hasta = hasta,
+        solo_activos = solo_activos,
+    )
+
+    # sesión propia: tiene que vivir mientras dure la respuesta. Sale de las réplicas como get_read_db,
+    # salvo que el cliente tenga que leer del primario (acaba de escribir o manda X-Leer-Primario)
+    fabrica = fabrica_lectura(request)
+
+    def _generar():
+        db_stream: Session = fabrica()
+        try:
+            if formato == "json":
+                yield "["
+            for i, turno in enumerate(iterar_turnos(db_stream, stmt)):
+                linea = json.dumps(turno, default=_json_default, ensure_ascii=False)
+                if formato == "json":
+                    yield ("," if i else "") + linea
+                else:
+                    yield linea + "\n"
+            if formato == "json":
+                yield "]"
+        finally:
+            db_stream.close()
+
+    media_type = "application/x-ndjson" if formato == "ndjson" else "application/json"
+    return StreamingResponse(_generar(), media_type=media_type)
+
+
 @turnos_router.get("/{turno_id}", response_model=TurnoOut)
 def obtener_turno_por_id(
     turno_id: int,
@@ -93,7 +217,7 @@ def obtener_turno_por_id(
 ):
     turno = (
         db.query(Turno)
-        .options(joinedload(Turno.estado))
+        .options(*opciones_turno(PERFIL_LISTA))
         .filter(Turno.id == turno_id)
         .first()
     )
@@ -117,7 +241,6 @@ def confirmar_turno(
     scope: str = Depends(require_permission("turnos.confirmar")),
 ):
     turno = aplicar_evento_turno(db, turno_id, EVENTO_CONFIRMAR, user=user, scope=scope)
-    db.refresh(turno, attribute_names=["estado"])
     return turno
 
 
@@ -129,7 +252,6 @@ def cancelar_turno(
     scope: str = Depends(require_permission("turnos.cancelar")),
 ):
     turno = aplicar_evento_turno(db, turno_id, EVENTO_CANCELAR, user=user, scope=scope)
-    db.refresh(turno, attribute_names=["estado"])
     return turno
 
 
@@ -141,7 +263,6 @@ def completar_turno(
     scope: str = Depends(require_permission("turnos.completar"))
 ):
     turno = aplicar_evento_turno(db, turno_id, EVENTO_COMPLETAR, user=user, scope=scope)
-    db.refresh(turno, attribute_names=["estado"])
     return turno
 
 
@@ -153,5 +274,4 @@ def marcar_no_asistio(
     scope: str = Depends(require_permission("turnos.no_asistio"))
 ):
     turno = aplicar_evento_turno(db, turno_id, EVENTO_NO_ASISTIO, user=user, scope=scope)
-    db.refresh(turno, attribute_names=["estado"])
     return turno
\ No newline at end of file
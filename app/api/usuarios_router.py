@@ -5,6 +5,7 @@ from sqlalchemy import select
 from app.database import get_db
 from app.core.deps import require_permission
 from app.core.security import hash_password
+from app.services.rbac_service import invalidar_permisos_usuario
 
 from app.models.usuario_model import Usuario
 from app.models.rol_model import Rol
@@ -84,6 +85,7 @@ def actualizar_roles_usuario(
 
     # Reemplazo total (MVP claro): lo que mandás = lo que queda
     u.roles = roles
+    invalidar_permisos_usuario(db, u.id)  # el próximo request de este usuario (en cualquier proceso) los recompila
 
     db.commit()
     db.refresh(u)
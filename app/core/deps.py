@@ -1,35 +1,67 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.core.security import decode_token
-from app.services.rbac_service import get_user_with_roles_and_permissions, build_permissions_map, has_permission
+from app.database import get_db, get_async_db
+from app.core.security import decode_token, AUTH_PERMISOS_EN_TOKEN
+from app.services.rbac_service import autenticar, has_permission
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
-def get_current_user(
-    db: Session = Depends(get_db),
-    token: str = Depends(oauth2_scheme),
-):
+def _decodificar_token(token: str) -> tuple[int, dict]:
     try:
         payload = decode_token(token)
         sub = payload.get("sub")
         if not sub:
             raise ValueError("missing sub")
-        user_id = int(sub)
+        return int(sub), payload
     except Exception:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token inválido o expirado")
 
-    user = get_user_with_roles_and_permissions(db, user_id)
+
+def get_current_user(
+    # primario y no réplica: con lag de replicación, un usuario recién desactivado o con permisos
+    # revocados seguiría pasando (la consulta de versiones es la que revoca)
+    db: Session = Depends(get_db),
+    token: str = Depends(oauth2_scheme),
+):
+    user_id, payload = _decodificar_token(token)
+
+    # Versiones de permisos (una consulta) + permisos del token (AUTH_PERMISOS_EN_TOKEN) o del cache
+    user = autenticar(db, user_id, payload, AUTH_PERMISOS_EN_TOKEN)
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Usuario no encontrado o inactivo")
+
+    return user
+
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(oauth2_scheme),
+):
+    # Igual que get_current_user, para los routers async
+    user_id, payload = _decodificar_token(token)
+
+    user = await db.run_sync(autenticar, user_id, payload, AUTH_PERMISOS_EN_TOKEN)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Usuario no encontrado o inactivo")
 
-    # Adjuntamos el mapa de permisos al objeto (sin ensuciar el modelo permanentemente)
-    user._perms_map = build_permissions_map(user)  # type: ignore[attr-defined]
     return user
 
 
+def _scope_efectivo(user, code: str) -> str:
+    perms_map = getattr(user, "perms_map", {})
+    scopes = has_permission(perms_map, code)
+
+    if "ANY" in scopes:
+        return "ANY"
+    if "OWN" in scopes:
+        return "OWN"
+
+    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=f"Falta permiso: {code}")
+
+
 def require_permission(code: str):
     """
     Devuelve el scope efectivo para este permiso:
@@ -38,14 +70,14 @@ def require_permission(code: str):
     Si no lo tiene -> 403
     """
     def _dep(user=Depends(get_current_user)):
-        perms_map = getattr(user, "_perms_map", {})
-        scopes = has_permission(perms_map, code)
+        return _scope_efectivo(user, code)
+
+    return _dep
 
-        if "ANY" in scopes:
-            return "ANY"
-        if "OWN" in scopes:
-            return "OWN"
 
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=f"Falta permiso: {code}")
+def require_permission_async(code: str):
+    # Igual que require_permission, sobre get_current_user_async (no ocupa un hilo del threadpool)
+    async def _dep(user=Depends(get_current_user_async)):
+        return _scope_efectivo(user, code)
 
     return _dep
\ No newline at end of file
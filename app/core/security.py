@@ -11,6 +11,12 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
 
+# Modo opcional: el login embebe permisos y profesional_id en el token y se autoriza sin cargar roles ni permisos
+# (queda una consulta por clave primaria para revocar: ver rbac_service.autenticar).
+# Como los permisos viajan en el token, conviene que estos tokens duren poco.
+AUTH_PERMISOS_EN_TOKEN = os.getenv("AUTH_PERMISOS_EN_TOKEN", "0") == "1"
+ACCESS_TOKEN_PERMISOS_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_PERMISOS_EXPIRE_MINUTES", "15"))
+
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
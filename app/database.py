@@ -1,7 +1,14 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, exc, make_url
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from dotenv import load_dotenv
+from fastapi import Request
+from hashlib import sha256
+from itertools import cycle
+from threading import Lock
 import os
+import time
 
 load_dotenv()
 
@@ -12,15 +19,209 @@ DB_USER = os.getenv("DB_USER")
 DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_NAME = os.getenv("DB_NAME")
 
-DATABASE_URL = f"{DB_METHOD}://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+# DATABASE_URL completo pisa a las partes (lo usan los tests, ver tests/conftest.py)
+DATABASE_URL = os.getenv("DATABASE_URL") or f"{DB_METHOD}://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+
+
+def _config_pool(prefijo: str) -> dict:
+    # DB_POOL_SIZE, DB_MAX_OVERFLOW, ...; para los workers DB_WORKER_POOL_SIZE, para el motor async
+    # DB_ASYNC_POOL_SIZE, ... (si no está, el valor general)
+    def _env(nombre: str, defecto: str) -> int:
+        return int(os.getenv(f"{prefijo}_{nombre}", os.getenv(f"DB_{nombre}", defecto)))
+
+    return {
+        "pool_size": _env("POOL_SIZE", "5"),
+        "max_overflow": _env("MAX_OVERFLOW", "10"),
+        "pool_recycle": _env("POOL_RECYCLE", "1800"),  # segundos; MySQL corta conexiones ociosas (wait_timeout)
+        "pool_timeout": _env("POOL_TIMEOUT", "30"),  # segundos esperando una conexión libre antes de TimeoutError
+    }
+
+
+class _MetricasPool:
+    """
+    Cuánto se espera por una conexión del pool y cuántas veces se agotó el tiempo (pool_timeout).
+    Se mide alrededor de _do_get, así que incluye abrir la conexión cuando el pool crece.
+    """
+    def _iniciar_metricas(self):
+        self._lock_metricas = Lock()
+        self._esperas = 0
+        self._espera_total_seg = 0.0
+        self._espera_max_seg = 0.0
+        self._timeouts = 0
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self._lock_metricas:
+                self._timeouts += 1
+            raise
+        finally:
+            espera = time.perf_counter() - inicio
+            with self._lock_metricas:
+                self._esperas += 1
+                self._espera_total_seg += espera
+                self._espera_max_seg = max(self._espera_max_seg, espera)
+
+    def metricas(self) -> dict:
+        with self._lock_metricas:
+            return {
+                "tamanio": self.size(),
+                "en_uso": self.checkedout(),
+                "libres": self.checkedin(),
+                "overflow": max(self.overflow(), 0),
+                "checkouts": self._esperas,
+                "espera_promedio_ms": round(1000 * self._espera_total_seg / self._esperas, 3) if self._esperas else 0.0,
+                "espera_max_ms": round(1000 * self._espera_max_seg, 3),
+                "timeouts": self._timeouts,
+            }
+
+
+class PoolInstrumentado(_MetricasPool, QueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._iniciar_metricas()
+
+
+class PoolAsyncInstrumentado(_MetricasPool, AsyncAdaptedQueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._iniciar_metricas()
+
+
+# Motor async opcional (ej: DB_ASYNC_METHOD=mysql+aiomysql). Si está, los routers de turnos, pacientes
+# y auth corren como `async def` y la concurrencia la limita el pool de conexiones, no el threadpool.
+DB_ASYNC_METHOD = os.getenv("DB_ASYNC_METHOD")
+
+_pool_api = _config_pool("DB")
+_pool_async = _config_pool("DB_ASYNC")
+if DB_ASYNC_METHOD and not os.getenv("DB_ASYNC_POOL_SIZE"):
+    # sin DB_ASYNC_* propios, el pool sync y el async se reparten el de DB_*: habilitar el motor
+    # async no duplica las conexiones que la instancia le abre al primario
+    _pool_api = _pool_async = {
+        **_pool_api,
+        "pool_size": max(1, _pool_api["pool_size"] // 2),
+        "max_overflow": _pool_api["max_overflow"] // 2,
+    }
 
 engine = create_engine(
     DATABASE_URL, 
-    pool_pre_ping=True # evita conexiones muertas
+    pool_pre_ping=True, # evita conexiones muertas
+    poolclass=PoolInstrumentado,
+    **_pool_api,
 )
 
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 
+# Réplicas de lectura (DB_REPLICA_URLS="mysql+pymysql://...@replica1/db,mysql+pymysql://...@replica2/db").
+# get_read_db reparte los GET de listados entre ellas; escrituras y SELECT ... FOR UPDATE siguen en el primario.
+DB_REPLICA_URLS = [u.strip() for u in os.getenv("DB_REPLICA_URLS", "").split(",") if u.strip()]
+# Tras una escritura, el mismo cliente lee del primario durante este tiempo (cubre el lag de replicación)
+DB_PIN_PRIMARIO_SEG = int(os.getenv("DB_PIN_PRIMARIO_SEG", "5"))
+COOKIE_PIN_PRIMARIO = "leer_primario"
+HEADER_LEER_PRIMARIO = "X-Leer-Primario"
+
+replica_engines = [
+    create_engine(url, pool_pre_ping=True, poolclass=PoolInstrumentado, **_config_pool("DB_REPLICA"))
+    for url in DB_REPLICA_URLS
+]
+_replicas_ciclo = cycle([sessionmaker(bind=e, autocommit=False, autoflush=False) for e in replica_engines])
+_lock_replicas = Lock()
+
+# hash del token -> hasta cuándo (monotonic) sus lecturas van al primario. Es por proceso:
+# para clientes que no guardan cookies y vuelven a pegarle a la misma instancia.
+_pins_primario: dict[str, float] = {}
+_lock_pins = Lock()
+
+
+def _clave_cliente(request: Request) -> str | None:
+    auth = request.headers.get("authorization")
+    return sha256(auth.encode()).hexdigest()[:32] if auth else None
+
+
+def registrar_escritura(request: Request) -> None:
+    clave = _clave_cliente(request)
+    if not clave:
+        return
+    ahora = time.monotonic()
+    with _lock_pins:
+        _pins_primario[clave] = ahora + DB_PIN_PRIMARIO_SEG
+        if len(_pins_primario) > 10_000:
+            for k in [k for k, vence in _pins_primario.items() if vence <= ahora]:
+                del _pins_primario[k]
+
+
+def _leer_del_primario(request: Request) -> bool:
+    if request.headers.get(HEADER_LEER_PRIMARIO) == "1":
+        return True
+    try:
+        if float(request.cookies.get(COOKIE_PIN_PRIMARIO, "0")) > time.time():
+            return True
+    except ValueError:
+        pass
+    clave = _clave_cliente(request)
+    if clave:
+        with _lock_pins:
+            vence = _pins_primario.get(clave)
+        if vence and vence > time.monotonic():
+            return True
+    return False
+
+
+# Pool propio para los schedulers (DB_WORKER_POOL_SIZE, ...): un lote largo de notificaciones
+# no le saca conexiones a la API. Si no se configura, comparten el engine de la API.
+worker_engine = engine
+if os.getenv("DB_WORKER_POOL_SIZE"):
+    worker_engine = create_engine(
+        DATABASE_URL,
+        pool_pre_ping=True,
+        poolclass=PoolInstrumentado,
+        **_config_pool("DB_WORKER"),
+    )
+
+WorkerSessionLocal = sessionmaker(bind=worker_engine, autocommit=False, autoflush=False)
+
+async_engine = None
+AsyncSessionLocal = None
+if DB_ASYNC_METHOD:
+    # la misma base que el engine sync (DATABASE_URL incluido), con el driver async
+    async_engine = create_async_engine(
+        make_url(DATABASE_URL).set(drivername=DB_ASYNC_METHOD),
+        pool_pre_ping=True,
+        poolclass=PoolAsyncInstrumentado,
+        **_pool_async,
+    )
+    # expire_on_commit=False: después del commit los objetos se serializan sin volver a la base
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+# Las mismas réplicas de DB_REPLICA_URLS con el driver async, para los listados de los routers async
+async_replica_engines = [
+    create_async_engine(
+        make_url(url).set(drivername=DB_ASYNC_METHOD),
+        pool_pre_ping=True,
+        poolclass=PoolAsyncInstrumentado,
+        **_config_pool("DB_REPLICA"),
+    )
+    for url in (DB_REPLICA_URLS if DB_ASYNC_METHOD else [])
+]
+_replicas_async_ciclo = cycle([
+    async_sessionmaker(bind=e, autoflush=False, expire_on_commit=False) for e in async_replica_engines
+])
+
+
+def metricas_pools() -> dict[str, dict]:
+    metricas = {"api": engine.pool.metricas()}
+    if worker_engine is not engine:
+        metricas["worker"] = worker_engine.pool.metricas()
+    if async_engine is not None:
+        metricas["async"] = async_engine.sync_engine.pool.metricas()
+    for i, replica in enumerate(replica_engines, start=1):
+        metricas[f"replica_{i}"] = replica.pool.metricas()
+    for i, replica in enumerate(async_replica_engines, start=1):
+        metricas[f"replica_async_{i}"] = replica.sync_engine.pool.metricas()
+    return metricas
+
 class Base(DeclarativeBase):
     pass
 
@@ -29,4 +230,44 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def fabrica_lectura(request: Request) -> sessionmaker:
+    """
+    Fábrica de sesiones para lecturas: una réplica (round robin) si hay configuradas,
+    o el primario si no hay réplicas, si el cliente acaba de escribir o si manda X-Leer-Primario: 1.
+    """
+    if not replica_engines or _leer_del_primario(request):
+        return SessionLocal
+    with _lock_replicas:
+        return next(_replicas_ciclo)
+
+def get_read_db(request: Request):
+    """
+    Sesión para endpoints de solo lectura (ver fabrica_lectura).
+    """
+    db = fabrica_lectura(request)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db():
+    if AsyncSessionLocal is None:
+        raise RuntimeError("DB_ASYNC_METHOD no está configurado")
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_read_async_db(request: Request):
+    """
+    Como get_read_db, para los routers async: una réplica si hay y el cliente no tiene que leer del primario.
+    """
+    if AsyncSessionLocal is None:
+        raise RuntimeError("DB_ASYNC_METHOD no está configurado")
+    if not async_replica_engines or _leer_del_primario(request):
+        fabrica = AsyncSessionLocal
+    else:
+        with _lock_replicas:
+            fabrica = next(_replicas_async_ciclo)
+    async with fabrica() as db:
+        yield db
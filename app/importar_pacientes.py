@@ -0,0 +1,32 @@
+# Importación masiva de pacientes por línea de comandos:
+#   python -m app.importar_pacientes pacientes.csv
+#   python -m app.importar_pacientes pacientes.ndjson --formato ndjson
+import argparse
+import json
+
+import app.models  # noqa: F401  (registra todos los modelos)
+from app.database import SessionLocal
+from app.services.pacientes_import_service import importar_pacientes, TAMANIO_CHUNK
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Importa pacientes desde un archivo CSV o NDJSON.")
+    parser.add_argument("archivo")
+    parser.add_argument("--formato", choices=["csv", "ndjson"], default=None, help="por defecto, según la extensión")
+    parser.add_argument("--chunk", type=int, default=TAMANIO_CHUNK)
+    args = parser.parse_args()
+
+    formato = args.formato or ("ndjson" if args.archivo.endswith((".ndjson", ".jsonl")) else "csv")
+
+    db = SessionLocal()
+    try:
+        with open(args.archivo, encoding="utf-8-sig", newline="") as f:
+            resultado = importar_pacientes(db, f, formato, tamanio_chunk=args.chunk)
+    finally:
+        db.close()
+
+    print(json.dumps(resultado, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,44 +1,121 @@
-from fastapi import FastAPI
+import os
+import time
+from datetime import datetime
+from fastapi import FastAPI, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from app.api.turnos_router import turnos_router
 from app.api.pacientes_router import paciente_router
 from app.api.profesionales_router import profesionales_router
 from app.api.bloqueos_agenda_router import bloqueos_agenda_router
 from app.api.estados_turno_router import estados_turno_router
+from app.api.notificaciones_router import notificaciones_router
+from app.api.agenda_router import agenda_router
+from app.api.turnos_async_router import turnos_async_router
+from app.api.pacientes_async_router import paciente_async_router
+from app.api.auth_async_router import router as auth_async_router
 
 from apscheduler.schedulers.background import BackgroundScheduler
-from app.scheduler import _procesar_turnos_sistema
+from app.scheduler import registrar_jobs, soltar_liderazgo
 scheduler = BackgroundScheduler()
 
-from app.notificaciones_scheduler import procesar_notificaciones
+from app.notificaciones_scheduler import despachador
 
 from app.api.auth_router import router as auth_router
 from app.api.usuarios_router import router as usuarios_router
 from app.api.roles_router import router as roles_router
 from app.api.permisos_router import router as permisos_router
 
+from app.database import (
+    SessionLocal,
+    AsyncSessionLocal,
+    metricas_pools,
+    replica_engines,
+    registrar_escritura,
+    COOKIE_PIN_PRIMARIO,
+    DB_PIN_PRIMARIO_SEG,
+)
+from app.services.estados_turno_service import refrescar_estados_turno
+from app.services.jobs_estado_service import estado_ready
+
 app = FastAPI(title="Sistema de Gestión de Turnos")
-app.include_router(turnos_router, prefix="/api")
-app.include_router(paciente_router, prefix="/api")
+
+# Con DB_ASYNC_METHOD configurado, turnos/pacientes/auth van por el camino async
+usar_async = AsyncSessionLocal is not None
+app.include_router(turnos_async_router if usar_async else turnos_router, prefix="/api")
+app.include_router(paciente_async_router if usar_async else paciente_router, prefix="/api")
 app.include_router(profesionales_router, prefix="/api")
 app.include_router(bloqueos_agenda_router, prefix="/api")
 app.include_router(estados_turno_router, prefix="/api")
-app.include_router(auth_router, prefix="/api")
+app.include_router(notificaciones_router, prefix="/api")
+app.include_router(agenda_router, prefix="/api")
+app.include_router(auth_async_router if usar_async else auth_router, prefix="/api")
 app.include_router(usuarios_router, prefix="/api")
 app.include_router(roles_router, prefix="/api")
 app.include_router(permisos_router, prefix="/api")
 
+@app.middleware("http")
+async def fijar_primario_tras_escritura(request: Request, call_next):
+    # read-your-writes: después de una escritura exitosa, las lecturas de ese cliente van al primario un rato
+    response = await call_next(request)
+    if replica_engines and request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+        registrar_escritura(request)
+        response.set_cookie(
+            COOKIE_PIN_PRIMARIO,
+            str(time.time() + DB_PIN_PRIMARIO_SEG),
+            max_age=DB_PIN_PRIMARIO_SEG,
+            httponly=True,
+            samesite="lax",
+        )
+    return response
+
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
 
+@app.get("/ready")
+def readiness():
+    """
+    503 si la base no responde o si algún job periódico está atrasado (no terminó bien en
+    FACTOR_ATRASO veces su intervalo). Informa el estado de cada job: duración, filas, lag,
+    corridas salteadas y último éxito.
+    """
+    db = SessionLocal()
+    try:
+        status, cuerpo = estado_ready(db, datetime.utcnow())
+    finally:
+        db.close()
+    return JSONResponse(status_code=status, content=jsonable_encoder(cuerpo))
+
+@app.get("/health/pool")
+def health_pool():
+    # en_uso/overflow cerca de pool_size + max_overflow, o timeouts > 0, indican pool agotado
+    return metricas_pools()
+
+@app.on_event("startup")
+def cargar_estados_turno():
+    db = SessionLocal()
+    try:
+        refrescar_estados_turno(db)
+    finally:
+        db.close()
+
+
+# Los jobs periódicos corren en el proceso worker (python -m app.worker) y la API solo sirve HTTP.
+# SCHEDULER_EN_WEB=1 los vuelve a levantar acá (ej: desarrollo con un solo proceso); aun así,
+# con varias instancias solo corre la que tenga el lease.
+SCHEDULER_EN_WEB = os.getenv("SCHEDULER_EN_WEB", "0") == "1"
+
 @app.on_event("startup")
 def start_scheduler():
-    if not scheduler.running:
-        scheduler.add_job(_procesar_turnos_sistema, "interval", seconds=60)
-        scheduler.add_job(procesar_notificaciones, "interval", seconds=30)
+    if SCHEDULER_EN_WEB and not scheduler.running:
+        registrar_jobs(scheduler)
         scheduler.start()
 
 
 @app.on_event("shutdown")
 def shutdown_scheduler():
-    scheduler.shutdown()
\ No newline at end of file
+    if scheduler.running:
+        scheduler.shutdown()
+        soltar_liderazgo()
+    despachador.cerrar()
\ No newline at end of file
@@ -3,10 +3,17 @@ from app.models.paciente_model import Paciente
 from app.models.profesional_model import Profesional
 from app.models.estado_turno_model import EstadoTurno
 from app.models.bloqueo_agenda_model import BloqueoAgenda
+from app.models.bloqueo_recurrente_model import BloqueoRecurrente
+from app.models.horario_atencion_model import HorarioAtencion
+from app.models.excepcion_horario_model import ExcepcionHorario
 from app.models.notificacion_model import Notificacion
+from app.models.notificacion_archivada_model import NotificacionArchivada
+from app.models.lease_scheduler_model import LeaseScheduler
+from app.models.job_estado_model import JobEstado
 
 from app.models.usuario_model import Usuario
 from app.models.rol_model import Rol
 from app.models.permiso_model import Permiso
 from app.models.usuario_rol_model import UsuarioRol
-from app.models.rol_permiso_model import RolPermiso
\ No newline at end of file
+from app.models.rol_permiso_model import RolPermiso
+from app.models.version_permisos_model import VersionPermisos
\ No newline at end of file
@@ -19,12 +19,16 @@ class BloqueoAgenda(Base):
     eliminado_por_usuario_id = Column(Integer, ForeignKey("usuarios.id", ondelete="SET NULL"), nullable=True)
     activo = Column(Boolean, nullable=False, server_default=text("1"))
 
-    profesional = relationship("Profesional", lazy="joined")
-    creado_por = relationship("Usuario", foreign_keys=[creado_por_usuario_id], lazy="joined")
-    actualizado_por = relationship("Usuario", foreign_keys=[actualizado_por_usuario_id], lazy="joined")
-    eliminado_por = relationship("Usuario", foreign_keys=[eliminado_por_usuario_id], lazy="joined")
+    # sin JOIN por defecto (ver app/services/perfiles_carga.py)
+    profesional = relationship("Profesional", lazy="select")
+    creado_por = relationship("Usuario", foreign_keys=[creado_por_usuario_id], lazy="select")
+    actualizado_por = relationship("Usuario", foreign_keys=[actualizado_por_usuario_id], lazy="select")
+    eliminado_por = relationship("Usuario", foreign_keys=[eliminado_por_usuario_id], lazy="select")
 
     __table_args__ = (
         CheckConstraint('fecha_hora_inicio < fecha_hora_fin', name='chk_bloqueo_fechas'),
-        Index("idx_bloq_prof_activo", "profesional_id", "activo"),
+        # hay_bloqueo_agenda: igualdad en profesional + activo y rango sobre fecha_hora_fin
+        Index("idx_bloq_prof_activo_rango", "profesional_id", "activo", "fecha_hora_fin", "fecha_hora_inicio"),
+        # GET /bloqueos_agenda con desde/hasta sin filtrar por profesional
+        Index("idx_bloq_activo_rango", "activo", "fecha_hora_fin", "fecha_hora_inicio"),
     )
@@ -0,0 +1,31 @@
+from app.database import Base
+from sqlalchemy import Column, Integer, Date, Time, DateTime, ForeignKey, String, CheckConstraint, Boolean, Index, text
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+class BloqueoRecurrente(Base):
+    # Regla semanal (ej: almuerzo lunes a viernes 13 a 14) que se guarda una sola vez.
+    # Las ocurrencias no se materializan: se expanden sobre el rango consultado (ver bloqueos_recurrentes_service).
+    __tablename__ = "bloqueos_recurrentes"
+
+    id = Column(Integer, primary_key=True)
+    profesional_id = Column(Integer, ForeignKey("profesionales.id"), nullable=False)
+    dias_semana = Column(String(13), nullable=False)  # "0,2,4": 0 = lunes ... 6 = domingo
+    hora_inicio = Column(Time, nullable=False)
+    hora_fin = Column(Time, nullable=False)
+    vigente_desde = Column(Date, nullable=False)
+    vigente_hasta = Column(Date, nullable=True)  # inclusive; NULL = sin fin
+    motivo = Column(String(255), nullable=True)
+    creado_en = Column(DateTime, nullable=False, server_default=func.current_timestamp())
+    creado_por_usuario_id = Column(Integer, ForeignKey("usuarios.id", ondelete="SET NULL"), nullable=True)
+    eliminado_en = Column(DateTime, nullable=True)
+    eliminado_por_usuario_id = Column(Integer, ForeignKey("usuarios.id", ondelete="SET NULL"), nullable=True)
+    activo = Column(Boolean, nullable=False, server_default=text("1"))
+
+    profesional = relationship("Profesional", lazy="select")
+
+    __table_args__ = (
+        CheckConstraint('hora_inicio < hora_fin', name='chk_bloq_rec_horas'),
+        CheckConstraint('vigente_hasta IS NULL OR vigente_desde <= vigente_hasta', name='chk_bloq_rec_vigencia'),
+        Index("idx_bloq_rec_prof_activo", "profesional_id", "activo", "vigente_desde"),
+    )
@@ -0,0 +1,22 @@
+from app.database import Base
+from sqlalchemy import Column, Integer, Date, Time, String, ForeignKey, CheckConstraint, Index
+
+class ExcepcionHorario(Base):
+    # Reemplaza la plantilla semanal en una fecha puntual.
+    # Sin horas = no atiende ese día; con horas = esas son las franjas del día (puede haber varias filas).
+    __tablename__ = "excepciones_horario"
+
+    id = Column(Integer, primary_key=True)
+    profesional_id = Column(Integer, ForeignKey("profesionales.id"), nullable=False)
+    fecha = Column(Date, nullable=False)
+    hora_inicio = Column(Time, nullable=True)
+    hora_fin = Column(Time, nullable=True)
+    motivo = Column(String(255), nullable=True)
+
+    __table_args__ = (
+        CheckConstraint(
+            '(hora_inicio IS NULL AND hora_fin IS NULL) OR hora_inicio < hora_fin',
+            name='chk_excepcion_horas',
+        ),
+        Index("idx_excepcion_prof_fecha", "profesional_id", "fecha"),
+    )
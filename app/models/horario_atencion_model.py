@@ -0,0 +1,19 @@
+from app.database import Base
+from sqlalchemy import Column, Integer, Time, ForeignKey, CheckConstraint, Index
+
+class HorarioAtencion(Base):
+    # Plantilla semanal: una fila por franja (puede haber varias por día, ej: mañana y tarde).
+    # Si el profesional no tiene ninguna fila, su agenda no está restringida por horario.
+    __tablename__ = "horarios_atencion"
+
+    id = Column(Integer, primary_key=True)
+    profesional_id = Column(Integer, ForeignKey("profesionales.id"), nullable=False)
+    dia_semana = Column(Integer, nullable=False)  # 0 = lunes ... 6 = domingo
+    hora_inicio = Column(Time, nullable=False)
+    hora_fin = Column(Time, nullable=False)
+
+    __table_args__ = (
+        CheckConstraint('hora_inicio < hora_fin', name='chk_horario_horas'),
+        CheckConstraint('dia_semana BETWEEN 0 AND 6', name='chk_horario_dia'),
+        Index("idx_horario_prof_dia", "profesional_id", "dia_semana"),
+    )
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, DateTime, BigInteger
+from app.database import Base
+
+class JobEstado(Base):
+    # Última corrida y contadores de cada job periódico. Lo escribe el worker líder y lo lee GET /ready
+    # desde cualquier proceso (ver jobs_estado_service).
+    __tablename__ = "jobs_estado"
+
+    job_id = Column(String(100), primary_key=True)
+    instancia = Column(String(100), nullable=True)  # WORKER_ID que hizo la última corrida
+    intervalo_seg = Column(Integer, nullable=True)
+
+    corridas = Column(BigInteger, nullable=False, default=0)
+    errores = Column(BigInteger, nullable=False, default=0)
+    superpuestas = Column(BigInteger, nullable=False, default=0)  # salteadas porque la anterior seguía corriendo
+    perdidas = Column(BigInteger, nullable=False, default=0)  # salteadas por pasar misfire_grace_time
+
+    ultima_corrida_en = Column(DateTime, nullable=True)
+    ultima_duracion_ms = Column(Integer, nullable=True)
+    ultimas_filas = Column(Integer, nullable=True)
+    ultimo_lag_ms = Column(Integer, nullable=True)  # demora entre la hora programada y el arranque
+    ultimo_exito_en = Column(DateTime, nullable=True)
+    ultimo_error = Column(String(500), nullable=True)
+    ultimo_error_en = Column(DateTime, nullable=True)
@@ -0,0 +1,10 @@
+from sqlalchemy import Column, String, DateTime
+from app.database import Base
+
+class LeaseScheduler(Base):
+    # Liderazgo de los jobs periódicos: solo la instancia dueña de un lease vigente los corre (ver leases_service).
+    __tablename__ = "leases_scheduler"
+
+    nombre = Column(String(100), primary_key=True)
+    duenio = Column(String(100), nullable=True)  # WORKER_ID de la instancia que lo tiene
+    vence_en = Column(DateTime, nullable=True)
@@ -0,0 +1,40 @@
+from sqlalchemy import Column, Integer, DateTime, String, Text, Index
+from app.database import Base
+
+class NotificacionArchivada(Base):
+    # Histórico de notificaciones ENVIADA/CANCELADA sacadas de la tabla de cola (ver archivar_notificaciones).
+    # Sin FKs: el archivo no tiene que frenar bajas en turnos/pacientes.
+    __tablename__ = "notificaciones_archivo"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+
+    turno_id = Column(Integer)
+    paciente_id = Column(Integer, nullable=False)
+
+    canal = Column(String(20), nullable=False)
+    tipo = Column(String(30), nullable=False)
+
+    mensaje = Column(Text, nullable=False)
+    programada_para = Column(DateTime, nullable=False)
+
+    estado = Column(String(20), nullable=False)
+    intentos = Column(Integer, nullable=False)
+    ultimo_error = Column(Text)
+
+    proveedor_msg_id = Column(String(100))
+
+    creado_en = Column(DateTime)
+    enviada_en = Column(DateTime)
+    cancelada_en = Column(DateTime)
+
+    dedupe_key = Column(String(120), nullable=False)
+
+    reclamada_por = Column(String(100))
+    reclamada_hasta = Column(DateTime)
+
+    archivada_en = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("idx_notif_arch_turno", "turno_id"),
+        Index("idx_notif_arch_paciente", "paciente_id"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, String, Text, Enum
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, String, Text, Enum, Index
 from app.database import Base
 
 class Notificacion(Base):
@@ -27,3 +27,15 @@ class Notificacion(Base):
     cancelada_en = Column(DateTime)
 
     dedupe_key = Column(String(120), nullable=False, unique=True)
+
+    # Lease del dispatcher: quién la tomó para enviar y hasta cuándo (vencido el lease otra instancia puede retomarla)
+    reclamada_por = Column(String(100))
+    reclamada_hasta = Column(DateTime)
+
+    __table_args__ = (
+        # Cola: WHERE estado = 'PENDIENTE' AND programada_para <= ahora ORDER BY programada_para
+        Index("idx_notif_estado_programada", "estado", "programada_para"),
+        # Retención: ENVIADA/CANCELADA más viejas que N días
+        Index("idx_notif_estado_creado", "estado", "creado_en"),
+        Index("idx_notif_turno", "turno_id", "estado"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import (Column, Integer, String, Enum, Boolean, DateTime, func)
+from sqlalchemy import (Column, Integer, String, Enum, Boolean, DateTime, Index, func)
 from app.database import Base
 
 class Paciente(Base):
@@ -6,6 +6,7 @@ class Paciente(Base):
 
     id = Column(Integer, primary_key=True)
     nombre = Column(String(100), nullable=False)
+    nombre_normalizado = Column(String(100), nullable=True) # minúsculas, sin tildes ni signos: lo usa el buscador (ver normalizar_nombre)
     dni = Column(String(20), unique=True, nullable=True)
     cuil = Column(String(20), unique=True, nullable=True)
     telefono = Column(String(20), nullable=False)
@@ -16,4 +17,12 @@ class Paciente(Base):
             )
     )
     activo = Column(Boolean, nullable=False, server_default='1')
-    fecha_alta = Column(DateTime, nullable=False, server_default=func.current_timestamp())
\ No newline at end of file
+    fecha_alta = Column(DateTime, nullable=False, server_default=func.current_timestamp())
+
+    __table_args__ = (
+        # búsqueda por prefijo (LIKE 'texto%') y orden del listado
+        Index("idx_pac_nombre_norm", "nombre_normalizado", "id"),
+        # búsqueda por palabra en MySQL (MATCH ... AGAINST); en otros motores se ignora
+        Index("ft_pac_nombre_norm", "nombre_normalizado", mysql_prefix="FULLTEXT"),
+        Index("idx_pac_telefono", "telefono"),
+    )
@@ -9,4 +9,7 @@ class Profesional(Base):
     especialidad = Column(String(100))
     duracion_turno_min = Column(Integer, nullable=False, default=60)
     activo = Column(Boolean, nullable=False, server_default='1')
+    # sube con cada cambio del horario de atención o de los bloqueos recurrentes (ver version_agenda_service):
+    # los caches de cada proceso la comparan con la que trae la validación de la reserva
+    agenda_version = Column(Integer, nullable=False, server_default='0')
     
\ No newline at end of file
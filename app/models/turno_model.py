@@ -23,19 +23,20 @@ class Turno(Base):
     actualizado_en = Column(DateTime, nullable=True)
 
     #relationships para devolver estado.codigo, etc al frontend
-    estado = relationship("EstadoTurno", lazy="joined")
-    paciente = relationship("Paciente", lazy="joined")
-    profesional = relationship("Profesional", lazy="joined")
+    #sin JOIN por defecto: cada consulta elige qué cargar (ver app/services/perfiles_carga.py)
+    estado = relationship("EstadoTurno", lazy="select")
+    paciente = relationship("Paciente", lazy="select")
+    profesional = relationship("Profesional", lazy="select")
 
     creado_por = relationship(
         "Usuario",
         foreign_keys=[creado_por_usuario_id],
-        lazy="joined"
+        lazy="select"
     )
     actualizado_por = relationship(
         "Usuario",
         foreign_keys=[actualizado_por_usuario_id],
-        lazy="joined"
+        lazy="select"
     )
 
     __table_args__ = (
@@ -43,4 +44,14 @@ class Turno(Base):
         UniqueConstraint("paciente_id", "fecha_hora_inicio", name="uq_turno_pac_inicio"),
         Index("idx_turno_creado_por", "creado_por_usuario_id"),
         Index("idx_turno_actualizado_por", "actualizado_por_usuario_id"),
+
+        # Solapamiento (inicio < fecha_hora_fin AND fin > fecha_hora_inicio) sobre estados activos:
+        # igualdad en profesional/paciente + estado y rango sobre fecha_hora_fin (solo recorre turnos que todavía no terminaron)
+        Index("idx_turno_prof_estado_rango", "profesional_id", "estado_id", "fecha_hora_fin", "fecha_hora_inicio"),
+        Index("idx_turno_pac_estado_rango", "paciente_id", "estado_id", "fecha_hora_fin", "fecha_hora_inicio"),
+        # Listado sin filtro de profesional/paciente, ordenado por inicio
+        Index("idx_turno_inicio", "fecha_hora_inicio"),
+        # Scheduler: reservas vencidas y confirmados que ya terminaron
+        Index("idx_turno_estado_creado", "estado_id", "creado_en"),
+        Index("idx_turno_estado_fin", "estado_id", "fecha_hora_fin"),
     )
\ No newline at end of file
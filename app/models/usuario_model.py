@@ -12,13 +12,15 @@ class Usuario(Base):
     email = Column(String(120), unique=True)
     password_hash = Column(String(255), nullable=False)
     activo = Column(Boolean, nullable=False, server_default="1")
+    # se incrementa cada vez que cambian sus roles: invalida sus permisos cacheados en todos los procesos
+    permisos_version = Column(Integer, nullable=False, server_default="0")
 
     profesional_id = Column(Integer, ForeignKey("profesionales.id", ondelete="SET NULL"))
 
     creado_en = Column(DateTime, nullable=False, server_default=func.current_timestamp())
     ultimo_login_en = Column(DateTime)
 
-    profesional = relationship("Profesional", lazy="joined")
+    profesional = relationship("Profesional", lazy="select")
 
     roles = relationship(
         "Rol",
@@ -0,0 +1,10 @@
+from sqlalchemy import Column, Integer
+from app.database import Base
+
+class VersionPermisos(Base):
+    # Versión global de roles/permisos (una sola fila, id = 1): subirla invalida los permisos cacheados
+    # de todos los usuarios en todos los procesos (ver rbac_service).
+    __tablename__ = "version_permisos"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, server_default="0")
@@ -0,0 +1,61 @@
+# Recalcula pacientes.nombre_normalizado con normalizar_nombre (la misma función que usa la app al guardar).
+# Va después de migrations/005_busqueda_pacientes.sql, que agrega la columna vacía:
+#   python -m app.normalizar_nombres_pacientes
+# Recorre la tabla por id en lotes y solo escribe las filas que cambian, así que se puede volver a correr.
+import argparse
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+import app.models  # noqa: F401  (registra todos los modelos)
+from app.database import SessionLocal
+from app.models.paciente_model import Paciente
+from app.services.pacientes_service import normalizar_nombre
+
+TAMANIO_LOTE = 1000
+
+
+def normalizar_nombres(db: Session, tamanio_lote: int = TAMANIO_LOTE) -> int:
+    """
+    Devuelve cuántos pacientes se actualizaron. Commit por lote.
+    """
+    actualizados = 0
+    ultimo_id = 0
+    while True:
+        filas = db.execute(
+            select(Paciente.id, Paciente.nombre, Paciente.nombre_normalizado)
+            .where(Paciente.id > ultimo_id)
+            .order_by(Paciente.id)
+            .limit(tamanio_lote)
+        ).all()
+        if not filas:
+            return actualizados
+        ultimo_id = filas[-1].id
+
+        cambios = [
+            {"id": f.id, "nombre_normalizado": normalizado}
+            for f in filas
+            if (normalizado := normalizar_nombre(f.nombre)) != f.nombre_normalizado
+        ]
+        if cambios:
+            db.execute(update(Paciente), cambios)  # UPDATE por PK en bloque (executemany)
+            db.commit()
+            actualizados += len(cambios)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recalcula el nombre normalizado de todos los pacientes.")
+    parser.add_argument("--lote", type=int, default=TAMANIO_LOTE)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        actualizados = normalizar_nombres(db, tamanio_lote=args.lote)
+    finally:
+        db.close()
+
+    print(f"{actualizados} pacientes actualizados")
+
+
+if __name__ == "__main__":
+    main()
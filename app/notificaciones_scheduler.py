@@ -1,36 +1,128 @@
+import asyncio
+import math
+import os
+import socket
+import threading
+import uuid
 from datetime import datetime
 from sqlalchemy.orm import Session
 
-from app.database import SessionLocal
-from app.services.notificaciones_service import obtener_notificaciones_pendientes
+from app.database import WorkerSessionLocal
+from app.services.notificaciones_service import (
+    LEASE_ENVIO_SEG,
+    reclamar_notificaciones,
+    registrar_resultados_envio,
+    archivar_notificaciones,
+)
+from app.services.proveedores_notificacion import ProveedorCanal, crear_proveedores
 
-def _enviar_stub(canal: str, mensaje: str) -> str:
-    # Acá mañana lo reemplazamos por Twilio/Meta/lo que sea.
-    print(f"[SEND:{canal}] {mensaje}")
-    return "stub-id"
+NOTIF_LOTE = int(os.getenv("NOTIF_LOTE", "200"))  # notificaciones reclamadas por vuelta de cada canal
+NOTIF_MAX_LOTES_POR_CORRIDA = int(os.getenv("NOTIF_MAX_LOTES_POR_CORRIDA", "20"))
+NOTIF_MARGEN_LEASE_SEG = int(os.getenv("NOTIF_MARGEN_LEASE_SEG", "60"))  # reclamo + registro del resultado
 
-def procesar_notificaciones():
-    db: Session = SessionLocal()
-    try:
-        ahora = datetime.utcnow()
-        pendientes = obtener_notificaciones_pendientes(db, ahora, limit=50)
-
-        for n in pendientes:
-            try:
-                n.intentos += 1
-                proveedor_id = _enviar_stub(n.canal, n.mensaje)
-                n.proveedor_msg_id = proveedor_id
-                n.estado = "ENVIADA"
-                n.enviada_en = datetime.utcnow()
-                n.ultimo_error = None
-                db.add(n)
-                db.commit()
-            except Exception as e:
-                # n.estado = "FALLIDA"
-                # n.ultimo_error = str(e)
-                # db.add(n)
-                # db.commit()
-                db.rollback()
+# Identifica a esta instancia en el lease (reclamada_por); tiene que ser único entre réplicas
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def lease_para(proveedor: ProveedorCanal, lote: int = NOTIF_LOTE) -> int:
+    """
+    Lease con el que se reclama un lote del canal: tiene que cubrir el peor caso del envío
+    (todas las tandas agotando el timeout, más el limitador de tasa) o el lease vence a mitad de
+    lote, otra instancia reclama las mismas filas y se manda el mensaje dos veces.
+    NOTIF_LEASE_SEG solo puede alargarlo.
+    """
+    necesario = math.ceil(proveedor.duracion_maxima_lote(lote)) + NOTIF_MARGEN_LEASE_SEG
+    return max(LEASE_ENVIO_SEG, necesario)
+
+
+class _Despachador:
+    """
+    Event loop propio en un hilo de fondo con un proveedor por canal.
+    El job del scheduler (sync) le pide que drene la cola y espera: cada canal reclama, envía y
+    registra sus lotes por su cuenta. El loop y los proveedores (pools, semáforos, limitadores)
+    viven entre corridas.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._proveedores = {}
+
+    def _asegurar_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="notif-despachador", daemon=True).start()
+                self._proveedores = crear_proveedores()
+                self._loop = loop
+            return self._loop
+
+    async def _enviar(self, fila) -> dict:
+        try:
+            # el timeout lo aplica el proveedor alrededor del envío (NOTIF_TIMEOUT_SEG)
+            proveedor_id = await self._proveedores[fila.canal].enviar(fila.destino, fila.mensaje)
+            return {"id": fila.id, "ok": True, "proveedor_msg_id": proveedor_id}
+        except Exception as e:
+            return {"id": fila.id, "ok": False, "error": str(e) or type(e).__name__}
+
+    async def _drenar_canal(self, canal: str) -> int:
+        """
+        Reclama y envía lotes de un solo canal hasta vaciarlo (o NOTIF_MAX_LOTES_POR_CORRIDA).
+        Cada canal avanza a su ritmo: un lote lento de SMS no demora el próximo reclamo de WhatsApp.
+        Las consultas corren en el executor con una sesión propia del canal.
+        """
+        loop = asyncio.get_running_loop()
+        lease_seg = lease_para(self._proveedores[canal])
+        db: Session = WorkerSessionLocal()
+        procesadas = 0
+        try:
+            for _ in range(NOTIF_MAX_LOTES_POR_CORRIDA):
+                lote = await loop.run_in_executor(None, lambda: reclamar_notificaciones(
+                    db, datetime.utcnow(), worker_id=WORKER_ID, limit=NOTIF_LOTE, lease_seg=lease_seg, canal=canal,
+                ))
+                if not lote:
+                    break
+
+                resultados = await asyncio.gather(*(self._enviar(f) for f in lote))
+                await loop.run_in_executor(None, registrar_resultados_envio, db, list(resultados), WORKER_ID)
+                procesadas += len(lote)
+
+                if len(lote) < NOTIF_LOTE:
+                    break
+        finally:
+            await loop.run_in_executor(None, db.close)
+        return procesadas
 
+    async def _drenar(self) -> int:
+        return sum(await asyncio.gather(*(self._drenar_canal(canal) for canal in self._proveedores)))
+
+    def procesar(self) -> int:
+        loop = self._asegurar_loop()
+        return asyncio.run_coroutine_threadsafe(self._drenar(), loop).result()
+
+    def cerrar(self):
+        with self._lock:
+            if self._loop is None:
+                return
+            loop, self._loop = self._loop, None
+
+        async def _cerrar_proveedores():
+            for proveedor in self._proveedores.values():
+                await proveedor.cerrar()
+
+        asyncio.run_coroutine_threadsafe(_cerrar_proveedores(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+
+
+despachador = _Despachador()
+
+def procesar_notificaciones() -> int:
+    # devuelve cuántas notificaciones se intentaron enviar (para las métricas del job)
+    return despachador.procesar()
+
+
+def archivar_notificaciones_viejas() -> int:
+    db: Session = WorkerSessionLocal()
+    try:
+        return archivar_notificaciones(db, datetime.utcnow())
     finally:
         db.close()
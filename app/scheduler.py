@@ -1,25 +1,60 @@
-from datetime import datetime, timedelta
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+from threading import Lock
+from apscheduler.events import EVENT_JOB_SUBMITTED, EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MISSED
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.database import SessionLocal
+from app.database import WorkerSessionLocal
 from app.models.turno_model import Turno
 from app.services.turnos_service import (
-    aplicar_evento_turno,
+    aplicar_evento_turnos_lote,
     EVENTO_VENCER,
     EVENTO_NO_ASISTIO,
-    _estado_id_por_codigo,
 )
+from app.services.estados_turno_service import estado_id_por_codigo
+from app.services.leases_service import adquirir_lease, liberar_lease
+from app.services.jobs_estado_service import registrar_corrida, registrar_salteada
+from app.notificaciones_scheduler import (
+    procesar_notificaciones,
+    archivar_notificaciones_viejas,
+    WORKER_ID,
+)
+
+logger = logging.getLogger(__name__)
 
 TTL_RESERVA_MIN = 60  # Tiempo en minutos que una reserva puede estar sin confirmar
+TAMANIO_LOTE = 500  # Turnos por UPDATE/commit: acota el tiempo que se mantienen los locks
+
+def _aplicar_en_lotes(db: Session, turno_ids: list[int], evento: str) -> int:
+    total = 0
+    for i in range(0, len(turno_ids), TAMANIO_LOTE):
+        lote = turno_ids[i:i + TAMANIO_LOTE]
+        try:
+            resultado = aplicar_evento_turnos_lote(db, lote, evento, actor="sistema")
+        except Exception:
+            # un lote que falla (deadlock, timeout de lock, ...) no frena al resto: sus turnos
+            # siguen en el estado de origen y se retoman en la próxima corrida
+            db.rollback()
+            logger.exception("%s lote %d: falló, se reintenta en la próxima corrida", evento, i // TAMANIO_LOTE + 1)
+            continue
+        logger.info(
+            "%s lote %d: %d turnos, %d actualizados, %d omitidos",
+            evento, i // TAMANIO_LOTE + 1, resultado["lote"], resultado["actualizados"], resultado["omitidos"],
+        )
+        total += resultado["actualizados"]
+    return total
 
-def _procesar_turnos_sistema():
-    db: Session = SessionLocal()
+def _procesar_turnos_sistema() -> int:
+    db: Session = WorkerSessionLocal()
     try:
         ahora = datetime.utcnow()
 
-        estado_reservado = _estado_id_por_codigo(db, "RESERVADO")
-        estado_confirmado = _estado_id_por_codigo(db, "CONFIRMADO")
+        estado_reservado = estado_id_por_codigo(db, "RESERVADO")
+        estado_confirmado = estado_id_por_codigo(db, "CONFIRMADO")
 
         # 1) Vencer reservas: RESERVADO y creado_en viejo
         limite = ahora - timedelta(minutes=TTL_RESERVA_MIN)
@@ -29,22 +64,177 @@ def _procesar_turnos_sistema():
                 Turno.estado_id == estado_reservado,
                 Turno.creado_en != None,
                 Turno.creado_en < limite
-            )
+            ).order_by(Turno.id)
         ).scalars().all()
 
-        for turno_id in reservas_vencidas:
-            aplicar_evento_turno(db, turno_id, EVENTO_VENCER, actor="sistema")
+        vencidas = _aplicar_en_lotes(db, list(reservas_vencidas), EVENTO_VENCER)
 
         # 2) No asistió automático: CONFIRMADO y ya terminó
         no_asistio = db.execute(
             select(Turno.id).where(
                 Turno.estado_id == estado_confirmado,
                 Turno.fecha_hora_fin < ahora
-            )
+            ).order_by(Turno.id)
         ).scalars().all()
 
-        for turno_id in no_asistio:
-            aplicar_evento_turno(db, turno_id, EVENTO_NO_ASISTIO, actor="sistema")
+        marcados = _aplicar_en_lotes(db, list(no_asistio), EVENTO_NO_ASISTIO)
+
+        return vencidas + marcados  # turnos actualizados (para las métricas del job)
+
+    finally:
+        db.close()
+
+
+# ---- Liderazgo: una sola instancia corre los jobs ----
+# Todas las instancias registran los jobs, pero cada corrida se salta si esta instancia no tiene el lease
+# "scheduler". El lease se renueva cada LEASE_RENOVACION_SEG; si el líder muere, otra instancia lo toma
+# a lo sumo LEASE_DURACION_SEG después.
+
+LEASE_SCHEDULER = "scheduler"
+LEASE_DURACION_SEG = int(os.getenv("SCHEDULER_LEASE_SEG", "30"))
+LEASE_RENOVACION_SEG = int(os.getenv("SCHEDULER_LEASE_RENOVACION_SEG", "10"))
 
+_lock_lider = Lock()
+_lider_hasta = 0.0  # monotonic: hasta cuándo esta instancia se considera líder
+
+
+def soy_lider() -> bool:
+    with _lock_lider:
+        return _lider_hasta > time.monotonic()
+
+
+def _renovar_liderazgo():
+    global _lider_hasta
+    inicio = time.monotonic()  # contamos desde antes del UPDATE: del lado seguro si la base tarda
+    db: Session = WorkerSessionLocal()
+    try:
+        lider = adquirir_lease(db, LEASE_SCHEDULER, WORKER_ID, LEASE_DURACION_SEG)
+    except Exception:
+        logger.exception("No se pudo renovar el lease del scheduler")
+        lider = False
+    finally:
+        db.close()
+
+    with _lock_lider:
+        era_lider = _lider_hasta > inicio
+        _lider_hasta = inicio + LEASE_DURACION_SEG if lider else 0.0
+    if lider != era_lider:
+        logger.info("Scheduler %s: %s", WORKER_ID, "ahora es líder" if lider else "dejó de ser líder")
+
+
+def soltar_liderazgo():
+    global _lider_hasta
+    with _lock_lider:
+        if _lider_hasta <= time.monotonic():
+            return
+        _lider_hasta = 0.0
+    db: Session = WorkerSessionLocal()
+    try:
+        liberar_lease(db, LEASE_SCHEDULER, WORKER_ID)
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# ---- Métricas de los jobs (tabla jobs_estado, las expone GET /ready) ----
+
+_lock_lag = Lock()
+_lag_por_job: dict[str, float] = {}  # job_id -> segundos entre la hora programada y el envío al executor
+
+
+def _guardar_metricas(funcion_registro, *args, **kwargs):
+    # las métricas nunca tiran abajo un job ni el scheduler
+    db: Session = WorkerSessionLocal()
+    try:
+        funcion_registro(db, *args, **kwargs)
+    except Exception:
+        logger.exception("No se pudieron guardar las métricas del job")
+    finally:
+        db.close()
+
+
+def _job_instrumentado(job_id: str, funcion, intervalo_seg: int):
+    """
+    Corre `funcion` solo si esta instancia es líder y registra duración, filas procesadas
+    (lo que devuelve la función), lag y resultado.
+    """
+    @wraps(funcion)
+    def _ejecutar():
+        if not soy_lider():
+            return None
+        with _lock_lag:
+            lag_seg = _lag_por_job.pop(job_id, None)
+
+        inicio = datetime.utcnow()
+        t0 = time.perf_counter()
+        error = None
+        filas = None
+        try:
+            filas = funcion()
+            return filas
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            raise  # APScheduler lo loguea con el traceback
+        finally:
+            duracion = time.perf_counter() - t0
+            logger.info(
+                "job %s: %.2f s, filas=%s, lag=%s%s",
+                job_id, duracion, filas, f"{lag_seg:.2f} s" if lag_seg is not None else "-", f", error={error}" if error else "",
+            )
+            _guardar_metricas(
+                registrar_corrida,
+                job_id,
+                instancia=WORKER_ID,
+                intervalo_seg=intervalo_seg,
+                inicio=inicio,
+                duracion_seg=duracion,
+                filas=filas if isinstance(filas, int) else None,
+                lag_seg=lag_seg,
+                error=error,
+            )
+    return _ejecutar
+
+
+def _escuchar_eventos(evento):
+    if evento.job_id not in _JOBS_INSTRUMENTADOS:
+        return
+    if evento.code == EVENT_JOB_SUBMITTED:
+        lag = (datetime.now(timezone.utc) - evento.scheduled_run_times[-1]).total_seconds()
+        with _lock_lag:
+            _lag_por_job[evento.job_id] = max(lag, 0.0)
+        return
+
+    # corridas salteadas: la anterior seguía corriendo (max_instances) o se pasó misfire_grace_time
+    if not soy_lider():
+        return
+    superpuesta = evento.code == EVENT_JOB_MAX_INSTANCES
+    logger.warning("job %s salteado: %s", evento.job_id, "la corrida anterior sigue en curso" if superpuesta else "fuera de misfire_grace_time")
+    _guardar_metricas(registrar_salteada, evento.job_id, superpuesta=superpuesta)
+
+
+# (id, función, intervalo en segundos)
+JOBS = (
+    ("turnos_sistema", _procesar_turnos_sistema, 60),
+    ("notificaciones", procesar_notificaciones, 30),
+    ("archivar_notificaciones", archivar_notificaciones_viejas, 24 * 3600),
+)
+_JOBS_INSTRUMENTADOS = {job_id for job_id, _, _ in JOBS}
+
+
+def registrar_jobs(scheduler):
+    scheduler.add_job(
+        _renovar_liderazgo, "interval", seconds=LEASE_RENOVACION_SEG, id="lease_scheduler", next_run_time=datetime.now(),
+        max_instances=1, coalesce=True,
+    )
+    # Política de solapamiento: nunca dos corridas del mismo job a la vez (max_instances=1); si se atrasó,
+    # las corridas pendientes se juntan en una (coalesce) y se descarta la que arranque más de un intervalo tarde.
+    for job_id, funcion, segundos in JOBS:
+        scheduler.add_job(
+            _job_instrumentado(job_id, funcion, segundos),
+            "interval",
+            seconds=segundos,
+            id=job_id,
+            max_instances=1,
+            coalesce=True,
+            misfire_grace_time=segundos,
+        )
+    scheduler.add_listener(_escuchar_eventos, EVENT_JOB_SUBMITTED | EVENT_JOB_MAX_INSTANCES | EVENT_JOB_MISSED)
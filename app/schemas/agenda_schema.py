@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional, Literal
+from app.schemas.turno_schema import TurnoOut
+
+class AgendaItemOut(BaseModel):
+    tipo: Literal["turno", "bloqueo", "libre"]
+    fecha_hora_inicio: datetime
+    fecha_hora_fin: datetime
+    turno: Optional[TurnoOut] = None #solo si tipo == "turno"
+    bloqueo_id: Optional[int] = None #solo si tipo == "bloqueo"
+    recurrente_id: Optional[int] = None #solo si tipo == "bloqueo" y viene de un bloqueo recurrente
+    motivo: Optional[str] = None
+
+class AgendaOut(BaseModel):
+    profesional_id: int
+    desde: datetime
+    hasta: datetime
+    conteos: dict[str, int] #cantidad de turnos por código de estado
+    items: list[AgendaItemOut] #ordenados por fecha_hora_inicio
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from datetime import datetime
+from pydantic import BaseModel, field_validator
+from datetime import date, datetime, time
 from typing import Optional
 
 class BloqueoAgendaCreate(BaseModel): #representa los datos que se necesitan para insertar un registro en la tabla bloqueo_agenda (lo que iría en VALUES de un INSERT INTO bloqueo_agenda)
@@ -9,12 +9,44 @@ class BloqueoAgendaCreate(BaseModel): #representa los datos que se necesitan par
     motivo: str
 
 class BloqueoAgendaOut(BaseModel): #representa los campos de la tabla bloqueo_agenda que se pretenden insertar/editar (las columnas en el INSERT/UPDATE)
-    id: int
+    id: Optional[int] = None #None en las ocurrencias de un bloqueo recurrente
     profesional_id: int
     fecha_hora_inicio: datetime
     fecha_hora_fin: datetime
     motivo: Optional[str] = None
+    recurrente_id: Optional[int] = None #solo en ocurrencias de un bloqueo recurrente
+
+    model_config = {
+        "from_attributes": True
+    }
+
+class BloqueoRecurrenteCreate(BaseModel): #regla semanal: se bloquea hora_inicio-hora_fin los dias_semana indicados, entre vigente_desde y vigente_hasta
+    profesional_id: int
+    dias_semana: list[int] #0 = lunes ... 6 = domingo
+    hora_inicio: time
+    hora_fin: time
+    vigente_desde: date
+    vigente_hasta: Optional[date] = None #inclusive; None = sin fin
+    motivo: str
+
+class BloqueoRecurrenteOut(BaseModel):
+    id: int
+    profesional_id: int
+    dias_semana: list[int]
+    hora_inicio: time
+    hora_fin: time
+    vigente_desde: date
+    vigente_hasta: Optional[date] = None
+    motivo: Optional[str] = None
+
+    @field_validator("dias_semana", mode="before")
+    @classmethod
+    def _dias_desde_columna(cls, v):
+        # en la tabla se guarda como "0,2,4"
+        if isinstance(v, str):
+            return [int(d) for d in v.split(",") if d != ""]
+        return v
 
     model_config = {
         "from_attributes": True
-    }   
\ No newline at end of file
+    }
@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from datetime import datetime
+
+class SlotLibreOut(BaseModel):
+    fecha_hora_inicio: datetime
+    fecha_hora_fin: datetime
+
+class DisponibilidadOut(BaseModel):
+    profesional_id: int
+    duracion_turno_min: int
+    slots: list[SlotLibreOut]
@@ -0,0 +1,37 @@
+from pydantic import BaseModel
+from datetime import date, time
+from typing import Optional
+
+class FranjaHorarioIn(BaseModel): #una franja de la plantilla semanal (puede haber varias por día)
+    dia_semana: int #0 = lunes ... 6 = domingo
+    hora_inicio: time
+    hora_fin: time
+
+class HorarioAtencionOut(BaseModel):
+    id: int
+    profesional_id: int
+    dia_semana: int
+    hora_inicio: time
+    hora_fin: time
+
+    model_config = {
+        "from_attributes": True
+    }
+
+class ExcepcionHorarioCreate(BaseModel): #sin horas = no atiende ese día; con horas = reemplaza las franjas de la plantilla ese día
+    fecha: date
+    hora_inicio: Optional[time] = None
+    hora_fin: Optional[time] = None
+    motivo: Optional[str] = None
+
+class ExcepcionHorarioOut(BaseModel):
+    id: int
+    profesional_id: int
+    fecha: date
+    hora_inicio: Optional[time] = None
+    hora_fin: Optional[time] = None
+    motivo: Optional[str] = None
+
+    model_config = {
+        "from_attributes": True
+    }
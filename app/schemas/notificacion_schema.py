@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+class NotificacionOut(BaseModel):
+    id: int
+    turno_id: Optional[int] = None
+    paciente_id: int
+    canal: str
+    tipo: str
+    programada_para: datetime
+    estado: str
+    intentos: int
+    ultimo_error: Optional[str] = None
+    enviada_en: Optional[datetime] = None
+
+    model_config = {"from_attributes": True}
+
+class ReencolarNotificaciones(BaseModel):
+    ids: list[int]
+
+class ReencolarNotificacionesOut(BaseModel):
+    reencoladas: int
@@ -28,3 +28,15 @@ class PacienteUpdate(BaseModel):
     telefono: Optional[str] = None
     canal_contacto: Optional[Literal['whatsapp', 'telegram', 'sms']] = None
     activo: Optional[bool] = None
+
+
+class RechazoImportacionOut(BaseModel):
+    linea: int
+    motivo: str
+
+class ImportacionPacientesOut(BaseModel):
+    procesadas: int
+    insertadas: int
+    rechazadas: int
+    rechazos: list[RechazoImportacionOut] #detalle de los primeros rechazos
+    error: Optional[str] = None #si la importación se cortó antes del final del archivo (ej: bytes que no son UTF-8)
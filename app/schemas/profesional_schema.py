@@ -1,11 +1,11 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional
 
 class ProfesionalCreate(BaseModel): #representa los datos que se necesitan para insertar un registro en la tabla profesionales (lo que iría en VALUES de un INSERT INTO profesionales)
     nombre: str
     especialidad: Optional[str] = None
-    duracion_turno_min: int = 60
+    duracion_turno_min: int = Field(default=60, gt=0) #es el paso de la grilla de disponibilidad: 0 no avanza nunca
 
 class ProfesionalOut(BaseModel): #representa los campos de la tabla profesionales que se pretenden insertar/editar (las columnas en el INSERT/UPDATE)
     id: int
@@ -21,5 +21,5 @@ class ProfesionalOut(BaseModel): #representa los campos de la tabla profesionale
 class ProfesionalUpdate(BaseModel):
     nombre: Optional[str] = None
     especialidad: Optional[str] = None
-    duracion_turno_min: Optional[int] = None
+    duracion_turno_min: Optional[int] = Field(default=None, gt=0)
     activo: Optional[bool] = None
\ No newline at end of file
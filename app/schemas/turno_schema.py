@@ -1,5 +1,7 @@
 from pydantic import BaseModel
-from datetime import datetime
+from datetime import datetime, date, time
+from typing import Optional, Literal
+from pydantic import Field
 from app.schemas.estado_turno_schema import EstadoTurnoOut
 
 class TurnoCreate(BaseModel): #representa los datos que se necesitan para insertar un registro en la tabla turnos (lo que iría en VALUES de un INSERT INTO turnos)
@@ -20,4 +22,36 @@ class TurnoOut(BaseModel): #representa los campos de la tabla turnos que se pret
 
     model_config = {
         "from_attributes": True
-    }
\ No newline at end of file
+    }
+
+class TurnoPaginaOut(BaseModel):
+    items: list[TurnoOut]
+    siguiente_cursor: Optional[str] = None #None si no hay más páginas
+
+
+class SlotTurno(BaseModel):
+    fecha_hora_inicio: datetime
+    fecha_hora_fin: datetime
+
+class RecurrenciaTurnos(BaseModel): #ej: 10 sesiones lunes/miércoles/viernes a las 9:00
+    fecha_desde: date
+    dias_semana: list[int] = Field(min_length=1) #0 = lunes ... 6 = domingo
+    hora: time
+    cantidad: int = Field(ge=1, le=100)
+    duracion_min: Optional[int] = Field(default=None, ge=5, le=480) #si no viene, duracion_turno_min del profesional
+
+class TurnoLoteCreate(BaseModel):
+    paciente_id: int
+    profesional_id: int
+    slots: Optional[list[SlotTurno]] = None #o una lista explícita de horarios...
+    recurrencia: Optional[RecurrenciaTurnos] = None #...o una regla de recurrencia (uno de los dos)
+    modo: Literal["todo_o_nada", "mejor_esfuerzo"] = "todo_o_nada"
+
+class ConflictoSlotOut(BaseModel):
+    fecha_hora_inicio: datetime
+    fecha_hora_fin: datetime
+    detalle: str
+
+class TurnoLoteOut(BaseModel):
+    creados: list[TurnoOut]
+    conflictos: list[ConflictoSlotOut]
@@ -0,0 +1,101 @@
+# Vista de agenda de un profesional (día / semana): turnos, bloqueos y huecos libres en una sola estructura.
+from datetime import date, datetime, time, timedelta
+
+from fastapi import HTTPException
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+
+from app.models.turno_model import Turno
+from app.models.profesional_model import Profesional
+from app.models.bloqueo_agenda_model import BloqueoAgenda
+from app.services.estados_turno_service import codigo_por_estado_id, estados_activos_ids
+from app.services.disponibilidad_service import fusionar_intervalos, huecos_entre
+from app.services.bloqueos_recurrentes_service import ocurrencias_recurrentes
+from app.services.horarios_service import ventanas_en_rango
+from app.services.turnos_service import COLUMNAS_TURNO_OUT, fila_turno_a_dict
+
+
+def rango_dia(fecha: date) -> tuple[datetime, datetime]:
+    inicio = datetime.combine(fecha, time.min)
+    return inicio, inicio + timedelta(days=1)
+
+
+def rango_semana(fecha: date) -> tuple[datetime, datetime]:
+    # semana de lunes a domingo que contiene a `fecha`
+    inicio = datetime.combine(fecha - timedelta(days=fecha.weekday()), time.min)
+    return inicio, inicio + timedelta(days=7)
+
+
+def agenda_profesional(db: Session, profesional_id: int, desde: datetime, hasta: datetime) -> dict:
+    """
+    Devuelve {"profesional_id", "desde", "hasta", "conteos", "items"}:
+      - conteos: cantidad de turnos del rango por código de estado (GROUP BY en la base).
+      - items: turnos (de cualquier estado), bloqueos y huecos libres, ordenados por inicio.
+        Los huecos son lo que no ocupan los turnos activos ni los bloqueos, dentro del horario de atención.
+    """
+    profesional = db.get(Profesional, profesional_id)
+    if not profesional:
+        raise HTTPException(status_code=404, detail="Profesional no encontrado.")
+
+    filtro_turnos = (
+        Turno.profesional_id == profesional_id,
+        desde < Turno.fecha_hora_fin,
+        hasta > Turno.fecha_hora_inicio,
+    )
+
+    turnos = db.execute(
+        select(*COLUMNAS_TURNO_OUT).where(*filtro_turnos).order_by(Turno.fecha_hora_inicio, Turno.id)
+    ).all()
+
+    conteos = {
+        codigo_por_estado_id(db, estado_id): cantidad
+        for estado_id, cantidad in db.execute(
+            select(Turno.estado_id, func.count()).where(*filtro_turnos).group_by(Turno.estado_id)
+        ).all()
+    }
+
+    bloqueos = db.execute(
+        select(BloqueoAgenda.id, BloqueoAgenda.fecha_hora_inicio, BloqueoAgenda.fecha_hora_fin, BloqueoAgenda.motivo)
+        .where(
+            BloqueoAgenda.profesional_id == profesional_id,
+            BloqueoAgenda.activo == True,
+            desde < BloqueoAgenda.fecha_hora_fin,
+            hasta > BloqueoAgenda.fecha_hora_inicio,
+        )
+        .order_by(BloqueoAgenda.fecha_hora_inicio)
+    ).all()
+    recurrentes = ocurrencias_recurrentes(db, profesional_id, desde, hasta)
+
+    estados_activos = set(estados_activos_ids(db))
+    ocupados = fusionar_intervalos(
+        [(t.fecha_hora_inicio, t.fecha_hora_fin) for t in turnos if t.estado_id in estados_activos]
+        + [(b.fecha_hora_inicio, b.fecha_hora_fin) for b in bloqueos]
+        + [(o.fecha_hora_inicio, o.fecha_hora_fin) for o in recurrentes]
+    )
+    ventanas = ventanas_en_rango(db, profesional_id, desde, hasta)
+    if ventanas is not None:
+        # lo que queda fuera del horario de atención tampoco es un hueco libre
+        ocupados = fusionar_intervalos(ocupados + huecos_entre(desde, hasta, ventanas))
+
+    items = [
+        {"tipo": "turno", "fecha_hora_inicio": t.fecha_hora_inicio, "fecha_hora_fin": t.fecha_hora_fin, "turno": fila_turno_a_dict(db, t)}
+        for t in turnos
+    ] + [
+        {"tipo": "bloqueo", "fecha_hora_inicio": b.fecha_hora_inicio, "fecha_hora_fin": b.fecha_hora_fin, "bloqueo_id": b.id, "motivo": b.motivo}
+        for b in bloqueos
+    ] + [
+        {"tipo": "bloqueo", "fecha_hora_inicio": o.fecha_hora_inicio, "fecha_hora_fin": o.fecha_hora_fin, "recurrente_id": o.recurrente_id, "motivo": o.motivo}
+        for o in recurrentes
+    ] + [
+        {"tipo": "libre", "fecha_hora_inicio": inicio, "fecha_hora_fin": fin}
+        for inicio, fin in huecos_entre(desde, hasta, ocupados)
+    ]
+    items.sort(key=lambda i: i["fecha_hora_inicio"])
+
+    return {
+        "profesional_id": profesional_id,
+        "desde": desde,
+        "hasta": hasta,
+        "conteos": conteos,
+        "items": items,
+    }
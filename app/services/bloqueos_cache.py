@@ -0,0 +1,106 @@
+# Índice en memoria de los bloqueos de agenda futuros de cada profesional (y de sus reglas recurrentes).
+# Es para vistas de lectura (disponibilidad): buscar los bloqueos de un rango es una búsqueda binaria
+# en vez de una consulta. Se invalida al crear/eliminar bloqueos en esta instancia; el TTL acota cuánto
+# tarda en verse un bloqueo creado desde otra réplica. Por eso la reserva (validar_reserva) no lo usa:
+# chequea los bloqueos y las reglas recurrentes en la base.
+import os
+import time
+from bisect import bisect_left
+from datetime import datetime
+from itertools import accumulate
+from threading import Lock
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.bloqueo_agenda_model import BloqueoAgenda
+from app.services.bloqueos_recurrentes_service import (
+    ReglaRecurrente,
+    reglas_vigentes,
+    expandir_reglas,
+    intervalos_recurrentes,
+)
+
+BLOQUEOS_CACHE_TTL_SEG = int(os.getenv("BLOQUEOS_CACHE_TTL_SEG", "30"))
+
+Intervalo = tuple[datetime, datetime]
+
+
+class IndiceIntervalos:
+    """
+    Intervalos [inicio, fin) ordenados por inicio, con el máximo de los fines acumulado.
+    Hay solapamiento con [a, b) sii entre los que empiezan antes de b alguno termina después de a,
+    es decir, sii max_fin[k-1] > a con k = cantidad de inicios < b. Una búsqueda binaria: O(log n).
+    """
+    def __init__(self, intervalos: list[Intervalo]):
+        self._intervalos = sorted(intervalos)
+        self._inicios = [inicio for inicio, _ in self._intervalos]
+        self._max_fin = list(accumulate((fin for _, fin in self._intervalos), max))
+
+    def __len__(self):
+        return len(self._intervalos)
+
+    def se_solapa(self, inicio: datetime, fin: datetime) -> bool:
+        k = bisect_left(self._inicios, fin)
+        return k > 0 and self._max_fin[k - 1] > inicio
+
+    def solapados(self, inicio: datetime, fin: datetime) -> list[Intervalo]:
+        k = bisect_left(self._inicios, fin)
+        return [(i, f) for i, f in self._intervalos[:k] if f > inicio]
+
+
+_lock = Lock()
+# profesional_id -> (vence_en monotonic, cargado_desde, indice, reglas recurrentes vigentes)
+_cache: dict[int, tuple[float, datetime, IndiceIntervalos, list[ReglaRecurrente]]] = {}
+
+
+def invalidar_bloqueos(profesional_id: int) -> None:
+    with _lock:
+        _cache.pop(profesional_id, None)
+
+
+def _indice_bloqueos(db: Session, profesional_id: int) -> tuple[datetime, IndiceIntervalos, list[ReglaRecurrente]]:
+    ahora_mono = time.monotonic()
+    with _lock:
+        entrada = _cache.get(profesional_id)
+    if entrada and entrada[0] > ahora_mono:
+        return entrada[1:]
+
+    # solo los que todavía no terminaron: cualquier bloqueo que pise un rango que empieza después de `desde` está acá
+    desde = datetime.utcnow()
+    filas = db.execute(
+        select(BloqueoAgenda.fecha_hora_inicio, BloqueoAgenda.fecha_hora_fin).where(
+            BloqueoAgenda.profesional_id == profesional_id,
+            BloqueoAgenda.activo == True,
+            BloqueoAgenda.fecha_hora_fin > desde,
+        )
+    ).all()
+    indice = IndiceIntervalos([(inicio, fin) for inicio, fin in filas])
+    # las reglas no se expanden acá: se guardan tal cual y se evalúan solo sobre el rango del turno
+    reglas = reglas_vigentes(db, profesional_id, desde.date())
+
+    with _lock:
+        _cache[profesional_id] = (ahora_mono + BLOQUEOS_CACHE_TTL_SEG, desde, indice, reglas)
+    return desde, indice, reglas
+
+
+def intervalos_bloqueados(db: Session, profesional_id: int, desde: datetime, hasta: datetime) -> list[Intervalo]:
+    """
+    Bloqueos activos y ocurrencias de reglas recurrentes que se solapan con [desde, hasta), sin fusionar.
+    """
+    cargado_desde, indice, reglas = _indice_bloqueos(db, profesional_id)
+    if desde >= cargado_desde:
+        return indice.solapados(desde, hasta) + [
+            (o.fecha_hora_inicio, o.fecha_hora_fin) for o in expandir_reglas(reglas, desde, hasta)
+        ]
+
+    # rango (al menos en parte) en el pasado: no está en el índice, consultamos la base
+    filas = db.execute(
+        select(BloqueoAgenda.fecha_hora_inicio, BloqueoAgenda.fecha_hora_fin).where(
+            BloqueoAgenda.profesional_id == profesional_id,
+            BloqueoAgenda.activo == True,
+            desde < BloqueoAgenda.fecha_hora_fin,
+            hasta > BloqueoAgenda.fecha_hora_inicio,
+        )
+    ).all()
+    return [(inicio, fin) for inicio, fin in filas] + intervalos_recurrentes(db, profesional_id, desde, hasta)
@@ -0,0 +1,163 @@
+# Bloqueos recurrentes: una regla semanal por fila, expandida solo sobre el rango que se consulta.
+# El costo depende de los días del rango y de la cantidad de reglas, no de cuántas ocurrencias tenga la regla.
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from threading import Lock
+
+from fastapi import HTTPException
+from sqlalchemy import select, or_
+from sqlalchemy.orm import Session
+
+from app.models.bloqueo_recurrente_model import BloqueoRecurrente
+from app.services.version_agenda_service import subir_version_agenda
+
+MAX_RANGO_EXPANSION = timedelta(days=366)
+
+
+@dataclass(frozen=True)
+class ReglaRecurrente:
+    id: int
+    profesional_id: int
+    dias_semana: frozenset[int]
+    hora_inicio: time
+    hora_fin: time
+    vigente_desde: date
+    vigente_hasta: date | None
+    motivo: str | None
+
+
+@dataclass(frozen=True)
+class OcurrenciaBloqueo:
+    profesional_id: int
+    fecha_hora_inicio: datetime
+    fecha_hora_fin: datetime
+    recurrente_id: int
+    motivo: str | None
+
+
+def codificar_dias(dias: list[int]) -> str:
+    return ",".join(str(d) for d in sorted(set(dias)))
+
+
+def decodificar_dias(dias: str) -> list[int]:
+    return [int(d) for d in dias.split(",") if d != ""]
+
+
+def _columnas_regla():
+    return (
+        BloqueoRecurrente.id,
+        BloqueoRecurrente.profesional_id,
+        BloqueoRecurrente.dias_semana,
+        BloqueoRecurrente.hora_inicio,
+        BloqueoRecurrente.hora_fin,
+        BloqueoRecurrente.vigente_desde,
+        BloqueoRecurrente.vigente_hasta,
+        BloqueoRecurrente.motivo,
+    )
+
+
+def _regla_desde_fila(fila) -> ReglaRecurrente:
+    return ReglaRecurrente(
+        id=fila.id,
+        profesional_id=fila.profesional_id,
+        dias_semana=frozenset(decodificar_dias(fila.dias_semana)),
+        hora_inicio=fila.hora_inicio,
+        hora_fin=fila.hora_fin,
+        vigente_desde=fila.vigente_desde,
+        vigente_hasta=fila.vigente_hasta,
+        motivo=fila.motivo,
+    )
+
+
+def reglas_vigentes(db: Session, profesional_id: int | None, desde: date, hasta: date | None = None) -> list[ReglaRecurrente]:
+    """
+    Reglas activas cuya vigencia toca [desde, hasta] (fechas, inclusive). Sin hasta: desde `desde` en adelante.
+    Con profesional_id None trae las de todos los profesionales.
+    """
+    filtros = [
+        BloqueoRecurrente.activo == True,
+        or_(BloqueoRecurrente.vigente_hasta == None, BloqueoRecurrente.vigente_hasta >= desde),
+    ]
+    if profesional_id is not None:
+        filtros.append(BloqueoRecurrente.profesional_id == profesional_id)
+    if hasta is not None:
+        filtros.append(BloqueoRecurrente.vigente_desde <= hasta)
+
+    filas = db.execute(select(*_columnas_regla()).where(*filtros)).all()
+    return [_regla_desde_fila(f) for f in filas]
+
+
+def expandir_regla(regla: ReglaRecurrente, desde: datetime, hasta: datetime) -> list[OcurrenciaBloqueo]:
+    """
+    Ocurrencias de la regla que se solapan con [desde, hasta), ordenadas por inicio.
+    """
+    dia = max(desde.date(), regla.vigente_desde)
+    ultimo = hasta.date() if regla.vigente_hasta is None else min(hasta.date(), regla.vigente_hasta)
+
+    ocurrencias = []
+    while dia <= ultimo:
+        if dia.weekday() in regla.dias_semana:
+            inicio = datetime.combine(dia, regla.hora_inicio)
+            fin = datetime.combine(dia, regla.hora_fin)
+            if inicio < hasta and fin > desde:
+                ocurrencias.append(OcurrenciaBloqueo(regla.profesional_id, inicio, fin, regla.id, regla.motivo))
+        dia += timedelta(days=1)
+    return ocurrencias
+
+
+def validar_rango_expansion(desde: datetime, hasta: datetime) -> None:
+    # para endpoints donde el rango lo elige el cliente: la expansión es lineal en la cantidad de días
+    if hasta - desde > MAX_RANGO_EXPANSION:
+        raise HTTPException(
+            status_code=400,
+            detail=f"El rango no puede superar los {MAX_RANGO_EXPANSION.days} días.",
+        )
+
+
+def expandir_reglas(reglas: list[ReglaRecurrente], desde: datetime, hasta: datetime) -> list[OcurrenciaBloqueo]:
+    ocurrencias = [o for regla in reglas for o in expandir_regla(regla, desde, hasta)]
+    ocurrencias.sort(key=lambda o: (o.fecha_hora_inicio, o.recurrente_id))
+    return ocurrencias
+
+
+def ocurrencias_recurrentes(db: Session, profesional_id: int | None, desde: datetime, hasta: datetime) -> list[OcurrenciaBloqueo]:
+    return expandir_reglas(reglas_vigentes(db, profesional_id, desde.date(), hasta.date()), desde, hasta)
+
+
+def intervalos_recurrentes(db: Session, profesional_id: int, desde: datetime, hasta: datetime) -> list[tuple[datetime, datetime]]:
+    return [(o.fecha_hora_inicio, o.fecha_hora_fin) for o in ocurrencias_recurrentes(db, profesional_id, desde, hasta)]
+
+
+def regla_se_solapa(reglas: list[ReglaRecurrente], inicio: datetime, fin: datetime) -> bool:
+    # para un turno: solo se recorren los días que toca [inicio, fin)
+    return any(expandir_regla(regla, inicio, fin) for regla in reglas)
+
+
+_lock = Lock()
+# profesional_id -> (agenda_version, reglas activas del profesional). Sin TTL: vale mientras no cambie la versión.
+_cache: dict[int, tuple[int, list[ReglaRecurrente]]] = {}
+
+
+def invalidar_reglas_recurrentes(db: Session, profesional_id: int) -> None:
+    """
+    Llamar al crear o dar de baja una regla, dentro de la misma transacción (el caller commitea).
+    """
+    subir_version_agenda(db, profesional_id)
+    with _lock:
+        _cache.pop(profesional_id, None)
+
+
+def reglas_del_profesional(db: Session, profesional_id: int, version: int) -> list[ReglaRecurrente]:
+    """
+    Reglas activas del profesional (cualquier vigencia: regla_se_solapa y expandir_regla la respetan),
+    desde memoria si el cache es de `version` (la agenda_version recién leída en la validación de la reserva).
+    """
+    with _lock:
+        entrada = _cache.get(profesional_id)
+    if entrada and entrada[0] == version:
+        return entrada[1]
+
+    reglas = reglas_vigentes(db, profesional_id, date.min)
+    with _lock:
+        _cache[profesional_id] = (version, reglas)
+    return reglas
@@ -0,0 +1,138 @@
+# Cálculo de huecos libres en la agenda de un profesional.
+# Se leen una sola vez los turnos activos del rango (los bloqueos, del índice en memoria) y el barrido se hace en memoria.
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.turno_model import Turno
+from app.models.profesional_model import Profesional
+from app.services.estados_turno_service import estados_activos_ids
+from app.services.bloqueos_cache import intervalos_bloqueados
+from app.services.horarios_service import ventanas_en_rango
+
+MAX_RANGO_DISPONIBILIDAD = timedelta(days=31)
+
+Intervalo = tuple[datetime, datetime]
+
+
+def fusionar_intervalos(intervalos: list[Intervalo]) -> list[Intervalo]:
+    """
+    Ordena y une intervalos que se pisan o se tocan: [(9,10), (9:30,11), (11,12)] -> [(9,12)]
+    """
+    fusionados: list[Intervalo] = []
+    for inicio, fin in sorted(intervalos):
+        if fusionados and inicio <= fusionados[-1][1]:
+            if fin > fusionados[-1][1]:
+                fusionados[-1] = (fusionados[-1][0], fin)
+        else:
+            fusionados.append((inicio, fin))
+    return fusionados
+
+
+def huecos_entre(desde: datetime, hasta: datetime, ocupados: list[Intervalo]) -> list[Intervalo]:
+    # complemento de los ocupados (ordenados y fusionados) dentro de [desde, hasta)
+    huecos = []
+    cursor = desde
+    for inicio, fin in ocupados:
+        if inicio > cursor:
+            huecos.append((cursor, min(inicio, hasta)))
+        cursor = max(cursor, fin)
+        if cursor >= hasta:
+            break
+    if cursor < hasta:
+        huecos.append((cursor, hasta))
+    return huecos
+
+
+def intervalos_ocupados(db: Session, profesional_id: int, desde: datetime, hasta: datetime) -> list[Intervalo]:
+    """
+    Turnos activos (RESERVADO/CONFIRMADO), bloqueos activos y ocurrencias de bloqueos recurrentes
+    que se solapan con [desde, hasta), ya fusionados. Los bloqueos salen del índice en memoria (bloqueos_cache).
+    """
+    turnos = db.execute(
+        select(Turno.fecha_hora_inicio, Turno.fecha_hora_fin).where(
+            Turno.profesional_id == profesional_id,
+            Turno.estado_id.in_(estados_activos_ids(db)),
+            desde < Turno.fecha_hora_fin,
+            hasta > Turno.fecha_hora_inicio,
+        )
+    ).all()
+
+    return fusionar_intervalos(
+        [(i, f) for i, f in turnos]
+        + intervalos_bloqueados(db, profesional_id, desde, hasta)
+    )
+
+
+def _siguiente_en_grilla(origen: datetime, paso: timedelta, instante: datetime) -> datetime:
+    # primer punto origen + k*paso que sea >= instante
+    pasos = -((origen - instante) // paso)  # división entera redondeando hacia arriba
+    return origen + max(pasos, 0) * paso
+
+
+def barrer_slots_libres(
+    desde: datetime,
+    hasta: datetime,
+    duracion: timedelta,
+    ocupados: list[Intervalo],
+) -> list[Intervalo]:
+    """
+    Recorre la grilla desde, desde+duracion, ... y devuelve los slots que no pisan ningún intervalo ocupado.
+    `ocupados` tiene que venir ordenado y fusionado (ver fusionar_intervalos).
+    """
+    slots: list[Intervalo] = []
+    t = desde
+    i = 0
+    while t + duracion <= hasta:
+        fin = t + duracion
+
+        # descartamos los ocupados que terminan antes de que empiece el slot
+        while i < len(ocupados) and ocupados[i][1] <= t:
+            i += 1
+
+        if i < len(ocupados) and ocupados[i][0] < fin:
+            # el slot pisa un ocupado: saltamos al primer punto de la grilla después de que termine
+            t = _siguiente_en_grilla(desde, duracion, ocupados[i][1])
+            continue
+
+        slots.append((t, fin))
+        t = fin
+
+    return slots
+
+
+def calcular_disponibilidad(
+    db: Session,
+    profesional_id: int,
+    desde: datetime,
+    hasta: datetime,
+    duracion_min: int | None = None,
+) -> tuple[Profesional, list[Intervalo]]:
+    if hasta <= desde:
+        raise HTTPException(status_code=400, detail="hasta debe ser mayor que desde")
+    if hasta - desde > MAX_RANGO_DISPONIBILIDAD:
+        raise HTTPException(
+            status_code=400,
+            detail=f"El rango no puede superar los {MAX_RANGO_DISPONIBILIDAD.days} días.",
+        )
+
+    profesional = db.get(Profesional, profesional_id)
+    if not profesional:
+        raise HTTPException(status_code=404, detail="Profesional no encontrado.")
+    if not profesional.activo:
+        raise HTTPException(status_code=400, detail="Profesional inactivo.")
+
+    duracion = timedelta(minutes=duracion_min or profesional.duracion_turno_min)
+    ocupados = intervalos_ocupados(db, profesional_id, desde, hasta)
+
+    ventanas = ventanas_en_rango(db, profesional_id, desde, hasta)
+    if ventanas is None:
+        return profesional, barrer_slots_libres(desde, hasta, duracion, ocupados)
+
+    # con horario de atención la grilla arranca en el inicio de cada franja
+    slots: list[Intervalo] = []
+    for inicio, fin in ventanas:
+        slots.extend(barrer_slots_libres(inicio, fin, duracion, ocupados))
+    return profesional, slots
@@ -0,0 +1,73 @@
+# Registro en memoria de la tabla estados_turno (codigo <-> id).
+# Es una tabla de catálogo que casi nunca cambia: se carga una vez al arrancar
+# y se refresca a demanda, así la FSM de turnos no consulta la base por cada transición.
+from threading import Lock
+from types import MappingProxyType
+from typing import Mapping
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.estado_turno_model import EstadoTurno
+
+ESTADOS_ACTIVOS = ("RESERVADO", "CONFIRMADO")  # estados que ocupan agenda
+
+_lock = Lock()
+
+# (id_por_codigo, codigo_por_id, estado_por_id): se reemplaza entero en cada refresco, nunca se muta
+_registro: tuple[Mapping[str, int], Mapping[int, str], Mapping[int, Mapping[str, object]]] = (
+    MappingProxyType({}), MappingProxyType({}), MappingProxyType({}),
+)
+
+
+def refrescar_estados_turno(db: Session) -> None:
+    filas = db.execute(select(EstadoTurno.id, EstadoTurno.codigo, EstadoTurno.descripcion)).all()
+    id_por_codigo = MappingProxyType({codigo: id_ for id_, codigo, _ in filas})
+    codigo_por_id = MappingProxyType({id_: codigo for id_, codigo, _ in filas})
+    estado_por_id = MappingProxyType({
+        id_: MappingProxyType({"id": id_, "codigo": codigo, "descripcion": descripcion})
+        for id_, codigo, descripcion in filas
+    })
+
+    global _registro
+    with _lock:
+        _registro = (id_por_codigo, codigo_por_id, estado_por_id)
+
+
+def estado_id_por_codigo(db: Session, codigo: str) -> int:
+    estado_id = _registro[0].get(codigo)
+    if estado_id is None:
+        # Puede ser un estado nuevo cargado después del arranque: refrescamos una vez
+        refrescar_estados_turno(db)
+        estado_id = _registro[0].get(codigo)
+    if estado_id is None:
+        raise HTTPException(status_code=500, detail=f"Estado '{codigo}' no existe en estados_turno.")
+    return estado_id
+
+
+def codigo_por_estado_id(db: Session, estado_id: int) -> str:
+    codigo = _registro[1].get(estado_id)
+    if codigo is None:
+        refrescar_estados_turno(db)
+        codigo = _registro[1].get(estado_id)
+    if codigo is None:
+        raise HTTPException(status_code=500, detail=f"Estado con id '{estado_id}' no existe en estados_turno.")
+    return codigo
+
+
+def estado_por_id(db: Session, estado_id: int) -> Mapping[str, object]:
+    """
+    {"id", "codigo", "descripcion"} del estado, sin ir a la base (para serializar turnos sin JOIN).
+    """
+    estado = _registro[2].get(estado_id)
+    if estado is None:
+        refrescar_estados_turno(db)
+        estado = _registro[2].get(estado_id)
+    if estado is None:
+        raise HTTPException(status_code=500, detail=f"Estado con id '{estado_id}' no existe en estados_turno.")
+    return estado
+
+
+def estados_activos_ids(db: Session) -> list[int]:
+    return [estado_id_por_codigo(db, codigo) for codigo in ESTADOS_ACTIVOS]
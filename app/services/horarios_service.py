@@ -0,0 +1,159 @@
+# Horario de atención de cada profesional: plantilla semanal + excepciones por fecha.
+# Se precalcula en memoria por profesional (franjas por día de la semana y por fecha de excepción),
+# así validar un turno o armar la grilla de disponibilidad no consulta la base.
+# Entre procesos se invalida con profesionales.agenda_version: la reserva trae la versión en su SELECT de
+# validación y si no coincide con la del cache se recarga. Las vistas de lectura usan el TTL.
+import os
+from time import monotonic
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from threading import Lock
+from types import MappingProxyType
+from typing import Mapping
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.horario_atencion_model import HorarioAtencion
+from app.models.excepcion_horario_model import ExcepcionHorario
+from app.models.profesional_model import Profesional
+from app.services.version_agenda_service import subir_version_agenda
+
+HORARIOS_CACHE_TTL_SEG = int(os.getenv("HORARIOS_CACHE_TTL_SEG", "300"))
+
+Franja = tuple[time, time]
+Intervalo = tuple[datetime, datetime]
+
+
+@dataclass(frozen=True)
+class HorarioProfesional:
+    semana: tuple[tuple[Franja, ...], ...]  # 7 entradas (lunes..domingo), franjas ordenadas
+    excepciones: Mapping[date, tuple[Franja, ...]]  # tupla vacía = no atiende ese día
+    con_plantilla: bool  # sin plantilla, los días sin excepción están abiertos las 24 hs
+
+    def franjas_del_dia(self, dia: date) -> tuple[Franja, ...] | None:
+        # None = día completo
+        if dia in self.excepciones:
+            return self.excepciones[dia]
+        if self.con_plantilla:
+            return self.semana[dia.weekday()]
+        return None
+
+
+_lock = Lock()
+# profesional_id -> (vence_en monotonic, agenda_version, horario o None si no tiene plantilla ni excepciones)
+_cache: dict[int, tuple[float, int, HorarioProfesional | None]] = {}
+
+
+def invalidar_horarios(db: Session, profesional_id: int) -> None:
+    """
+    Llamar cuando cambia el horario o las excepciones del profesional, dentro de la misma transacción
+    (el caller commitea). Los demás procesos lo ven en la próxima reserva por agenda_version.
+    """
+    subir_version_agenda(db, profesional_id)
+    with _lock:
+        _cache.pop(profesional_id, None)
+
+
+def _cargar_horario(db: Session, profesional_id: int) -> HorarioProfesional | None:
+    plantilla = db.execute(
+        select(HorarioAtencion.dia_semana, HorarioAtencion.hora_inicio, HorarioAtencion.hora_fin)
+        .where(HorarioAtencion.profesional_id == profesional_id)
+    ).all()
+    excepciones = db.execute(
+        select(ExcepcionHorario.fecha, ExcepcionHorario.hora_inicio, ExcepcionHorario.hora_fin)
+        .where(ExcepcionHorario.profesional_id == profesional_id)
+    ).all()
+    if not plantilla and not excepciones:
+        return None
+
+    semana: list[list[Franja]] = [[] for _ in range(7)]
+    for dia_semana, inicio, fin in plantilla:
+        semana[dia_semana].append((inicio, fin))
+
+    por_fecha: dict[date, list[Franja]] = {}
+    for fecha, inicio, fin in excepciones:
+        franjas = por_fecha.setdefault(fecha, [])
+        if inicio is not None:
+            franjas.append((inicio, fin))
+
+    return HorarioProfesional(
+        semana=tuple(tuple(sorted(franjas)) for franjas in semana),
+        excepciones=MappingProxyType({fecha: tuple(sorted(franjas)) for fecha, franjas in por_fecha.items()}),
+        con_plantilla=bool(plantilla),
+    )
+
+
+def obtener_horario(db: Session, profesional_id: int, *, version: int | None = None) -> HorarioProfesional | None:
+    """
+    Horario del profesional desde el cache.
+    - version (agenda_version recién leída, ej: en la validación de una reserva): vale el cache solo si es
+      de esa versión, así un cambio hecho desde otro proceso se respeta en el acto.
+    - sin version: vale mientras no venza el TTL (HORARIOS_CACHE_TTL_SEG). Para vistas de lectura.
+    """
+    ahora = monotonic()
+    with _lock:
+        entrada = _cache.get(profesional_id)
+    if entrada:
+        vence_en, version_cache, horario = entrada
+        if version is None and vence_en > ahora:
+            return horario
+        if version is not None and version_cache == version:
+            return horario
+
+    if version is None:
+        # se lee antes que las filas: si cambian en el medio, la próxima reserva ve otra versión y recarga
+        version = db.scalar(select(Profesional.agenda_version).where(Profesional.id == profesional_id))
+    horario = _cargar_horario(db, profesional_id)
+    with _lock:
+        _cache[profesional_id] = (ahora + HORARIOS_CACHE_TTL_SEG, version, horario)
+    return horario
+
+
+def ventanas_del_horario(horario: HorarioProfesional, desde: datetime, hasta: datetime) -> list[Intervalo]:
+    """
+    Franjas de atención de `horario` dentro de [desde, hasta), ordenadas y recortadas al rango.
+    """
+    ventanas: list[Intervalo] = []
+    dia = desde.date()
+    while dia <= hasta.date():
+        franjas = horario.franjas_del_dia(dia)
+        if franjas is None:
+            inicio_dia = datetime.combine(dia, time.min)
+            intervalos = [(inicio_dia, inicio_dia + timedelta(days=1))]
+        else:
+            intervalos = [(datetime.combine(dia, i), datetime.combine(dia, f)) for i, f in franjas]
+
+        for inicio, fin in intervalos:
+            inicio, fin = max(inicio, desde), min(fin, hasta)
+            if inicio >= fin:
+                continue
+            if ventanas and inicio <= ventanas[-1][1]:
+                # franjas contiguas (ej: dos días completos seguidos) se unen
+                ventanas[-1] = (ventanas[-1][0], max(fin, ventanas[-1][1]))
+            else:
+                ventanas.append((inicio, fin))
+        dia += timedelta(days=1)
+    return ventanas
+
+
+def ventanas_en_rango(db: Session, profesional_id: int, desde: datetime, hasta: datetime) -> list[Intervalo] | None:
+    """
+    Franjas de atención dentro de [desde, hasta), ordenadas y recortadas al rango.
+    None si el profesional no tiene horario cargado (no hay restricción).
+    """
+    horario = obtener_horario(db, profesional_id)
+    if horario is None:
+        return None
+    return ventanas_del_horario(horario, desde, hasta)
+
+
+def horario_cubre(horario: HorarioProfesional | None, inicio: datetime, fin: datetime) -> bool:
+    if horario is None:
+        return True
+    # recortadas a [inicio, fin): el turno entra sii una sola ventana cubre todo el rango
+    return any(v_inicio <= inicio and v_fin >= fin for v_inicio, v_fin in ventanas_del_horario(horario, inicio, fin))
+
+
+def dentro_de_horario(db: Session, profesional_id: int, inicio: datetime, fin: datetime, *, version: int | None = None) -> bool:
+    return horario_cubre(obtener_horario(db, profesional_id, version=version), inicio, fin)
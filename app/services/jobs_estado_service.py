@@ -0,0 +1,114 @@
+# Persistencia de las métricas de los jobs periódicos (tabla jobs_estado).
+# Los contadores se incrementan en la base (col = col + 1), así no se pierden si cambia el líder.
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, text, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.job_estado_model import JobEstado
+
+# un job está atrasado si no terminó bien en este múltiplo de su intervalo
+FACTOR_ATRASO = 3
+
+def _actualizar(db: Session, job_id: str, valores: dict) -> None:
+    actualizar = (
+        update(JobEstado)
+        .where(JobEstado.job_id == job_id)
+        .values(**valores)
+        .execution_options(synchronize_session=False)
+    )
+    # rowcount son las filas encontradas (en MySQL SQLAlchemy pide CLIENT_FOUND_ROWS): 0 es que la fila
+    # no existe, sea la primera corrida del job o porque se borró la tabla con el worker andando
+    if db.execute(actualizar).rowcount == 0:
+        db.add(JobEstado(job_id=job_id, intervalo_seg=valores.get("intervalo_seg"), corridas=0, errores=0, superpuestas=0, perdidas=0))
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()  # la creó otra instancia
+        db.execute(actualizar)
+    db.commit()
+
+
+def registrar_corrida(
+    db: Session,
+    job_id: str,
+    *,
+    instancia: str,
+    intervalo_seg: int,
+    inicio: datetime,
+    duracion_seg: float,
+    filas: int | None,
+    lag_seg: float | None,
+    error: str | None = None,
+) -> None:
+    valores = {
+        "instancia": instancia,
+        "intervalo_seg": intervalo_seg,
+        "corridas": JobEstado.corridas + 1,
+        "ultima_corrida_en": inicio,
+        "ultima_duracion_ms": int(duracion_seg * 1000),
+        "ultimas_filas": filas,
+        "ultimo_lag_ms": int(lag_seg * 1000) if lag_seg is not None else None,
+    }
+    if error is None:
+        valores["ultimo_exito_en"] = inicio + timedelta(seconds=duracion_seg)
+    else:
+        valores["errores"] = JobEstado.errores + 1
+        valores["ultimo_error"] = error[:500]
+        valores["ultimo_error_en"] = inicio + timedelta(seconds=duracion_seg)
+    _actualizar(db, job_id, valores)
+
+
+def registrar_salteada(db: Session, job_id: str, *, superpuesta: bool) -> None:
+    if superpuesta:
+        _actualizar(db, job_id, {"superpuestas": JobEstado.superpuestas + 1})
+    else:
+        _actualizar(db, job_id, {"perdidas": JobEstado.perdidas + 1})
+
+
+def estado_jobs(db: Session, ahora: datetime) -> list[dict]:
+    estados = []
+    for job in db.execute(select(JobEstado).order_by(JobEstado.job_id)).scalars():
+        atrasado = (
+            job.intervalo_seg is not None
+            and (job.ultimo_exito_en is None or ahora - job.ultimo_exito_en > timedelta(seconds=FACTOR_ATRASO * job.intervalo_seg))
+        )
+        estados.append({
+            "job_id": job.job_id,
+            "instancia": job.instancia,
+            "intervalo_seg": job.intervalo_seg,
+            "corridas": job.corridas,
+            "errores": job.errores,
+            "superpuestas": job.superpuestas,
+            "perdidas": job.perdidas,
+            "ultima_corrida_en": job.ultima_corrida_en,
+            "ultima_duracion_ms": job.ultima_duracion_ms,
+            "ultimas_filas": job.ultimas_filas,
+            "ultimo_lag_ms": job.ultimo_lag_ms,
+            "ultimo_exito_en": job.ultimo_exito_en,
+            "ultimo_error": job.ultimo_error,
+            "ultimo_error_en": job.ultimo_error_en,
+            "atrasado": atrasado,
+        })
+    return estados
+
+
+def estado_ready(db: Session, ahora: datetime) -> tuple[int, dict]:
+    """
+    (status HTTP, cuerpo) de GET /ready: 503 si la base no responde o si algún job está atrasado.
+    """
+    try:
+        db.execute(text("SELECT 1"))
+    except Exception as e:
+        return 503, {"status": "error", "detalle": str(e)}
+
+    try:
+        jobs = estado_jobs(db, ahora)
+    except Exception as e:
+        return 503, {"status": "error", "jobs_error": str(e), "jobs": []}
+
+    atrasados = [j["job_id"] for j in jobs if j["atrasado"]]
+    if atrasados:
+        return 503, {"status": "degradado", "jobs_atrasados": atrasados, "jobs": jobs}
+    return 200, {"status": "ok", "jobs_atrasados": [], "jobs": jobs}
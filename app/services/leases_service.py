@@ -0,0 +1,80 @@
+# Leases en la base para elegir una sola instancia líder (ej: la que corre los jobs del scheduler).
+# Tomar o renovar es un UPDATE condicional: gana quien ya es dueño o quien encuentra el lease vencido.
+# Vencimiento y comparación usan el reloj de la base, no el de cada instancia: con relojes corridos entre
+# máquinas, una instancia adelantada vería vencido un lease vigente y habría dos líderes.
+from sqlalchemy import update, or_, literal, DateTime, Integer
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.functions import FunctionElement
+
+from app.models.lease_scheduler_model import LeaseScheduler
+
+
+class ahora_db_mas(FunctionElement):
+    """
+    Hora UTC de la base más `segundos` (UTC_TIMESTAMP() en MySQL, datetime('now') en SQLite).
+    """
+    type = DateTime()
+    name = "ahora_db_mas"
+    inherit_cache = True
+
+    def __init__(self, segundos: int = 0):
+        super().__init__(literal(segundos, Integer))
+
+
+@compiles(ahora_db_mas, "mysql")
+def _ahora_db_mas_mysql(element, compiler, **kw):
+    return f"DATE_ADD(UTC_TIMESTAMP(), INTERVAL {compiler.process(element.clauses, **kw)} SECOND)"
+
+
+@compiles(ahora_db_mas, "sqlite")
+def _ahora_db_mas_sqlite(element, compiler, **kw):
+    # mismo formato de texto que guarda SQLAlchemy ("YYYY-MM-DD HH:MM:SS.ffffff"), así compara bien con vence_en
+    return f"strftime('%Y-%m-%d %H:%M:%f000', 'now', ({compiler.process(element.clauses, **kw)}) || ' seconds')"
+
+
+def adquirir_lease(db: Session, nombre: str, duenio: str, duracion_seg: int) -> bool:
+    """
+    Toma o renueva el lease `nombre` por `duracion_seg`. Devuelve True si `duenio` quedó como dueño.
+    """
+    resultado = db.execute(
+        update(LeaseScheduler)
+        .where(
+            LeaseScheduler.nombre == nombre,
+            or_(
+                LeaseScheduler.duenio == duenio,
+                LeaseScheduler.vence_en == None,
+                LeaseScheduler.vence_en < ahora_db_mas(0),
+            ),
+        )
+        .values(duenio=duenio, vence_en=ahora_db_mas(duracion_seg))
+        .execution_options(synchronize_session=False)
+    )
+    if resultado.rowcount == 1:
+        db.commit()
+        return True
+
+    if db.get(LeaseScheduler, nombre) is not None:
+        db.rollback()  # lo tiene otra instancia y no venció
+        return False
+
+    # primera vez que se usa este lease: creamos la fila (si otra instancia la crea antes, pierde el INSERT)
+    db.add(LeaseScheduler(nombre=nombre, duenio=duenio, vence_en=ahora_db_mas(duracion_seg)))
+    try:
+        db.commit()
+        return True
+    except IntegrityError:
+        db.rollback()
+        return False
+
+
+def liberar_lease(db: Session, nombre: str, duenio: str) -> None:
+    # al apagar: otra instancia puede tomarlo enseguida en vez de esperar a que venza
+    db.execute(
+        update(LeaseScheduler)
+        .where(LeaseScheduler.nombre == nombre, LeaseScheduler.duenio == duenio)
+        .values(duenio=None, vence_en=None)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
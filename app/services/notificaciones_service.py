@@ -1,14 +1,23 @@
+import os
+import random
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import select, update, insert, delete, literal, or_, bindparam, func
 from fastapi import HTTPException
 
 from app.models.notificacion_model import Notificacion
+from app.models.notificacion_archivada_model import NotificacionArchivada
 from app.models.turno_model import Turno
 from app.models.paciente_model import Paciente
 from app.models.profesional_model import Profesional
 
-MAX_INTENTOS = 3
+MAX_INTENTOS = int(os.getenv("NOTIF_MAX_INTENTOS", "3"))
+BACKOFF_BASE_SEG = int(os.getenv("NOTIF_BACKOFF_BASE_SEG", "60"))  # espera antes del 2do intento, después se duplica
+BACKOFF_MAX_SEG = int(os.getenv("NOTIF_BACKOFF_MAX_SEG", "3600"))
+RETENCION_NOTIF_DIAS = int(os.getenv("NOTIF_RETENCION_DIAS", "90"))  # ENVIADA/CANCELADA más viejas pasan al archivo
+# tiempo mínimo que una instancia tiene reservada una notificación para enviarla; el despachador lo
+# estira si el lote de un canal puede tardar más (ver notificaciones_scheduler.lease_para)
+LEASE_ENVIO_SEG = int(os.getenv("NOTIF_LEASE_SEG", "120"))
 
 def _now_utc() -> datetime:
     return datetime.utcnow()
@@ -77,11 +86,92 @@ def cancelar_notificaciones_pendientes_de_turno(db: Session, turno_id: int):
         db.add(n)
 
 
-def programar_notifs_creacion_turno(db: Session, turno: Turno):
-    paciente = db.get(Paciente, turno.paciente_id)
-    profesional = db.get(Profesional, turno.profesional_id)
+def cancelar_notificaciones_pendientes_de_turnos(db: Session, turno_ids: list[int]) -> int:
+    """
+    Versión set-based de cancelar_notificaciones_pendientes_de_turno: un solo UPDATE para todo el lote.
+    """
+    if not turno_ids:
+        return 0
+    res = db.execute(
+        update(Notificacion)
+        .where(
+            Notificacion.turno_id.in_(turno_ids),
+            Notificacion.estado == "PENDIENTE",
+        )
+        .values(estado="CANCELADA", cancelada_en=_now_utc())
+        .execution_options(synchronize_session=False)
+    )
+    return res.rowcount
+
+
+def programar_notifs_cancelacion_lote(db: Session, turno_ids: list[int]) -> int:
+    """
+    Encola la notificación de CANCELACION para un lote de turnos con un INSERT multi-fila.
+    Lee turnos + paciente + profesional en una consulta y saltea las que ya existen (dedupe_key).
+    """
+    if not turno_ids:
+        return 0
+
+    filas = db.execute(
+        select(Turno.id, Turno.fecha_hora_inicio, Paciente, Profesional)
+        .join(Paciente, Paciente.id == Turno.paciente_id)
+        .join(Profesional, Profesional.id == Turno.profesional_id)
+        .where(Turno.id.in_(turno_ids))
+    ).all()
+
+    claves = {fila.id: f"turno:{fila.id}:CANCELACION" for fila in filas}
+    existentes = set(
+        db.execute(
+            select(Notificacion.dedupe_key).where(Notificacion.dedupe_key.in_(list(claves.values())))
+        ).scalars().all()
+    )
+
+    ahora = _now_utc()
+    nuevas = [
+        {
+            "turno_id": fila.id,
+            "paciente_id": fila.Paciente.id,
+            "canal": fila.Paciente.canal_contacto,
+            "tipo": "CANCELACION",
+            # la fila tiene fecha_hora_inicio, que es lo único del turno que usa el mensaje
+            "mensaje": _mensaje_cancelacion(fila, fila.Paciente, fila.Profesional),
+            "programada_para": ahora,
+            "estado": "PENDIENTE",
+            "intentos": 0,
+            "creado_en": ahora,
+            "dedupe_key": claves[fila.id],
+        }
+        for fila in filas
+        if claves[fila.id] not in existentes
+    ]
+    if nuevas:
+        db.execute(insert(Notificacion), nuevas)
+    return len(nuevas)
+
+
+def _datos_para_notificar(
+    db: Session,
+    turno: Turno,
+    paciente: Paciente | None = None,
+    profesional: Profesional | None = None,
+) -> tuple[Paciente, Profesional]:
+    # Si el llamador ya tiene cargados paciente/profesional los reusamos y no volvemos a la base
+    if paciente is None:
+        paciente = db.get(Paciente, turno.paciente_id)
+    if profesional is None:
+        profesional = db.get(Profesional, turno.profesional_id)
     if not paciente or not profesional:
         raise HTTPException(status_code=500, detail="Faltan datos para notificar (paciente/profesional).")
+    return paciente, profesional
+
+
+def programar_notifs_creacion_turno(
+    db: Session,
+    turno: Turno,
+    paciente: Paciente | None = None,
+    profesional: Profesional | None = None,
+):
+    paciente, profesional = _datos_para_notificar(db, turno, paciente, profesional)
 
     canal = paciente.canal_contacto  # whatsapp/telegram/sms
 
@@ -96,11 +186,46 @@ def programar_notifs_creacion_turno(db: Session, turno: Turno):
         dedupe_key=f"turno:{turno.id}:SOLICITUD_CONFIRMACION",
     )
 
-def programar_notifs_confirmacion(db: Session, turno: Turno):
-    paciente = db.get(Paciente, turno.paciente_id)
-    profesional = db.get(Profesional, turno.profesional_id)
-    if not paciente or not profesional:
-        raise HTTPException(status_code=500, detail="Faltan datos para notificar (paciente/profesional).")
+def programar_notifs_creacion_turnos_lote(
+    db: Session,
+    turnos: list[Turno],
+    paciente: Paciente,
+    profesional: Profesional,
+) -> int:
+    """
+    SOLICITUD_CONFIRMACION para varios turnos del mismo paciente/profesional con un INSERT multi-fila.
+    Los turnos tienen que tener id (flush previo).
+    """
+    if not turnos:
+        return 0
+    ahora = _now_utc()
+    db.execute(
+        insert(Notificacion),
+        [
+            {
+                "turno_id": turno.id,
+                "paciente_id": paciente.id,
+                "canal": paciente.canal_contacto,
+                "tipo": "SOLICITUD_CONFIRMACION",
+                "mensaje": _mensaje_solicitud_confirmacion(turno, paciente, profesional),
+                "programada_para": ahora,
+                "estado": "PENDIENTE",
+                "intentos": 0,
+                "creado_en": ahora,
+                "dedupe_key": f"turno:{turno.id}:SOLICITUD_CONFIRMACION",
+            }
+            for turno in turnos
+        ],
+    )
+    return len(turnos)
+
+def programar_notifs_confirmacion(
+    db: Session,
+    turno: Turno,
+    paciente: Paciente | None = None,
+    profesional: Profesional | None = None,
+):
+    paciente, profesional = _datos_para_notificar(db, turno, paciente, profesional)
 
     canal = paciente.canal_contacto
 
@@ -143,11 +268,13 @@ def programar_notifs_confirmacion(db: Session, turno: Turno):
             dedupe_key=f"turno:{turno.id}:RECORDATORIO_2H",
         )
 
-def programar_notifs_cancelacion(db: Session, turno: Turno):
-    paciente = db.get(Paciente, turno.paciente_id)
-    profesional = db.get(Profesional, turno.profesional_id)
-    if not paciente or not profesional:
-        raise HTTPException(status_code=500, detail="Faltan datos para notificar (paciente/profesional).")
+def programar_notifs_cancelacion(
+    db: Session,
+    turno: Turno,
+    paciente: Paciente | None = None,
+    profesional: Profesional | None = None,
+):
+    paciente, profesional = _datos_para_notificar(db, turno, paciente, profesional)
 
     canal = paciente.canal_contacto
 
@@ -162,11 +289,248 @@ def programar_notifs_cancelacion(db: Session, turno: Turno):
         dedupe_key=f"turno:{turno.id}:CANCELACION",
     )
 
+def _filtro_pendientes(ahora: datetime):
+    return (
+        Notificacion.estado == "PENDIENTE",
+        Notificacion.programada_para <= ahora,
+        Notificacion.intentos < MAX_INTENTOS,
+        or_(Notificacion.reclamada_hasta == None, Notificacion.reclamada_hasta < ahora),
+    )
+
 def obtener_notificaciones_pendientes(db: Session, ahora: datetime, limit: int = 50):
     return db.execute(
         select(Notificacion).where(
-            Notificacion.estado == "PENDIENTE",
-            Notificacion.programada_para <= ahora,
-            Notificacion.intentos < MAX_INTENTOS,
+            *_filtro_pendientes(ahora)
         ).order_by(Notificacion.programada_para.asc()).limit(limit)
     ).scalars().all()
+
+def reclamar_notificaciones(
+    db: Session,
+    ahora: datetime,
+    *,
+    worker_id: str,
+    limit: int = 50,
+    lease_seg: int = LEASE_ENVIO_SEG,
+    canal: str | None = None,
+):
+    """
+    Toma un lote de pendientes para `worker_id` (solo de `canal`, si viene) y lo commitea enseguida
+    (la transacción dura lo que el UPDATE).
+    SKIP LOCKED hace que dos instancias reclamando a la vez se repartan filas distintas, y el lease
+    (reclamada_hasta) las saca de la cola hasta que se registre el resultado o venza.
+    Devuelve filas (id, canal, mensaje, destino) listas para enviar.
+    """
+    filtros = list(_filtro_pendientes(ahora))
+    if canal is not None:
+        filtros.append(Notificacion.canal == canal)
+
+    # intentos se incrementa al reclamar: si el worker se cayó después de reclamar el último intento,
+    # la fila queda PENDIENTE sin que nadie registre el resultado. Vencido su lease, pasa a FALLIDA.
+    agotadas = [
+        Notificacion.estado == "PENDIENTE",
+        Notificacion.programada_para <= ahora,
+        Notificacion.intentos >= MAX_INTENTOS,
+        or_(Notificacion.reclamada_hasta == None, Notificacion.reclamada_hasta < ahora),
+    ]
+    if canal is not None:
+        agotadas.append(Notificacion.canal == canal)
+    db.execute(
+        update(Notificacion)
+        .where(*agotadas)
+        .values(
+            estado="FALLIDA",
+            ultimo_error=func.coalesce(Notificacion.ultimo_error, "Sin resultado de envío: se agotaron los intentos."),
+            reclamada_por=None,
+            reclamada_hasta=None,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+    ids = db.execute(
+        select(Notificacion.id).where(
+            *filtros
+        ).order_by(Notificacion.programada_para.asc()).limit(limit).with_for_update(skip_locked=True)
+    ).scalars().all()
+
+    if not ids:
+        db.commit()
+        return []
+
+    db.execute(
+        update(Notificacion)
+        .where(Notificacion.id.in_(ids))
+        .values(
+            reclamada_por=worker_id,
+            reclamada_hasta=ahora + timedelta(seconds=lease_seg),
+            intentos=Notificacion.intentos + 1,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+    filas = db.execute(
+        select(Notificacion.id, Notificacion.canal, Notificacion.mensaje, Paciente.telefono.label("destino"))
+        .join(Paciente, Paciente.id == Notificacion.paciente_id)
+        .where(Notificacion.id.in_(ids))
+        .order_by(Notificacion.programada_para.asc())
+    ).all()
+
+    db.commit()
+    return filas
+
+def _backoff_seg(intentos: int) -> float:
+    # exponencial con jitter: base * 2^(intentos-1), tope BACKOFF_MAX_SEG, y un azar entre 50% y 100%
+    # para que las que fallaron juntas no vuelvan todas en el mismo segundo
+    espera = min(BACKOFF_MAX_SEG, BACKOFF_BASE_SEG * 2 ** (intentos - 1))
+    return espera * random.uniform(0.5, 1.0)
+
+def registrar_resultados_envio(db: Session, resultados: list[dict], worker_id: str):
+    """
+    Escribe en bloque el resultado de un lote enviado (executemany, un commit).
+    Cada resultado: {"id", "ok", "proveedor_msg_id", "error"}.
+    Las fallidas se reprograman con backoff exponencial o pasan a FALLIDA al llegar a MAX_INTENTOS.
+    Solo se actualizan filas cuyo lease sigue siendo de `worker_id`.
+    """
+    tabla = Notificacion.__table__
+    ahora = _now_utc()
+
+    enviadas = [
+        {"b_id": r["id"], "b_worker": worker_id, "b_proveedor_msg_id": r.get("proveedor_msg_id")}
+        for r in resultados if r["ok"]
+    ]
+    fallidas = [
+        {"b_id": r["id"], "b_worker": worker_id, "b_error": r.get("error")}
+        for r in resultados if not r["ok"]
+    ]
+
+    if enviadas:
+        db.execute(
+            update(tabla)
+            .where(tabla.c.id == bindparam("b_id"), tabla.c.reclamada_por == bindparam("b_worker"))
+            .values(
+                estado="ENVIADA",
+                proveedor_msg_id=bindparam("b_proveedor_msg_id"),
+                enviada_en=ahora,
+                ultimo_error=None,
+                reclamada_por=None,
+                reclamada_hasta=None,
+            ),
+            enviadas,
+        )
+
+    if fallidas:
+        # intentos ya se incrementó al reclamar: con eso se decide si se reintenta (con backoff) o pasa a FALLIDA
+        intentos = dict(
+            db.execute(
+                select(Notificacion.id, Notificacion.intentos).where(Notificacion.id.in_([f["b_id"] for f in fallidas]))
+            ).all()
+        )
+        reprogramadas = [f for f in fallidas if intentos.get(f["b_id"], MAX_INTENTOS) < MAX_INTENTOS]
+        agotadas = [f for f in fallidas if intentos.get(f["b_id"], MAX_INTENTOS) >= MAX_INTENTOS]
+
+        for f in reprogramadas:
+            f["b_programada_para"] = ahora + timedelta(seconds=_backoff_seg(intentos[f["b_id"]]))
+
+        if reprogramadas:
+            # sigue PENDIENTE pero corrida hacia adelante: deja de ocupar la cabeza de la cola
+            db.execute(
+                update(tabla)
+                .where(tabla.c.id == bindparam("b_id"), tabla.c.reclamada_por == bindparam("b_worker"))
+                .values(
+                    programada_para=bindparam("b_programada_para"),
+                    ultimo_error=bindparam("b_error"),
+                    reclamada_por=None,
+                    reclamada_hasta=None,
+                ),
+                reprogramadas,
+            )
+
+        if agotadas:
+            # dead letter: no se vuelve a reclamar salvo que se reencole por API
+            db.execute(
+                update(tabla)
+                .where(tabla.c.id == bindparam("b_id"), tabla.c.reclamada_por == bindparam("b_worker"))
+                .values(
+                    estado="FALLIDA",
+                    ultimo_error=bindparam("b_error"),
+                    reclamada_por=None,
+                    reclamada_hasta=None,
+                ),
+                agotadas,
+            )
+
+    db.commit()
+
+
+def reencolar_notificaciones(db: Session, notificacion_ids: list[int]) -> int:
+    """
+    Vuelve a PENDIENTE notificaciones FALLIDA (o pendientes que ya agotaron los intentos),
+    con el contador en cero y programadas para ahora. Devuelve cuántas se reencolaron.
+    """
+    res = db.execute(
+        update(Notificacion)
+        .where(
+            Notificacion.id.in_(notificacion_ids),
+            or_(
+                Notificacion.estado == "FALLIDA",
+                (Notificacion.estado == "PENDIENTE") & (Notificacion.intentos >= MAX_INTENTOS),
+            ),
+        )
+        .values(
+            estado="PENDIENTE",
+            intentos=0,
+            programada_para=_now_utc(),
+            reclamada_por=None,
+            reclamada_hasta=None,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return res.rowcount
+
+
+def archivar_notificaciones(
+    db: Session,
+    ahora: datetime,
+    *,
+    dias: int = RETENCION_NOTIF_DIAS,
+    lote: int = 5000,
+) -> int:
+    """
+    Mueve a notificaciones_archivo las ENVIADA/CANCELADA creadas hace más de `dias` días,
+    en lotes (INSERT ... SELECT + DELETE, un commit por lote) para no tener locks largos.
+    Así la tabla de cola queda del tamaño del trabajo vivo. Devuelve cuántas se archivaron.
+    """
+    limite = ahora - timedelta(days=dias)
+    columnas = [c.name for c in Notificacion.__table__.columns]
+    total = 0
+
+    while True:
+        ids = db.execute(
+            select(Notificacion.id).where(
+                Notificacion.estado.in_(["ENVIADA", "CANCELADA"]),
+                Notificacion.creado_en < limite,
+            ).order_by(Notificacion.id).limit(lote).with_for_update(skip_locked=True)
+        ).scalars().all()
+
+        if not ids:
+            db.commit()
+            break
+
+        db.execute(
+            insert(NotificacionArchivada).from_select(
+                columnas + ["archivada_en"],
+                select(*Notificacion.__table__.columns, literal(ahora)).where(Notificacion.id.in_(ids)),
+            )
+        )
+        db.execute(
+            delete(Notificacion)
+            .where(Notificacion.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+        total += len(ids)
+        if len(ids) < lote:
+            break
+
+    return total
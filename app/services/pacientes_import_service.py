@@ -0,0 +1,184 @@
+# Importación masiva de pacientes desde CSV o NDJSON (alta de una clínica nueva).
+# El archivo se lee en streaming y se procesa por chunks: la memoria depende del tamaño del chunk, no del archivo.
+import csv
+import json
+from typing import Iterator, TextIO
+
+from pydantic import ValidationError
+from sqlalchemy import select, insert, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.paciente_model import Paciente
+from app.schemas.paciente_schema import PacienteCreate
+from app.services.pacientes_service import normalizar_nombre
+
+TAMANIO_CHUNK = 1000
+MAX_RECHAZOS_DETALLE = 1000  # se cuentan todos, pero solo se devuelve el detalle de los primeros
+
+CAMPOS = ("nombre", "dni", "cuil", "telefono", "canal_contacto")
+
+
+def _leer_filas(archivo: TextIO, formato: str) -> Iterator[tuple[int, dict | None, str | None]]:
+    """
+    Devuelve (nro_de_linea, fila, error). Las líneas que no se pueden parsear vienen con fila None.
+    """
+    if formato == "csv":
+        lector = csv.DictReader(archivo)
+        for fila in lector:
+            yield lector.line_num, fila, None
+    elif formato == "ndjson":
+        for nro, linea in enumerate(archivo, start=1):
+            if not linea.strip():
+                continue
+            try:
+                fila = json.loads(linea)
+            except json.JSONDecodeError as e:
+                yield nro, None, f"JSON inválido: {e.msg}"
+                continue
+            if not isinstance(fila, dict):
+                yield nro, None, "Se esperaba un objeto JSON por línea."
+                continue
+            yield nro, fila, None
+    else:
+        raise ValueError(f"Formato no soportado: {formato}")
+
+
+def _limpiar(fila: dict) -> dict:
+    # celdas vacías del CSV -> None (dni/cuil son opcionales y UNIQUE: "" chocaría entre pacientes)
+    datos = {}
+    for campo in CAMPOS:
+        valor = fila.get(campo)
+        if isinstance(valor, str):
+            valor = valor.strip() or None
+        datos[campo] = valor
+    return datos
+
+
+class _Resultado:
+    def __init__(self):
+        self.procesadas = 0
+        self.insertadas = 0
+        self.rechazadas = 0
+        self.rechazos: list[dict] = []
+        self.error: str | None = None  # si la lectura se cortó antes del final del archivo
+
+    def rechazar(self, linea: int, motivo: str):
+        self.rechazadas += 1
+        if len(self.rechazos) < MAX_RECHAZOS_DETALLE:
+            self.rechazos.append({"linea": linea, "motivo": motivo})
+
+    def como_dict(self) -> dict:
+        return {
+            "procesadas": self.procesadas,
+            "insertadas": self.insertadas,
+            "rechazadas": self.rechazadas,
+            "rechazos": self.rechazos,
+            "error": self.error,
+        }
+
+
+def _insertar_chunk(db: Session, chunk: list[tuple[int, PacienteCreate]], resultado: _Resultado):
+    # 1) duplicados dentro del chunk (los chunks anteriores ya están commiteados, los ve la consulta del paso 2)
+    dnis_chunk: set[str] = set()
+    cuils_chunk: set[str] = set()
+    candidatos: list[tuple[int, PacienteCreate]] = []
+    for linea, p in chunk:
+        if p.dni and p.dni in dnis_chunk:
+            resultado.rechazar(linea, f"dni {p.dni} repetido en el archivo")
+            continue
+        if p.cuil and p.cuil in cuils_chunk:
+            resultado.rechazar(linea, f"cuil {p.cuil} repetido en el archivo")
+            continue
+        if p.dni:
+            dnis_chunk.add(p.dni)
+        if p.cuil:
+            cuils_chunk.add(p.cuil)
+        candidatos.append((linea, p))
+
+    # 2) contra la base: una sola consulta IN por chunk
+    dnis_existentes: set[str] = set()
+    cuils_existentes: set[str] = set()
+    if dnis_chunk or cuils_chunk:
+        for dni, cuil in db.execute(
+            select(Paciente.dni, Paciente.cuil).where(
+                or_(Paciente.dni.in_(dnis_chunk), Paciente.cuil.in_(cuils_chunk))
+            )
+        ).all():
+            if dni:
+                dnis_existentes.add(dni)
+            if cuil:
+                cuils_existentes.add(cuil)
+
+    nuevos: list[tuple[int, dict]] = []
+    for linea, p in candidatos:
+        if p.dni and p.dni in dnis_existentes:
+            resultado.rechazar(linea, f"Ya existe un paciente con dni {p.dni}")
+        elif p.cuil and p.cuil in cuils_existentes:
+            resultado.rechazar(linea, f"Ya existe un paciente con cuil {p.cuil}")
+        else:
+            nuevos.append((linea, {**p.model_dump(), "nombre_normalizado": normalizar_nombre(p.nombre)}))
+
+    if not nuevos:
+        return
+
+    # 3) INSERT en bloque (executemany) y commit por chunk
+    try:
+        db.execute(insert(Paciente), [datos for _, datos in nuevos])
+        db.commit()
+        resultado.insertadas += len(nuevos)
+        return
+    except IntegrityError:
+        # alguien cargó el mismo dni/cuil mientras importábamos: reintentamos fila por fila para aislar las que chocan
+        db.rollback()
+
+    for linea, datos in nuevos:
+        try:
+            db.execute(insert(Paciente), [datos])
+            db.commit()
+            resultado.insertadas += 1
+        except IntegrityError as e:
+            db.rollback()
+            resultado.rechazar(linea, "Conflicto de integridad: " + str(e.orig))
+
+
+def importar_pacientes(db: Session, archivo: TextIO, formato: str = "csv", tamanio_chunk: int = TAMANIO_CHUNK) -> dict:
+    """
+    Importa pacientes fila por fila del archivo. Las filas inválidas o duplicadas (en el archivo o
+    contra la base) se rechazan y se informan sin cortar la importación.
+    Si el archivo deja de ser UTF-8 válido a mitad de camino, se guarda lo leído hasta ahí y se corta:
+    los chunks anteriores ya están commiteados, así que el reporte parcial va con "error".
+    Devuelve {"procesadas", "insertadas", "rechazadas", "rechazos": [{"linea", "motivo"}, ...], "error"}.
+    """
+    resultado = _Resultado()
+    chunk: list[tuple[int, PacienteCreate]] = []
+    ultima_linea = 0
+
+    try:
+        for linea, fila, error in _leer_filas(archivo, formato):
+            ultima_linea = linea
+            resultado.procesadas += 1
+            if error:
+                resultado.rechazar(linea, error)
+                continue
+            try:
+                chunk.append((linea, PacienteCreate.model_validate(_limpiar(fila))))
+            except ValidationError as e:
+                motivo = "; ".join(f"{'.'.join(str(x) for x in err['loc'])}: {err['msg']}" for err in e.errors())
+                resultado.rechazar(linea, motivo)
+                continue
+
+            if len(chunk) >= tamanio_chunk:
+                _insertar_chunk(db, chunk, resultado)
+                chunk = []
+    except UnicodeDecodeError:
+        # el decoder trabaja por bloques: no se sabe la línea exacta, solo que las anteriores se leyeron bien
+        resultado.error = (
+            f"El archivo no es UTF-8 válido después de la línea {ultima_linea}: "
+            "se importaron las filas anteriores y el resto no se procesó."
+        )
+
+    if chunk:
+        _insertar_chunk(db, chunk, resultado)
+
+    return resultado.como_dict()
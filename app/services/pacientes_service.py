@@ -0,0 +1,152 @@
+# Alta, edición y búsqueda del padrón de pacientes (el buscador de recepción lo usa en cada tecla).
+# Los routers sync y async llaman a las mismas funciones: las variantes async corren la lógica sync con
+# AsyncSession.run_sync (como turnos_async_service), así validaciones y mapeo de campos no se separan.
+import re
+import unicodedata
+
+from fastapi import HTTPException
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.paciente_model import Paciente
+from app.schemas.paciente_schema import PacienteCreate, PacienteOut, PacienteUpdate
+
+MIN_LARGO_FULLTEXT = 3  # innodb_ft_min_token_size por defecto: palabras más cortas no están en el índice
+
+
+def normalizar_nombre(nombre: str | None) -> str | None:
+    """
+    "  José  María Pérez-Gómez " -> "jose maria perez gomez"
+    """
+    if nombre is None:
+        return None
+    sin_tildes = unicodedata.normalize("NFKD", nombre).encode("ascii", "ignore").decode()
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", sin_tildes.lower()).split())
+
+
+def _escapar_like(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def stmt_buscar_pacientes(
+    dialecto: str,
+    *,
+    q: str | None = None,
+    dni: str | None = None,
+    cuil: str | None = None,
+    telefono: str | None = None,
+    solo_activos: bool = False,
+    limit: int = 50,
+    offset: int = 0,
+):
+    """
+    - q: nombre. En MySQL busca por prefijo de cada palabra con el índice FULLTEXT ("per jua" encuentra
+      a "Juan Pérez"); en otros motores, o con palabras de menos de 3 letras, por prefijo del nombre completo.
+    - dni / cuil: exactos (índices UNIQUE).
+    - telefono: prefijo.
+    """
+    stmt = select(Paciente)
+
+    if dni:
+        stmt = stmt.where(Paciente.dni == dni)
+    if cuil:
+        stmt = stmt.where(Paciente.cuil == cuil)
+    if telefono:
+        stmt = stmt.where(Paciente.telefono.like(_escapar_like(telefono.strip()) + "%", escape="\\"))
+    if solo_activos:
+        stmt = stmt.where(Paciente.activo == True)
+
+    if q:
+        normal = normalizar_nombre(q)
+        palabras = normal.split()
+        if dialecto == "mysql" and palabras and all(len(p) >= MIN_LARGO_FULLTEXT for p in palabras):
+            stmt = stmt.where(
+                text("MATCH (pacientes.nombre_normalizado) AGAINST (:q_fulltext IN BOOLEAN MODE)")
+                .bindparams(q_fulltext=" ".join(f"+{p}*" for p in palabras))
+            )
+        elif normal:
+            stmt = stmt.where(Paciente.nombre_normalizado.like(_escapar_like(normal) + "%", escape="\\"))
+
+    return stmt.order_by(Paciente.nombre_normalizado, Paciente.id).limit(limit).offset(offset)
+
+
+def buscar_pacientes(db: Session, **filtros):
+    return db.execute(stmt_buscar_pacientes(db.get_bind().dialect.name, **filtros)).scalars().all()
+
+
+async def buscar_pacientes_async(db: AsyncSession, **filtros):
+    resultado = await db.execute(stmt_buscar_pacientes(db.bind.dialect.name, **filtros))
+    return resultado.scalars().all()
+
+
+CANALES_CONTACTO = ("whatsapp", "telegram", "sms")
+
+
+def crear_paciente(db: Session, payload: PacienteCreate) -> Paciente:
+    if payload.canal_contacto not in CANALES_CONTACTO:
+        raise HTTPException(
+            status_code=400,
+            detail="Canal de contacto inválido. Debe ser 'whatsapp', 'telegram' o 'sms'."
+        )
+
+    paciente = Paciente(
+        nombre = payload.nombre,
+        nombre_normalizado = normalizar_nombre(payload.nombre),
+        dni = payload.dni,
+        cuil = payload.cuil,
+        telefono = payload.telefono,
+        canal_contacto = payload.canal_contacto,
+    )
+    db.add(paciente)
+    try:
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail= "Error al crear paciente\n" + str(e))
+    db.refresh(paciente)
+    return paciente
+
+
+def obtener_paciente(db: Session, paciente_id: int) -> Paciente:
+    paciente = db.get(Paciente, paciente_id)
+    if not paciente:
+        raise HTTPException(status_code=404, detail="Paciente no encontrado.")
+    return paciente
+
+
+def editar_paciente(db: Session, paciente_id: int, payload: PacienteUpdate) -> Paciente:
+    paciente = obtener_paciente(db, paciente_id)
+
+    # PATCH parcial: solo se actualiza lo que vino
+    data = payload.model_dump(exclude_unset=True)
+
+    # Si no mandaron nada, evitamos un "update vacío"
+    if not data:
+        raise HTTPException(status_code=400, detail="No se enviaron campos para actualizar.")
+
+    for field, value in data.items():
+        setattr(paciente, field, value)
+    if "nombre" in data:
+        paciente.nombre_normalizado = normalizar_nombre(paciente.nombre)
+
+    try:
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Error al editar paciente\n" + str(e))
+
+    db.refresh(paciente)
+    return paciente
+
+
+async def crear_paciente_async(db: AsyncSession, payload: PacienteCreate) -> PacienteOut:
+    return await db.run_sync(lambda s: PacienteOut.model_validate(crear_paciente(s, payload)))
+
+
+async def obtener_paciente_async(db: AsyncSession, paciente_id: int) -> PacienteOut:
+    return await db.run_sync(lambda s: PacienteOut.model_validate(obtener_paciente(s, paciente_id)))
+
+
+async def editar_paciente_async(db: AsyncSession, paciente_id: int, payload: PacienteUpdate) -> PacienteOut:
+    return await db.run_sync(lambda s: PacienteOut.model_validate(editar_paciente(s, paciente_id, payload)))
@@ -0,0 +1,27 @@
+# Perfiles de carga de relaciones para Turno y BloqueoAgenda.
+# Los modelos ya no hacen JOIN por defecto (lazy="select"): cada consulta elige el perfil según lo que va a serializar.
+#   - minimo:  solo columnas. Para SELECT ... FOR UPDATE, chequeos de ownership y búsquedas por id.
+#   - lista:   + estado (lo único relacionado que devuelve TurnoOut).
+# Los endpoints de detalle devuelven el mismo TurnoOut/BloqueoAgendaOut que los listados, así que usan "lista".
+# Si algún día se serializan paciente/profesional/usuarios, se agrega un perfil para eso acá.
+from sqlalchemy.orm import joinedload
+
+from app.models.turno_model import Turno
+
+PERFIL_MINIMO = "minimo"
+PERFIL_LISTA = "lista"
+
+
+def opciones_turno(perfil: str) -> list:
+    if perfil == PERFIL_MINIMO:
+        return []
+    if perfil == PERFIL_LISTA:
+        return [joinedload(Turno.estado)]
+    raise ValueError(f"Perfil de carga desconocido: {perfil}")
+
+
+def opciones_bloqueo(perfil: str) -> list:
+    # BloqueoAgendaOut no serializa relaciones: lista y minimo son lo mismo
+    if perfil in (PERFIL_MINIMO, PERFIL_LISTA):
+        return []
+    raise ValueError(f"Perfil de carga desconocido: {perfil}")
@@ -0,0 +1,184 @@
+# Proveedores de envío por canal (whatsapp / telegram / sms).
+# Cada canal tiene su propio pool de conexiones, límite de concurrencia y limitador de tasa,
+# así un gateway lento no le saca capacidad a los demás canales.
+import asyncio
+import math
+import os
+import random
+import time
+import uuid
+from abc import ABC, abstractmethod
+
+CANALES = ("whatsapp", "telegram", "sms")
+
+
+class ErrorEnvio(Exception):
+    pass
+
+
+class LimitadorTasa:
+    """
+    Token bucket: deja pasar `por_segundo` envíos por segundo con ráfagas de hasta `rafaga`.
+    Con por_segundo <= 0 no limita.
+    """
+    def __init__(self, por_segundo: float, rafaga: int | None = None):
+        self._tasa = por_segundo
+        self._capacidad = rafaga or max(1, int(por_segundo))
+        self._tokens = float(self._capacidad)
+        self._ultimo = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def esperar(self):
+        if self._tasa <= 0:
+            return
+        async with self._lock:
+            while True:
+                ahora = time.monotonic()
+                self._tokens = min(self._capacidad, self._tokens + (ahora - self._ultimo) * self._tasa)
+                self._ultimo = ahora
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._tasa)
+
+
+class ProveedorCanal(ABC):
+    """
+    Interfaz de un proveedor de mensajería. Las subclases implementan _enviar (y opcionalmente
+    _abrir_conexion/_cerrar_conexion); la base se encarga del pool, la concurrencia y la tasa.
+    """
+    def __init__(
+        self,
+        canal: str,
+        *,
+        max_conexiones: int = 4,
+        max_concurrencia: int = 4,
+        tasa_por_segundo: float = 0,
+        timeout_seg: float = 30,
+    ):
+        self.canal = canal
+        self._max_concurrencia = max_concurrencia
+        self._tasa_por_segundo = tasa_por_segundo
+        self._timeout_seg = timeout_seg
+        self._semaforo = asyncio.Semaphore(max_concurrencia)
+        self._limitador = LimitadorTasa(tasa_por_segundo)
+        self._libres: asyncio.Queue = asyncio.Queue()
+        # un cupo por conexión en uso: así nunca hay más de max_conexiones abiertas
+        self._cupos = asyncio.Semaphore(max_conexiones)
+
+    async def _abrir_conexion(self):
+        return None
+
+    async def _cerrar_conexion(self, conexion):
+        pass
+
+    @abstractmethod
+    async def _enviar(self, conexion, destino: str, mensaje: str) -> str:
+        """Envía el mensaje y devuelve el id que asigna el proveedor. Si falla levanta una excepción."""
+
+    async def _tomar_conexion(self):
+        await self._cupos.acquire()
+        if not self._libres.empty():
+            return self._libres.get_nowait()
+        try:
+            return await self._abrir_conexion()
+        except BaseException:
+            # también CancelledError (cancelación mientras conecta): si no, el cupo queda tomado para siempre
+            self._cupos.release()
+            raise
+
+    def _devolver_conexion(self, conexion):
+        self._libres.put_nowait(conexion)
+        self._cupos.release()
+
+    async def _descartar_conexion(self, conexion):
+        try:
+            await self._cerrar_conexion(conexion)
+        except Exception:
+            pass
+        finally:
+            self._cupos.release()
+
+    async def enviar(self, destino: str, mensaje: str) -> str:
+        async with self._semaforo:
+            await self._limitador.esperar()
+            conexion = await self._tomar_conexion()
+            try:
+                # el timeout es solo del envío: la espera por concurrencia o por tasa no cuenta como fallo
+                proveedor_id = await asyncio.wait_for(self._enviar(conexion, destino, mensaje), self._timeout_seg)
+            except BaseException:
+                # una conexión que falló o quedó a medio enviar no vuelve al pool
+                await self._descartar_conexion(conexion)
+                raise
+            self._devolver_conexion(conexion)
+            return proveedor_id
+
+    def duracion_maxima_lote(self, cantidad: int) -> float:
+        """
+        Cota de lo que puede tardar enviar `cantidad` mensajes en el peor caso: tandas de
+        max_concurrencia envíos que agotan el timeout, más la espera del limitador de tasa.
+        """
+        tandas = math.ceil(cantidad / self._max_concurrencia)
+        espera_tasa = cantidad / self._tasa_por_segundo if self._tasa_por_segundo > 0 else 0
+        return tandas * self._timeout_seg + espera_tasa
+
+    async def cerrar(self):
+        while not self._libres.empty():
+            await self._cerrar_conexion(self._libres.get_nowait())
+
+
+class ProveedorConsola(ProveedorCanal):
+    # Lo que hacía _enviar_stub: imprime el mensaje. Acá mañana lo reemplazamos por Twilio/Meta/lo que sea.
+    async def _enviar(self, conexion, destino: str, mensaje: str) -> str:
+        print(f"[SEND:{self.canal}] {mensaje}")
+        return "stub-id"
+
+
+class ProveedorFake(ProveedorCanal):
+    """
+    Simula un gateway real: latencia aleatoria y una tasa de fallos configurable.
+    Sirve para probar throughput del dispatcher sin tocar servicios externos.
+    """
+    def __init__(self, canal: str, *, latencia_ms: float = 200, desvio_ms: float = 100, tasa_fallo: float = 0.05, **kwargs):
+        super().__init__(canal, **kwargs)
+        self._latencia_ms = latencia_ms
+        self._desvio_ms = desvio_ms
+        self._tasa_fallo = tasa_fallo
+
+    async def _enviar(self, conexion, destino: str, mensaje: str) -> str:
+        demora = max(0.0, random.gauss(self._latencia_ms, self._desvio_ms)) / 1000
+        await asyncio.sleep(demora)
+        if random.random() < self._tasa_fallo:
+            raise ErrorEnvio(f"fake {self.canal}: fallo simulado enviando a {destino}")
+        return f"fake-{self.canal}-{uuid.uuid4().hex[:12]}"
+
+
+def _env_canal(canal: str, nombre: str, defecto: str) -> str:
+    # NOTIF_SMS_CONCURRENCIA, NOTIF_WHATSAPP_TASA, ...; si no está, usa el valor general NOTIF_CONCURRENCIA, etc.
+    return os.getenv(f"NOTIF_{canal.upper()}_{nombre}", os.getenv(f"NOTIF_{nombre}", defecto))
+
+
+def crear_proveedor(canal: str) -> ProveedorCanal:
+    tipo = _env_canal(canal, "PROVEEDOR", "consola")
+    limites = {
+        "max_conexiones": int(_env_canal(canal, "CONEXIONES", "4")),
+        "max_concurrencia": int(_env_canal(canal, "CONCURRENCIA", "4")),
+        "tasa_por_segundo": float(_env_canal(canal, "TASA", "0")),
+        "timeout_seg": float(_env_canal(canal, "TIMEOUT_SEG", "30")),  # un envío colgado no frena el lote más que esto
+    }
+
+    if tipo == "consola":
+        return ProveedorConsola(canal, **limites)
+    if tipo == "fake":
+        return ProveedorFake(
+            canal,
+            latencia_ms=float(_env_canal(canal, "FAKE_LATENCIA_MS", "200")),
+            desvio_ms=float(_env_canal(canal, "FAKE_DESVIO_MS", "100")),
+            tasa_fallo=float(_env_canal(canal, "FAKE_TASA_FALLO", "0.05")),
+            **limites,
+        )
+    raise ValueError(f"Proveedor de notificaciones desconocido para {canal}: {tipo}")
+
+
+def crear_proveedores() -> dict[str, ProveedorCanal]:
+    return {canal: crear_proveedor(canal) for canal in CANALES}
@@ -1,11 +1,18 @@
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import select, update, func
 from sqlalchemy.orm import selectinload
 
 from app.models.usuario_model import Usuario
 from app.models.rol_model import Rol
 from app.models.rol_permiso_model import RolPermiso
 from app.models.permiso_model import Permiso
+from app.models.version_permisos_model import VersionPermisos
 
 
 def get_user_with_roles_and_permissions(db: Session, user_id: int) -> Usuario | None:
@@ -34,4 +41,173 @@ def build_permissions_map(user: Usuario) -> dict[str, set[str]]:
 
 
 def has_permission(perms_map: dict[str, set[str]], code: str) -> set[str]:
-    return perms_map.get(code, set())
\ No newline at end of file
+    return perms_map.get(code, set())
+
+# ---- Cache de permisos compilados ----
+# Cada request autenticado necesita usuario + roles + permisos (4 consultas). Como eso cambia muy poco,
+# guardamos el resultado compilado por usuario. Las versiones viven en la base (usuarios.permisos_version
+# y version_permisos), así que se comparten entre workers y réplicas: cada request las lee con una consulta
+# por clave primaria y solo usa la entrada cacheada si se cargó con esas mismas versiones.
+# Cambiar los roles de un usuario sube su versión (invalidar_permisos_usuario). Roles, rol_permisos y
+# permisos no se editan desde la API: se cargan por migración, y la migración que los toque sube la
+# versión global (ver migrations/README.md).
+
+RBAC_CACHE_TTL_SEG = int(os.getenv("RBAC_CACHE_TTL_SEG", "60"))
+RBAC_CACHE_MAX = int(os.getenv("RBAC_CACHE_MAX", "10000"))
+
+
+@dataclass(frozen=True)
+class UsuarioAutenticado:
+    """
+    Lo que los endpoints necesitan del usuario logueado, desacoplado de la sesión de SQLAlchemy
+    (se puede cachear y compartir entre requests).
+    """
+    id: int
+    username: str
+    profesional_id: int | None
+    perms_map: dict[str, frozenset[str]]
+    versiones: tuple[int, int] = (0, 0)  # (global, usuario) con las que se compilaron los permisos
+
+
+_lock = Lock()
+# user_id -> (versiones, vence_en, usuario)
+_cache: "OrderedDict[int, tuple[tuple[int, int], float, UsuarioAutenticado]]" = OrderedDict()
+
+
+def versiones_permisos(db: Session, user_id: int) -> tuple[int, int] | None:
+    """
+    (versión global, versión del usuario) leídas de la base, o None si el usuario no existe o está inactivo.
+    """
+    version_global = select(VersionPermisos.version).where(VersionPermisos.id == 1).scalar_subquery()
+    fila = db.execute(
+        select(func.coalesce(version_global, 0), Usuario.permisos_version)
+        .where(Usuario.id == user_id, Usuario.activo == True)
+    ).first()
+    return (fila[0], fila[1]) if fila else None
+
+
+def invalidar_permisos_usuario(db: Session, user_id: int) -> None:
+    """
+    Llamar cuando cambian los roles del usuario, dentro de la misma transacción (el caller commitea).
+    """
+    db.execute(
+        update(Usuario)
+        .where(Usuario.id == user_id)
+        .values(permisos_version=Usuario.permisos_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    with _lock:
+        _cache.pop(user_id, None)
+
+
+def compilar_usuario_autenticado(user: Usuario, versiones: tuple[int, int] = (0, 0)) -> UsuarioAutenticado:
+    return UsuarioAutenticado(
+        id=user.id,
+        username=user.username,
+        profesional_id=user.profesional_id,
+        perms_map={code: frozenset(scopes) for code, scopes in build_permissions_map(user).items()},
+        versiones=versiones,
+    )
+
+
+def obtener_usuario_autenticado(
+    db: Session,
+    user_id: int,
+    versiones: tuple[int, int] | None = None,
+) -> UsuarioAutenticado | None:
+    """
+    Usuario con sus permisos compilados, desde el cache si sigue vigente para las versiones actuales.
+    `versiones` evita volver a leerlas si el caller ya lo hizo (ver versiones_permisos).
+    """
+    if versiones is None:
+        versiones = versiones_permisos(db, user_id)
+    if versiones is None:
+        with _lock:
+            _cache.pop(user_id, None)
+        return None  # inexistente o inactivo
+
+    ahora = time.monotonic()
+    with _lock:
+        entrada = _cache.get(user_id)
+        if entrada and entrada[0] == versiones and entrada[1] > ahora:
+            _cache.move_to_end(user_id)
+            return entrada[2]
+
+    user = get_user_with_roles_and_permissions(db, user_id)
+    if not user:
+        return None  # los inexistentes/inactivos no se cachean
+    # Si alguien invalidó entre la lectura de versiones y esta carga, la entrada queda con versiones
+    # viejas y el próximo request la recarga: nunca se guardan permisos viejos con versiones nuevas.
+    usuario = compilar_usuario_autenticado(user, versiones)
+
+    with _lock:
+        _cache[user_id] = (versiones, ahora + RBAC_CACHE_TTL_SEG, usuario)
+        _cache.move_to_end(user_id)
+        while len(_cache) > RBAC_CACHE_MAX:
+            _cache.popitem(last=False)
+
+    return usuario
+
+
+# ---- Permisos embebidos en el token (AUTH_PERMISOS_EN_TOKEN) ----
+# Claims: {"pv": formato, "ver": [global, usuario], "usr": username, "pid": profesional_id,
+#          "perms": {"turnos.ver": "A", "turnos.cancelar": "O", ...}} con A = ANY y O = OWN.
+# "ver" son las versiones de permisos con las que se emitió: si en la base ya son otras (cambiaron sus roles
+# o los permisos) el token no se usa y se vuelve al camino normal (base + cache). Un usuario desactivado
+# no tiene versiones (versiones_permisos devuelve None) y se rechaza antes de mirar el token.
+
+FORMATO_CLAIMS_PERMISOS = 2
+_ABREV_SCOPE = {"ANY": "A", "OWN": "O"}
+_SCOPE_POR_ABREV = {v: k for k, v in _ABREV_SCOPE.items()}
+
+
+def claims_de_permisos(usuario: UsuarioAutenticado) -> dict:
+    return {
+        "pv": FORMATO_CLAIMS_PERMISOS,
+        "ver": list(usuario.versiones),
+        "usr": usuario.username,
+        "pid": usuario.profesional_id,
+        "perms": {
+            code: "".join(sorted(_ABREV_SCOPE[s] for s in scopes))
+            for code, scopes in usuario.perms_map.items()
+        },
+    }
+
+
+def usuario_desde_claims(user_id: int, payload: dict, versiones: tuple[int, int]) -> UsuarioAutenticado | None:
+    """
+    Arma el usuario a partir del token. Devuelve None si el token no trae permisos, es de otro formato
+    o se emitió con versiones de permisos distintas de `versiones` (las actuales, ver versiones_permisos).
+    """
+    if payload.get("pv") != FORMATO_CLAIMS_PERMISOS or not isinstance(payload.get("perms"), dict):
+        return None
+    if tuple(payload.get("ver") or ()) != tuple(versiones):
+        return None
+
+    return UsuarioAutenticado(
+        id=user_id,
+        username=payload.get("usr", ""),
+        profesional_id=payload.get("pid"),
+        perms_map={
+            code: frozenset(_SCOPE_POR_ABREV[a] for a in abrevs if a in _SCOPE_POR_ABREV)
+            for code, abrevs in payload["perms"].items()
+        },
+        versiones=tuple(versiones),
+    )
+
+
+def autenticar(db: Session, user_id: int, payload: dict, permisos_en_token: bool) -> UsuarioAutenticado | None:
+    """
+    Usuario del token: una consulta de versiones (rechaza inexistentes e inactivos) y después los
+    permisos del token si siguen vigentes, o los del cache / la base. None si no puede autenticarse.
+    """
+    versiones = versiones_permisos(db, user_id)
+    if versiones is None:
+        return None
+
+    if permisos_en_token:
+        usuario = usuario_desde_claims(user_id, payload, versiones)
+        if usuario:
+            return usuario
+
+    return obtener_usuario_autenticado(db, user_id, versiones)
@@ -0,0 +1,59 @@
+# Variantes async de turnos_service para los routers async (AsyncSession).
+# Las escrituras y los listados reusan la lógica sync con AsyncSession.run_sync: corre en el event loop
+# (greenlet) y cada consulta espera al driver async, sin ocupar un hilo del threadpool.
+# Lo que devuelven ya viene serializado: fuera de run_sync no se pueden hacer lazy loads.
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.turno_model import Turno
+from app.schemas.turno_schema import TurnoOut
+from app.services.perfiles_carga import opciones_turno, PERFIL_LISTA
+from app.services.turnos_service import (
+    crear_turno,
+    crear_turnos_lote,
+    aplicar_evento_turno,
+    query_turnos_filtrados,
+    pagina_turnos,
+)
+
+
+async def crear_turno_async(db: AsyncSession, **kwargs) -> TurnoOut:
+    def _crear(s):
+        return TurnoOut.model_validate(crear_turno(s, **kwargs))
+
+    return await db.run_sync(_crear)
+
+
+async def crear_turnos_lote_async(db: AsyncSession, **kwargs) -> tuple[list[TurnoOut], list[dict]]:
+    def _crear(s):
+        creados, conflictos = crear_turnos_lote(s, **kwargs)
+        return [TurnoOut.model_validate(t) for t in creados], conflictos
+
+    return await db.run_sync(_crear)
+
+
+async def aplicar_evento_turno_async(db: AsyncSession, turno_id: int, evento: str, **kwargs) -> TurnoOut:
+    def _aplicar(s):
+        return TurnoOut.model_validate(aplicar_evento_turno(s, turno_id, evento, **kwargs))
+
+    return await db.run_sync(_aplicar)
+
+
+async def listar_turnos_async(db: AsyncSession, *, limit: int, **kwargs) -> list[TurnoOut]:
+    def _listar(s):
+        turnos = query_turnos_filtrados(s, **kwargs).order_by(Turno.fecha_hora_inicio.asc()).limit(limit).all()
+        return [TurnoOut.model_validate(t) for t in turnos]
+
+    return await db.run_sync(_listar)
+
+
+async def pagina_turnos_async(db: AsyncSession, **kwargs) -> tuple[list[dict], str | None]:
+    return await db.run_sync(lambda s: pagina_turnos(s, **kwargs))
+
+
+async def obtener_turno_async(db: AsyncSession, turno_id: int) -> Turno | None:
+    # PERFIL_LISTA trae el estado con el JOIN, así TurnoOut no necesita lazy loads
+    resultado = await db.execute(
+        select(Turno).options(*opciones_turno(PERFIL_LISTA)).where(Turno.id == turno_id)
+    )
+    return resultado.scalar_one_or_none()
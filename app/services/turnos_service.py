@@ -1,21 +1,35 @@
 #acá va la lógica del proyecto y no en los endpoints que está en app/api/turnos.py
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy import select, insert, update, or_, and_, union_all, literal, case
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
-from datetime import datetime
+from fastapi.encoders import jsonable_encoder
+import base64
+from datetime import datetime, date, time, timedelta
 
 from app.models.turno_model import Turno
 from app.models.paciente_model import Paciente
 from app.models.profesional_model import Profesional
-from app.models.estado_turno_model import EstadoTurno
 from app.models.bloqueo_agenda_model import BloqueoAgenda
 
+from app.services.perfiles_carga import opciones_turno, PERFIL_MINIMO, PERFIL_LISTA
+from app.services.bloqueos_recurrentes_service import reglas_del_profesional, regla_se_solapa, expandir_reglas
+from app.services.horarios_service import dentro_de_horario, obtener_horario, horario_cubre
+from app.services.estados_turno_service import (
+    estado_id_por_codigo,
+    codigo_por_estado_id,
+    estados_activos_ids,
+    estado_por_id,
+)
+
 from app.services.notificaciones_service import (
     programar_notifs_confirmacion,
     programar_notifs_cancelacion,
     cancelar_notificaciones_pendientes_de_turno,
     programar_notifs_creacion_turno,
+    programar_notifs_creacion_turnos_lote,
+    cancelar_notificaciones_pendientes_de_turnos,
+    programar_notifs_cancelacion_lote,
 )
 
 # Eventos permitidos
@@ -36,17 +50,19 @@ TRANSICIONES = {
     ("CONFIRMADO", EVENTO_COMPLETAR): "COMPLETADO",
 }
 
-def _estado_id_por_codigo(db: Session, codigo: str) -> int:
-    estado = db.execute(select(EstadoTurno).where(EstadoTurno.codigo == codigo)).scalar_one_or_none()
-    if not estado:
-        raise HTTPException(status_code=500, detail=f"Estado '{codigo}' no existe en estados_turno.")
-    return estado.id
 
-def _codigo_por_estado_id(db: Session, estado_id: int) -> str:
-    estado = db.get(EstadoTurno, estado_id)
-    if not estado:
-        raise HTTPException(status_code=500, detail=f"Estado con id '{estado_id}' no existe en estados_turno.")
-    return estado.codigo
+def recargar_turno(db: Session, turno_id: int, perfil: str = PERFIL_LISTA) -> Turno:
+    """
+    Relee el turno después de un commit con el perfil pedido, en una sola consulta
+    (en vez de db.refresh + refresh de cada relación).
+    """
+    return db.execute(
+        select(Turno)
+        .options(*opciones_turno(perfil))
+        .where(Turno.id == turno_id)
+        .execution_options(populate_existing=True)
+    ).scalar_one()
+
 
 def aplicar_evento_turno(
     db: Session,
@@ -57,8 +73,9 @@ def aplicar_evento_turno(
     user=None,
     scope: str = "ANY",  # "OWN" o "ANY"
 ):
+    # perfil mínimo: con JOINs el FOR UPDATE también bloquearía las filas de las tablas relacionadas
     turno = db.execute(
-        select(Turno).where(Turno.id == turno_id).with_for_update() # SELECT ... FOR UPDATE (bloquea)
+        select(Turno).options(*opciones_turno(PERFIL_MINIMO)).where(Turno.id == turno_id).with_for_update() # SELECT ... FOR UPDATE (bloquea)
     ).scalar_one_or_none()
 
     if not turno:
@@ -76,7 +93,7 @@ def aplicar_evento_turno(
 
     #######################################
     
-    estado_actual_codigo = _codigo_por_estado_id(db, turno.estado_id)
+    estado_actual_codigo = codigo_por_estado_id(db, turno.estado_id)
 
     clave = (estado_actual_codigo, evento)
     if clave not in TRANSICIONES:
@@ -86,7 +103,7 @@ def aplicar_evento_turno(
         )
     
     nuevo_estado_codigo = TRANSICIONES[clave] # devuelve el código (string) del nuevo estado, ver diccionario TRANSICIONES
-    turno.estado_id = _estado_id_por_codigo(db, nuevo_estado_codigo) # actualiza estado_id del turno
+    turno.estado_id = estado_id_por_codigo(db, nuevo_estado_codigo) # actualiza estado_id del turno
 
     ahora = datetime.utcnow()
     # También se deben updetear los campos confirmado_en, cancelado_en, etc según corresponda
@@ -123,10 +140,77 @@ def aplicar_evento_turno(
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail="Error al actualizar el estado del turno.\n" + str(e))
-    db.refresh(turno)
-    db.refresh(turno, attribute_names=["estado"])
+    return recargar_turno(db, turno_id)  # turno.id acá refrescaría el objeto expirado por el commit (un SELECT de más)
+
+def aplicar_evento_turnos_lote(
+    db: Session,
+    turno_ids: list[int],
+    evento: str,
+    actor: str | None = None,
+    *,
+    user=None,
+) -> dict[str, int]:
+    """
+    Aplica `evento` a un lote de turnos con UPDATEs set-based y un solo commit.
+    Respeta TRANSICIONES: solo se actualizan los turnos cuyo estado actual tiene una transición
+    válida para el evento; el resto (o los que tiene bloqueados otra transacción) se omiten.
+    Devuelve {"lote": n, "actualizados": n, "omitidos": n}.
+    """
+    origenes = {origen: destino for (origen, ev), destino in TRANSICIONES.items() if ev == evento}
+    if not origenes:
+        raise HTTPException(status_code=400, detail=f"Evento desconocido: {evento}")
 
-    return turno
+    ahora = datetime.utcnow()
+    actualizados = 0
+
+    for origen_codigo, destino_codigo in origenes.items():
+        # bloqueamos solo los que siguen en el estado de origen; SKIP LOCKED evita esperar a una transición en curso
+        ids = db.execute(
+            select(Turno.id).where(
+                Turno.id.in_(turno_ids),
+                Turno.estado_id == estado_id_por_codigo(db, origen_codigo),
+            ).with_for_update(skip_locked=True)
+        ).scalars().all()
+        if not ids:
+            continue
+
+        valores = {"estado_id": estado_id_por_codigo(db, destino_codigo), "actualizado_en": ahora}
+        if destino_codigo == "CONFIRMADO":
+            valores["confirmado_en"] = ahora
+        elif destino_codigo == "CANCELADO":
+            valores["cancelado_en"] = ahora
+        if user:
+            valores["actualizado_por_usuario_id"] = user.id
+
+        db.execute(
+            update(Turno)
+            .where(Turno.id.in_(ids))
+            .values(**valores)
+            .execution_options(synchronize_session=False)
+        )
+
+        # Mismas reglas de notificaciones que aplicar_evento_turno, pero para todo el lote
+        if destino_codigo == "CANCELADO":
+            cancelar_notificaciones_pendientes_de_turnos(db, ids)
+            programar_notifs_cancelacion_lote(db, ids)
+        elif destino_codigo in ["NO_ASISTIO", "COMPLETADO"]:
+            cancelar_notificaciones_pendientes_de_turnos(db, ids)
+        elif destino_codigo == "CONFIRMADO":
+            for turno in db.execute(select(Turno).where(Turno.id.in_(ids))).scalars().all():
+                programar_notifs_confirmacion(db, turno)
+
+        actualizados += len(ids)
+
+    try:
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Conflicto: notificación duplicada o restricción UNIQUE.\n" + str(e))
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail="Error al actualizar el estado de los turnos.\n" + str(e))
+
+    return {"lote": len(turno_ids), "actualizados": actualizados, "omitidos": len(turno_ids) - actualizados}
 
 ESTADO_RESERVADO = 1
 ESTADO_CONFIRMADO = 2
@@ -137,7 +221,7 @@ def validar_solapamiento_paciente(
     inicio: datetime,
     fin: datetime
 ):
-    estados_activos = [_estado_id_por_codigo(db, "RESERVADO"), _estado_id_por_codigo(db, "CONFIRMADO")]
+    estados_activos = estados_activos_ids(db)
     return (
         db.query(Turno).filter(
             Turno.paciente_id == paciente_id,
@@ -153,7 +237,7 @@ def validar_solapamiento_profesional(
     inicio: datetime, 
     fin: datetime
 ):
-    estados_activos = [_estado_id_por_codigo(db, "RESERVADO"), _estado_id_por_codigo(db, "CONFIRMADO")]
+    estados_activos = estados_activos_ids(db)
     return (
         db.query(Turno).filter(
             Turno.profesional_id == profesional_id,
@@ -174,6 +258,87 @@ def hay_bloqueo_agenda(db: Session, profesional_id: int, inicio: datetime, fin:
     )
 
 
+def validar_reserva(
+    db: Session,
+    *,
+    paciente_id: int,
+    profesional_id: int,
+    inicio: datetime,
+    fin: datetime,
+) -> tuple[Paciente, Profesional]:
+    """
+    Valida una reserva nueva en un solo SELECT: trae paciente y profesional (existencia y 'activo')
+    y resuelve con EXISTS si hay solapamiento del paciente o del profesional o un bloqueo de agenda.
+    Los bloqueos van contra la base y no contra el índice en memoria (bloqueos_cache): un bloqueo recién
+    creado en otra réplica tiene que impedir la reserva ya, no cuando venza el TTL. Horario y reglas
+    recurrentes salen de memoria, validados con la agenda_version del profesional que trae el mismo SELECT.
+    Devuelve (paciente, profesional) para reusarlos al encolar las notificaciones.
+    """
+    estados_activos = estados_activos_ids(db)
+
+    solapa_paciente = select(Turno.id).where(
+        Turno.paciente_id == paciente_id,
+        Turno.estado_id.in_(estados_activos),
+        inicio < Turno.fecha_hora_fin,
+        fin > Turno.fecha_hora_inicio,
+    ).exists()
+
+    solapa_profesional = select(Turno.id).where(
+        Turno.profesional_id == profesional_id,
+        Turno.estado_id.in_(estados_activos),
+        inicio < Turno.fecha_hora_fin,
+        fin > Turno.fecha_hora_inicio,
+    ).exists()
+
+    bloqueado = select(BloqueoAgenda.id).where(
+        BloqueoAgenda.profesional_id == profesional_id,
+        BloqueoAgenda.activo == True,
+        inicio < BloqueoAgenda.fecha_hora_fin,
+        fin > BloqueoAgenda.fecha_hora_inicio,
+    ).exists()
+
+    # pacientes LEFT JOIN profesionales: si no hay fila falta el paciente, si Profesional es None falta el profesional
+    fila = db.execute(
+        select(
+            Paciente,
+            Profesional,
+            solapa_paciente.label("solapa_paciente"),
+            solapa_profesional.label("solapa_profesional"),
+            bloqueado.label("bloqueado"),
+        )
+        .select_from(Paciente)
+        .outerjoin(Profesional, Profesional.id == profesional_id)
+        .where(Paciente.id == paciente_id)
+    ).first()
+
+    if fila is None:
+        # TODO (próximo paso): permitir crear el paciente automáticamente o que salte un popup en el frontend para que el usuario lo cree (haciendo un POST a la ruta /pacientes)
+        raise HTTPException(status_code=404, detail="Paciente no encontrado. Debe existir en la tabla pacientes")
+
+    paciente, profesional = fila.Paciente, fila.Profesional
+    if profesional is None:
+        raise HTTPException(status_code=404, detail="Profesional no existe en la base de datos (tabla 'profesionales').")
+
+    #  Verificar que el paciente y la profesional tengan el atributo 'activo' en True (si no no pueden tener turnos asignados)
+    if not paciente.activo:
+        raise HTTPException(status_code=400, detail="Paciente inactivo.")
+    if not profesional.activo:
+        raise HTTPException(status_code=400, detail="Profesional inactivo.")
+
+    # horario del cache en memoria, validado contra la agenda_version que trajo el SELECT de arriba
+    if not dentro_de_horario(db, profesional_id, inicio, fin, version=profesional.agenda_version):
+        raise HTTPException(status_code=409, detail="Fuera del horario de atención del profesional.")
+    reglas = reglas_del_profesional(db, profesional_id, profesional.agenda_version)
+    if fila.bloqueado or regla_se_solapa(reglas, inicio, fin):
+        raise HTTPException(status_code=409, detail="Horario bloqueado en agenda para ese profesional.")
+    if fila.solapa_paciente:
+        raise HTTPException(status_code=409, detail="El paciente ya tiene un turno en ese horario")
+    if fila.solapa_profesional:
+        raise HTTPException(status_code=409, detail="El profesional ya tiene un turno en ese horario")
+
+    return paciente, profesional
+
+
 def crear_turno(
     db: Session,
     *,
@@ -198,40 +363,20 @@ def crear_turno(
 
     ###########################################
 
-    # Verificar que el paciente y la profesional ingresados ya existan en la base de datos antes de crear el turno
-    paciente = db.get(Paciente, paciente_id) #SELECT * FROM pacientes WHERE id = payload.paciente_id
-    if not paciente:
-        # TODO (próximo paso): permitir crear el paciente automáticamente o que salte un popup en el frontend para que el usuario lo cree (haciendo un POST a la ruta /pacientes)
-        raise HTTPException(status_code=404, detail="Paciente no encontrado. Debe existir en la tabla pacientes")
-    
-    profesional = db.get(Profesional, profesional_id)
-    if not profesional:
-        raise HTTPException(status_code=404, detail="Profesional no existe en la base de datos (tabla 'profesionales').")
-
-    #  Verificar que el paciente y la profesional tengan el atributo 'activo' en True (si no no pueden tener turnos asignados)
-    if not paciente.activo:
-        raise HTTPException(status_code=400, detail="Paciente inactivo.")
-    if not profesional.activo:
-        raise HTTPException(status_code=400, detail="Profesional inactivo.")
-    
-    bloqueo = hay_bloqueo_agenda(db, profesional_id, inicio, fin)
-    if bloqueo:
-        raise HTTPException(status_code=409, detail="Horario bloqueado en agenda para ese profesional.")
-
-    conflicto_paciente = validar_solapamiento_paciente(db, paciente_id, inicio, fin)
-    if conflicto_paciente:
-        raise HTTPException(status_code=409, detail="El paciente ya tiene un turno en ese horario")
-
-    conflicto_profesional = validar_solapamiento_profesional(db, profesional_id, inicio, fin)
-    if conflicto_profesional:
-        raise HTTPException(status_code=409, detail="El profesional ya tiene un turno en ese horario")
+    paciente, profesional = validar_reserva(
+        db,
+        paciente_id=paciente_id,
+        profesional_id=profesional_id,
+        inicio=inicio,
+        fin=fin,
+    )
 
     # Ahora sí se puede crear el turno
     ahora = datetime.utcnow()
     turno = Turno(
         paciente_id=paciente_id,
         profesional_id=profesional_id,
-        estado_id=_estado_id_por_codigo(db, "RESERVADO"),
+        estado_id=estado_id_por_codigo(db, "RESERVADO"),
         fecha_hora_inicio=inicio,
         fecha_hora_fin=fin,
         creado_en=ahora,
@@ -249,7 +394,8 @@ def crear_turno(
 
     db.add(turno) #INSERT INTO turnos (...) VALUES (...)
     db.flush()  # para obtener turno.id antes del commit
-    programar_notifs_creacion_turno(db, turno)
+    turno_id = turno.id  # después del commit el objeto queda expirado y leer el id volvería a la base
+    programar_notifs_creacion_turno(db, turno, paciente, profesional)
 
     try:
         db.commit()
@@ -261,13 +407,215 @@ def crear_turno(
         db.rollback()
         raise HTTPException(status_code=400, detail= "Error al crear el turno\n" + str(e))  
     
-    db.refresh(turno)
-    db.refresh(turno, attribute_names=["estado"])
+    return recargar_turno(db, turno_id)
+
+
+MAX_SLOTS_LOTE = 200
+
+
+def expandir_recurrencia(
+    fecha_desde: date,
+    dias_semana: list[int],
+    hora: time,
+    cantidad: int,
+    duracion: timedelta,
+) -> list[tuple[datetime, datetime]]:
+    """
+    Primeras `cantidad` fechas desde fecha_desde que caen en dias_semana (0 = lunes), a la hora indicada.
+    """
+    dias = set(dias_semana)
+    if not dias or not dias <= set(range(7)):
+        raise HTTPException(status_code=400, detail="dias_semana debe tener valores entre 0 (lunes) y 6 (domingo).")
+
+    slots = []
+    dia = fecha_desde
+    while len(slots) < cantidad:
+        if dia.weekday() in dias:
+            inicio = datetime.combine(dia, hora)
+            slots.append((inicio, inicio + duracion))
+        dia += timedelta(days=1)
+    return slots
 
-    return turno
 
+def _solapa(intervalos: list[tuple[datetime, datetime]], inicio: datetime, fin: datetime) -> bool:
+    return any(inicio < i_fin and fin > i_inicio for i_inicio, i_fin in intervalos)
 
-def query_turnos_filtrados(
+
+def crear_turnos_lote(
+    db: Session,
+    *,
+    paciente_id: int,
+    profesional_id: int,
+    slots: list[tuple[datetime, datetime]] | None = None,
+    recurrencia=None,
+    modo: str = "todo_o_nada",
+    user=None,
+    scope: str = "ANY",
+) -> tuple[list[Turno], list[dict]]:
+    """
+    Crea varios turnos del mismo paciente con el mismo profesional (ej: un plan de 10 sesiones).
+    Valida todos los slots contra una sola lectura de bloqueos y turnos activos del rango, inserta
+    los turnos y sus notificaciones en bloque y hace un solo commit.
+      - todo_o_nada: si algún slot tiene conflicto no se crea ninguno (409 con el detalle por slot).
+      - mejor_esfuerzo: se crean los que no tienen conflicto y se informan los demás.
+    Devuelve (turnos creados, conflictos).
+    """
+    if (slots is None) == (recurrencia is None):
+        raise HTTPException(status_code=400, detail="Hay que enviar slots o recurrencia (uno de los dos).")
+
+    # RBAC: si es OWN, el profesional_id lo decide el token, no el payload
+    if scope == "OWN":
+        if not user or not getattr(user, "profesional_id", None):
+            raise HTTPException(status_code=403, detail="Usuario sin profesional asociado.")
+        profesional_id = user.profesional_id
+
+    fila = db.execute(
+        select(Paciente, Profesional)
+        .select_from(Paciente)
+        .outerjoin(Profesional, Profesional.id == profesional_id)
+        .where(Paciente.id == paciente_id)
+    ).first()
+    if fila is None:
+        raise HTTPException(status_code=404, detail="Paciente no encontrado. Debe existir en la tabla pacientes")
+    paciente, profesional = fila.Paciente, fila.Profesional
+    if profesional is None:
+        raise HTTPException(status_code=404, detail="Profesional no existe en la base de datos (tabla 'profesionales').")
+    if not paciente.activo:
+        raise HTTPException(status_code=400, detail="Paciente inactivo.")
+    if not profesional.activo:
+        raise HTTPException(status_code=400, detail="Profesional inactivo.")
+
+    if recurrencia is not None:
+        duracion = timedelta(minutes=recurrencia.duracion_min or profesional.duracion_turno_min)
+        slots = expandir_recurrencia(
+            recurrencia.fecha_desde, recurrencia.dias_semana, recurrencia.hora, recurrencia.cantidad, duracion,
+        )
+
+    if not slots:
+        raise HTTPException(status_code=400, detail="No hay slots para crear.")
+    if len(slots) > MAX_SLOTS_LOTE:
+        raise HTTPException(status_code=400, detail=f"Como máximo {MAX_SLOTS_LOTE} turnos por lote.")
+    for inicio, fin in slots:
+        if fin <= inicio:
+            raise HTTPException(status_code=400, detail="La fecha de inicio debe ser anterior a la fecha de fin.")
+
+    # Una sola lectura del rango: bloqueos del profesional + turnos activos del profesional o del paciente
+    desde = min(inicio for inicio, _ in slots)
+    hasta = max(fin for _, fin in slots)
+    estados_activos = estados_activos_ids(db)
+    ocupados = db.execute(
+        union_all(
+            select(literal("bloqueo").label("tipo"), BloqueoAgenda.fecha_hora_inicio, BloqueoAgenda.fecha_hora_fin).where(
+                BloqueoAgenda.profesional_id == profesional_id,
+                BloqueoAgenda.activo == True,
+                desde < BloqueoAgenda.fecha_hora_fin,
+                hasta > BloqueoAgenda.fecha_hora_inicio,
+            ),
+            select(
+                case((Turno.paciente_id == paciente_id, literal("paciente")), else_=literal("profesional")).label("tipo"),
+                Turno.fecha_hora_inicio,
+                Turno.fecha_hora_fin,
+            ).where(
+                or_(Turno.profesional_id == profesional_id, Turno.paciente_id == paciente_id),
+                Turno.estado_id.in_(estados_activos),
+                desde < Turno.fecha_hora_fin,
+                hasta > Turno.fecha_hora_inicio,
+            ),
+        )
+    ).all()
+
+    por_tipo: dict[str, list[tuple[datetime, datetime]]] = {"bloqueo": [], "paciente": [], "profesional": []}
+    for tipo, inicio, fin in ocupados:
+        por_tipo[tipo].append((inicio, fin))
+    por_tipo["bloqueo"] += [
+        (o.fecha_hora_inicio, o.fecha_hora_fin)
+        for o in expandir_reglas(reglas_del_profesional(db, profesional_id, profesional.agenda_version), desde, hasta)
+    ]
+
+    horario = obtener_horario(db, profesional_id, version=profesional.agenda_version)  # como en validar_reserva
+
+    aceptados: list[tuple[datetime, datetime]] = []
+    conflictos: list[dict] = []
+    for inicio, fin in sorted(slots):
+        if not horario_cubre(horario, inicio, fin):
+            detalle = "Fuera del horario de atención del profesional."
+        elif _solapa(por_tipo["bloqueo"], inicio, fin):
+            detalle = "Horario bloqueado en agenda para ese profesional."
+        elif _solapa(por_tipo["paciente"], inicio, fin):
+            detalle = "El paciente ya tiene un turno en ese horario"
+        elif _solapa(por_tipo["profesional"], inicio, fin):
+            detalle = "El profesional ya tiene un turno en ese horario"
+        elif _solapa(aceptados, inicio, fin):
+            detalle = "Se superpone con otro turno del mismo lote."
+        else:
+            aceptados.append((inicio, fin))
+            continue
+        conflictos.append({"fecha_hora_inicio": inicio, "fecha_hora_fin": fin, "detalle": detalle})
+
+    if conflictos and modo == "todo_o_nada":
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "mensaje": "Hay slots con conflicto: no se creó ningún turno.",
+                "conflictos": jsonable_encoder(conflictos),
+            },
+        )
+    if not aceptados:
+        return [], conflictos
+
+    ahora = datetime.utcnow()
+    estado_reservado = estado_id_por_codigo(db, "RESERVADO")
+    filas = [
+        {
+            "paciente_id": paciente_id,
+            "profesional_id": profesional_id,
+            "estado_id": estado_reservado,
+            "fecha_hora_inicio": inicio,
+            "fecha_hora_fin": fin,
+            "creado_en": ahora,
+            "creado_por_usuario_id": user.id if user else None,
+            "actualizado_por_usuario_id": user.id if user else None,
+            "actualizado_en": ahora if user else None,
+        }
+        for inicio, fin in aceptados
+    ]
+
+    try:
+        # Un solo INSERT para todo el lote (executemany). Con db.add_all el ORM inserta fila por fila
+        # para conocer cada id (MySQL no tiene RETURNING), así que los ids se leen después con un
+        # SELECT por la clave única (profesional_id, fecha_hora_inicio).
+        db.execute(insert(Turno), filas)
+        turnos = db.execute(
+            select(Turno)
+            .options(*opciones_turno(PERFIL_MINIMO))
+            .where(
+                Turno.profesional_id == profesional_id,
+                Turno.fecha_hora_inicio.in_([inicio for inicio, _ in aceptados]),
+            )
+        ).scalars().all()
+        ids = [t.id for t in turnos]  # antes del commit: después cada t.id sería un SELECT
+        programar_notifs_creacion_turnos_lote(db, turnos, paciente, profesional)
+        db.commit()
+    except IntegrityError as e:
+        # ej: otro request reservó uno de estos horarios entre la validación y el INSERT
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Conflicto de integridad al crear los turnos.\n" + str(e))
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Error al crear los turnos\n" + str(e))
+
+    creados = db.execute(
+        select(Turno)
+        .options(*opciones_turno(PERFIL_LISTA))
+        .where(Turno.id.in_(ids))
+        .order_by(Turno.fecha_hora_inicio)
+        .execution_options(populate_existing=True)
+    ).scalars().all()
+
+    return list(creados), conflictos
+
+
+def _filtros_turnos(
     db: Session,
     *,
     user=None,
@@ -277,34 +625,119 @@ def query_turnos_filtrados(
     desde: datetime | None = None,
     hasta: datetime | None = None,
     solo_activos: bool = False,
-):
-    q = db.query(Turno).options(joinedload(Turno.estado))
+) -> list:
+    filtros = []
 
     # RBAC OWN: si es OWN, el profesional_id real lo impone el token
     if scope == "OWN":
         if not user or not getattr(user, "profesional_id", None):
             raise HTTPException(status_code=403, detail="Usuario sin profesional asociado.")
-        q = q.filter(Turno.profesional_id == user.profesional_id)
+        filtros.append(Turno.profesional_id == user.profesional_id)
 
     # Filtros “de negocio” (solo se aplican encima de RBAC)
     if profesional_id is not None:
-        q = q.filter(Turno.profesional_id == profesional_id)
+        filtros.append(Turno.profesional_id == profesional_id)
 
     if paciente_id is not None:
-        q = q.filter(Turno.paciente_id == paciente_id)
+        filtros.append(Turno.paciente_id == paciente_id)
 
     if desde is not None and hasta is not None:
         if hasta <= desde:
             raise HTTPException(status_code=400, detail="hasta debe ser mayor que desde")
-        q = q.filter(desde < Turno.fecha_hora_fin, hasta > Turno.fecha_hora_inicio)
+        filtros.extend([desde < Turno.fecha_hora_fin, hasta > Turno.fecha_hora_inicio])
     elif desde is not None:
-        q = q.filter(Turno.fecha_hora_fin > desde)
+        filtros.append(Turno.fecha_hora_fin > desde)
     elif hasta is not None:
-        q = q.filter(Turno.fecha_hora_inicio < hasta)
+        filtros.append(Turno.fecha_hora_inicio < hasta)
 
     if solo_activos:
-        estado_reservado = _estado_id_por_codigo(db, "RESERVADO")
-        estado_confirmado = _estado_id_por_codigo(db, "CONFIRMADO")
-        q = q.filter(Turno.estado_id.in_([estado_reservado, estado_confirmado]))
+        filtros.append(Turno.estado_id.in_(estados_activos_ids(db)))
+
+    return filtros
+
+
+def query_turnos_filtrados(db: Session, **kwargs):
+    return db.query(Turno).options(*opciones_turno(PERFIL_LISTA)).filter(*_filtros_turnos(db, **kwargs))
+
+
+# ---- Listado liviano con paginación por cursor (keyset) ----
+# Se seleccionan solo las columnas de TurnoOut (sin las relaciones joined del modelo) y el estado
+# se completa desde el registro en memoria. El cursor es (fecha_hora_inicio, id) del último turno devuelto.
+
+COLUMNAS_TURNO_OUT = (
+    Turno.id,
+    Turno.paciente_id,
+    Turno.profesional_id,
+    Turno.estado_id,
+    Turno.fecha_hora_inicio,
+    Turno.fecha_hora_fin,
+    Turno.creado_en,
+)
+
+
+def codificar_cursor(fecha_hora_inicio: datetime, turno_id: int) -> str:
+    crudo = f"{fecha_hora_inicio.isoformat()}|{turno_id}"
+    return base64.urlsafe_b64encode(crudo.encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        crudo = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        inicio, turno_id = crudo.split("|")
+        return datetime.fromisoformat(inicio), int(turno_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Cursor inválido.")
+
+
+def select_turnos_keyset(db: Session, *, cursor: str | None = None, limit: int | None = None, **kwargs):
+    stmt = select(*COLUMNAS_TURNO_OUT).where(*_filtros_turnos(db, **kwargs))
+
+    if cursor:
+        ultimo_inicio, ultimo_id = decodificar_cursor(cursor)
+        stmt = stmt.where(
+            or_(
+                Turno.fecha_hora_inicio > ultimo_inicio,
+                and_(Turno.fecha_hora_inicio == ultimo_inicio, Turno.id > ultimo_id),
+            )
+        )
 
-    return q
\ No newline at end of file
+    stmt = stmt.order_by(Turno.fecha_hora_inicio.asc(), Turno.id.asc())
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
+def fila_turno_a_dict(db: Session, fila) -> dict:
+    """
+    Misma forma que TurnoOut, armada a mano desde una fila de COLUMNAS_TURNO_OUT.
+    """
+    return {
+        "id": fila.id,
+        "paciente_id": fila.paciente_id,
+        "profesional_id": fila.profesional_id,
+        "estado_id": fila.estado_id,
+        "estado": dict(estado_por_id(db, fila.estado_id)),
+        "fecha_hora_inicio": fila.fecha_hora_inicio,
+        "fecha_hora_fin": fila.fecha_hora_fin,
+        "creado_en": fila.creado_en,
+    }
+
+
+def pagina_turnos(db: Session, *, limit: int, cursor: str | None = None, **kwargs) -> tuple[list[dict], str | None]:
+    # pedimos uno de más para saber si hay página siguiente sin hacer un COUNT
+    filas = db.execute(select_turnos_keyset(db, cursor=cursor, limit=limit + 1, **kwargs)).all()
+    hay_mas = len(filas) > limit
+    filas = filas[:limit]
+
+    siguiente = codificar_cursor(filas[-1].fecha_hora_inicio, filas[-1].id) if hay_mas else None
+    return [fila_turno_a_dict(db, f) for f in filas], siguiente
+
+
+def iterar_turnos(db: Session, stmt, tamanio_lote: int = 1000):
+    """
+    Recorre el resultado con un cursor del lado del servidor (stream_results) de a `tamanio_lote` filas,
+    así la memoria no depende de cuántos turnos haya.
+    """
+    resultado = db.execute(stmt.execution_options(stream_results=True, yield_per=tamanio_lote))
+    for fila in resultado:
+        yield fila_turno_a_dict(db, fila)
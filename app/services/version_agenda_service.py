@@ -0,0 +1,17 @@
+# Versión de la agenda de cada profesional (profesionales.agenda_version), compartida entre procesos.
+# Cubre lo que se cachea en memoria para validar reservas: horario de atención (horarios_service) y
+# bloqueos recurrentes (bloqueos_recurrentes_service). La reserva la lee en su SELECT de validación.
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.models.profesional_model import Profesional
+
+
+def subir_version_agenda(db: Session, profesional_id: int) -> None:
+    # dentro de la transacción del cambio: el caller commitea
+    db.execute(
+        update(Profesional)
+        .where(Profesional.id == profesional_id)
+        .values(agenda_version=Profesional.agenda_version + 1)
+        .execution_options(synchronize_session=False)
+    )
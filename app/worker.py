@@ -0,0 +1,45 @@
+# Proceso dedicado a los jobs periódicos (vencer reservas, no asistió, notificaciones, archivo):
+#   python -m app.worker
+# Se pueden levantar varios: solo el que tiene el lease "scheduler" corre los jobs (ver app/scheduler.py).
+import logging
+import signal
+import sys
+
+from apscheduler.schedulers.blocking import BlockingScheduler
+
+import app.models  # noqa: F401  (registra todos los modelos)
+from app.database import WorkerSessionLocal
+from app.scheduler import registrar_jobs, soltar_liderazgo
+from app.notificaciones_scheduler import despachador
+from app.services.estados_turno_service import refrescar_estados_turno
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    db = WorkerSessionLocal()
+    try:
+        refrescar_estados_turno(db)
+    finally:
+        db.close()
+
+    scheduler = BlockingScheduler()
+    registrar_jobs(scheduler)
+
+    # SIGTERM (docker stop, kubernetes) sale por el mismo camino que Ctrl+C
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        scheduler.start()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        # primero esperar a que terminen los jobs en curso: si se suelta el lease antes, otra instancia
+        # lo toma y puede correr el mismo job en paralelo (ej: dos despachos del mismo lote)
+        if scheduler.running:
+            scheduler.shutdown(wait=True)
+        soltar_liderazgo()
+        despachador.cerrar()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+# Benchmark del poll de la cola de notificaciones (obtener_notificaciones_pendientes).
+# Carga historial (ENVIADA/CANCELADA/FALLIDA) hasta cada tamaño pedido, con la misma cantidad de
+# pendientes vencidas en todos los casos, y mide la mediana del poll. Con el índice (estado, programada_para)
+# la latencia depende del trabajo pendiente, no del tamaño de la tabla.
+#
+#   python -m benchmarks.cola_notificaciones                      # 10k, 100k, 1M en un SQLite temporal
+#   python -m benchmarks.cola_notificaciones 10000 10000000       # hasta 10M
+#   BENCH_DATABASE_URL=mysql+pymysql://.../turnero_bench python -m benchmarks.cola_notificaciones
+#
+# OJO: borra y recrea las tablas de la base que usa. Nunca apuntarlo a una base con datos.
+import os
+import sys
+import tempfile
+
+if __name__ == "__main__":
+    os.environ["DATABASE_URL"] = os.getenv(
+        "BENCH_DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'turnero_bench.db')}"
+    )
+
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+
+from app.models.notificacion_model import Notificacion
+from app.models.paciente_model import Paciente
+from app.services.notificaciones_service import obtener_notificaciones_pendientes
+
+TAMANIOS = (10_000, 100_000, 1_000_000)
+PENDIENTES = 1_000  # vencidas, listas para reclamar (iguales en todos los tamaños)
+FUTURAS = 1_000  # PENDIENTE pero programadas para más adelante
+LOTE_POLL = 200  # NOTIF_LOTE por defecto
+CORRIDAS = 50
+FACTOR_MAX = 3.0  # mediana del más grande / mediana del más chico
+
+AHORA = datetime(2030, 1, 1, 12, 0)
+_ESTADOS_HISTORIAL = ("ENVIADA", "ENVIADA", "ENVIADA", "ENVIADA", "ENVIADA", "ENVIADA", "CANCELADA", "CANCELADA", "FALLIDA")
+
+
+def _fila(n: int, estado: str, programada_para: datetime) -> dict:
+    return {
+        "turno_id": 1 + n // 3,  # tres notificaciones por turno (la tabla turnos no se carga: ver preparar)
+        "paciente_id": 1,
+        "canal": ("whatsapp", "telegram", "sms")[n % 3],
+        "tipo": "RECORDATORIO",
+        "mensaje": "Recordatorio de turno",
+        "programada_para": programada_para,
+        "estado": estado,
+        "intentos": 1 if estado != "PENDIENTE" else 0,
+        "creado_en": programada_para - timedelta(days=2),
+        "dedupe_key": f"bench:{n}",
+    }
+
+
+def _sin_chequeo_fk(db: Session) -> None:
+    # las notificaciones apuntan a turnos que no se cargan (no cambia el plan del poll). Es por conexión,
+    # así que se repite en cada transacción.
+    if db.get_bind().dialect.name == "mysql":
+        db.execute(text("SET FOREIGN_KEY_CHECKS = 0"))
+
+
+def preparar(db: Session) -> None:
+    _sin_chequeo_fk(db)
+    db.add(Paciente(id=1, nombre="Bench", nombre_normalizado="bench", telefono="0"))
+    db.flush()
+    filas = [_fila(n, "PENDIENTE", AHORA - timedelta(minutes=n)) for n in range(PENDIENTES)]
+    filas += [_fila(PENDIENTES + n, "PENDIENTE", AHORA + timedelta(minutes=n + 1)) for n in range(FUTURAS)]
+    db.execute(insert(Notificacion), filas)
+    db.commit()
+
+
+def cargar_historial(db: Session, desde: int, hasta: int, lote: int = 50_000) -> None:
+    # historial de varios años hacia atrás; las claves no chocan con las de preparar()
+    base = PENDIENTES + FUTURAS
+    for inicio in range(desde, hasta, lote):
+        _sin_chequeo_fk(db)
+        db.execute(insert(Notificacion), [
+            _fila(base + n, _ESTADOS_HISTORIAL[n % len(_ESTADOS_HISTORIAL)], AHORA - timedelta(minutes=10 + n))
+            for n in range(inicio, min(inicio + lote, hasta))
+        ])
+        db.commit()
+
+
+def latencia_poll_ms(db: Session, corridas: int = CORRIDAS) -> float:
+    for _ in range(5):  # calentar cache de páginas y statement cache
+        obtener_notificaciones_pendientes(db, AHORA, limit=LOTE_POLL)
+    tiempos = []
+    for _ in range(corridas):
+        inicio = time.perf_counter()
+        filas = obtener_notificaciones_pendientes(db, AHORA, limit=LOTE_POLL)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+        assert len(filas) == LOTE_POLL
+        db.expunge_all()
+    return statistics.median(tiempos)
+
+
+def medir(db: Session, tamanios=TAMANIOS) -> list[tuple[int, float]]:
+    """
+    [(filas en la tabla, mediana del poll en ms)] para cada tamaño, creciendo la misma tabla.
+    Espera una base con el esquema creado y sin notificaciones.
+    """
+    preparar(db)
+    cargadas = 0
+    resultados = []
+    for tamanio in sorted(tamanios):
+        historial = max(tamanio - PENDIENTES - FUTURAS, 0)
+        cargar_historial(db, cargadas, historial)
+        cargadas = max(cargadas, historial)
+        with db.get_bind().begin() as conn:
+            conn.execute(text("ANALYZE" if conn.dialect.name == "sqlite" else "ANALYZE TABLE notificaciones"))
+        resultados.append((tamanio, latencia_poll_ms(db)))
+    return resultados
+
+
+def main(argv: list[str]) -> int:
+    import app.models  # noqa: F401
+    from app.database import Base, engine, SessionLocal
+
+    tamanios = [int(a) for a in argv] or list(TAMANIOS)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    try:
+        resultados = medir(db, tamanios)
+    finally:
+        db.close()
+
+    for tamanio, ms in resultados:
+        print(f"{tamanio:>12,} filas  poll {ms:8.3f} ms")
+    factor = resultados[-1][1] / resultados[0][1]
+    print(f"factor {factor:.2f} (máximo {FACTOR_MAX})")
+    return 0 if factor <= FACTOR_MAX else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
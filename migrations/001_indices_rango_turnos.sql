@@ -0,0 +1,32 @@
+-- Índices compuestos para las consultas de solapamiento, agenda y scheduler sobre turnos y bloqueos_agenda.
+
+-- turnos: validar_solapamiento_profesional / validar_solapamiento_paciente / query_turnos_filtrados(solo_activos)
+CREATE INDEX idx_turno_prof_estado_rango
+    ON turnos (profesional_id, estado_id, fecha_hora_fin, fecha_hora_inicio)
+    ALGORITHM=INPLACE LOCK=NONE;
+
+CREATE INDEX idx_turno_pac_estado_rango
+    ON turnos (paciente_id, estado_id, fecha_hora_fin, fecha_hora_inicio)
+    ALGORITHM=INPLACE LOCK=NONE;
+
+-- turnos: listado general ordenado por inicio
+CREATE INDEX idx_turno_inicio
+    ON turnos (fecha_hora_inicio)
+    ALGORITHM=INPLACE LOCK=NONE;
+
+-- turnos: scheduler (reservas vencidas / confirmados terminados)
+CREATE INDEX idx_turno_estado_creado
+    ON turnos (estado_id, creado_en)
+    ALGORITHM=INPLACE LOCK=NONE;
+
+CREATE INDEX idx_turno_estado_fin
+    ON turnos (estado_id, fecha_hora_fin)
+    ALGORITHM=INPLACE LOCK=NONE;
+
+-- bloqueos_agenda: hay_bloqueo_agenda. El índice nuevo empieza por (profesional_id, activo),
+-- así que reemplaza a idx_bloq_prof_activo (también sirve a la FK de profesional_id).
+CREATE INDEX idx_bloq_prof_activo_rango
+    ON bloqueos_agenda (profesional_id, activo, fecha_hora_fin, fecha_hora_inicio)
+    ALGORITHM=INPLACE LOCK=NONE;
+
+DROP INDEX idx_bloq_prof_activo ON bloqueos_agenda;
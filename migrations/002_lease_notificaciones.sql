@@ -0,0 +1,6 @@
+-- Lease del dispatcher de notificaciones: permite que varias réplicas vacíen la cola sin enviar dos veces.
+
+ALTER TABLE notificaciones
+    ADD COLUMN reclamada_por VARCHAR(100) NULL,
+    ADD COLUMN reclamada_hasta DATETIME NULL,
+    ALGORITHM=INPLACE, LOCK=NONE;
@@ -0,0 +1,13 @@
+-- Reintentos con backoff y dead letter (FALLIDA) para notificaciones.
+
+-- Pendientes que ya agotaron los intentos: pasan a FALLIDA para que dejen de trabar la cola.
+-- El 3 es el valor por defecto de NOTIF_MAX_INTENTOS: si se configuró otro, cambiarlo acá antes de aplicarla.
+-- (De todas formas reclamar_notificaciones pasa a FALLIDA las que lleguen al límite configurado.)
+UPDATE notificaciones
+SET estado = 'FALLIDA'
+WHERE estado = 'PENDIENTE' AND intentos >= 3;
+
+-- Permisos del router de notificaciones (asignarlos a los roles que correspondan)
+INSERT IGNORE INTO permisos (codigo, descripcion) VALUES
+    ('notificaciones.ver', 'Ver notificaciones y su estado de envío'),
+    ('notificaciones.reintentar', 'Reencolar notificaciones fallidas');
@@ -0,0 +1,36 @@
+-- Índices de cola y archivo histórico para notificaciones.
+
+CREATE INDEX idx_notif_estado_programada
+    ON notificaciones (estado, programada_para)
+    ALGORITHM=INPLACE LOCK=NONE;
+
+CREATE INDEX idx_notif_estado_creado
+    ON notificaciones (estado, creado_en)
+    ALGORITHM=INPLACE LOCK=NONE;
+
+CREATE INDEX idx_notif_turno
+    ON notificaciones (turno_id, estado)
+    ALGORITHM=INPLACE LOCK=NONE;
+
+CREATE TABLE IF NOT EXISTS notificaciones_archivo (
+    id INT NOT NULL PRIMARY KEY,
+    turno_id INT NULL,
+    paciente_id INT NOT NULL,
+    canal VARCHAR(20) NOT NULL,
+    tipo VARCHAR(30) NOT NULL,
+    mensaje TEXT NOT NULL,
+    programada_para DATETIME NOT NULL,
+    estado VARCHAR(20) NOT NULL,
+    intentos INT NOT NULL,
+    ultimo_error TEXT NULL,
+    proveedor_msg_id VARCHAR(100) NULL,
+    creado_en DATETIME NULL,
+    enviada_en DATETIME NULL,
+    cancelada_en DATETIME NULL,
+    dedupe_key VARCHAR(120) NOT NULL,
+    reclamada_por VARCHAR(100) NULL,
+    reclamada_hasta DATETIME NULL,
+    archivada_en DATETIME NOT NULL,
+    INDEX idx_notif_arch_turno (turno_id),
+    INDEX idx_notif_arch_paciente (paciente_id)
+);
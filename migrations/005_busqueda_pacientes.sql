@@ -0,0 +1,14 @@
+-- Búsqueda de pacientes: nombre normalizado + índices.
+
+ALTER TABLE pacientes
+    ADD COLUMN nombre_normalizado VARCHAR(100) NULL AFTER nombre,
+    ALGORITHM=INPLACE, LOCK=NONE;
+
+-- La columna se completa después con la misma función que usa la app (normalizar_nombre: sin tildes,
+-- signos convertidos en un espacio, minúsculas), que no tiene equivalente exacto en SQL:
+--   python -m app.normalizar_nombres_pacientes
+-- Mientras tanto los pacientes existentes no aparecen en la búsqueda por nombre.
+
+CREATE INDEX idx_pac_nombre_norm ON pacientes (nombre_normalizado, id) ALGORITHM=INPLACE LOCK=NONE;
+CREATE INDEX idx_pac_telefono ON pacientes (telefono) ALGORITHM=INPLACE LOCK=NONE;
+CREATE FULLTEXT INDEX ft_pac_nombre_norm ON pacientes (nombre_normalizado);
@@ -0,0 +1,5 @@
+-- bloqueos_agenda: GET /bloqueos_agenda?desde=&hasta= sin filtrar por profesional.
+-- Con profesional (o scope OWN) el rango ya lo sirve idx_bloq_prof_activo_rango (001).
+CREATE INDEX idx_bloq_activo_rango
+    ON bloqueos_agenda (activo, fecha_hora_fin, fecha_hora_inicio)
+    ALGORITHM=INPLACE LOCK=NONE;
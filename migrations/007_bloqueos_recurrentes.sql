@@ -0,0 +1,24 @@
+-- Bloqueos recurrentes (regla semanal + vigencia). Las ocurrencias no se guardan: se expanden al consultar.
+
+CREATE TABLE bloqueos_recurrentes (
+    id INT NOT NULL AUTO_INCREMENT,
+    profesional_id INT NOT NULL,
+    dias_semana VARCHAR(13) NOT NULL,
+    hora_inicio TIME NOT NULL,
+    hora_fin TIME NOT NULL,
+    vigente_desde DATE NOT NULL,
+    vigente_hasta DATE NULL,
+    motivo VARCHAR(255) NULL,
+    creado_en DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    creado_por_usuario_id INT NULL,
+    eliminado_en DATETIME NULL,
+    eliminado_por_usuario_id INT NULL,
+    activo TINYINT(1) NOT NULL DEFAULT 1,
+    PRIMARY KEY (id),
+    KEY idx_bloq_rec_prof_activo (profesional_id, activo, vigente_desde),
+    CONSTRAINT chk_bloq_rec_horas CHECK (hora_inicio < hora_fin),
+    CONSTRAINT chk_bloq_rec_vigencia CHECK (vigente_hasta IS NULL OR vigente_desde <= vigente_hasta),
+    CONSTRAINT fk_bloq_rec_profesional FOREIGN KEY (profesional_id) REFERENCES profesionales (id),
+    CONSTRAINT fk_bloq_rec_creado_por FOREIGN KEY (creado_por_usuario_id) REFERENCES usuarios (id) ON DELETE SET NULL,
+    CONSTRAINT fk_bloq_rec_eliminado_por FOREIGN KEY (eliminado_por_usuario_id) REFERENCES usuarios (id) ON DELETE SET NULL
+);
@@ -0,0 +1,27 @@
+-- Horario de atención por profesional: plantilla semanal + excepciones por fecha.
+
+CREATE TABLE horarios_atencion (
+    id INT NOT NULL AUTO_INCREMENT,
+    profesional_id INT NOT NULL,
+    dia_semana INT NOT NULL,
+    hora_inicio TIME NOT NULL,
+    hora_fin TIME NOT NULL,
+    PRIMARY KEY (id),
+    KEY idx_horario_prof_dia (profesional_id, dia_semana),
+    CONSTRAINT chk_horario_horas CHECK (hora_inicio < hora_fin),
+    CONSTRAINT chk_horario_dia CHECK (dia_semana BETWEEN 0 AND 6),
+    CONSTRAINT fk_horario_profesional FOREIGN KEY (profesional_id) REFERENCES profesionales (id)
+);
+
+CREATE TABLE excepciones_horario (
+    id INT NOT NULL AUTO_INCREMENT,
+    profesional_id INT NOT NULL,
+    fecha DATE NOT NULL,
+    hora_inicio TIME NULL,
+    hora_fin TIME NULL,
+    motivo VARCHAR(255) NULL,
+    PRIMARY KEY (id),
+    KEY idx_excepcion_prof_fecha (profesional_id, fecha),
+    CONSTRAINT chk_excepcion_horas CHECK ((hora_inicio IS NULL AND hora_fin IS NULL) OR hora_inicio < hora_fin),
+    CONSTRAINT fk_excepcion_profesional FOREIGN KEY (profesional_id) REFERENCES profesionales (id)
+);
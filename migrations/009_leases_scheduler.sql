@@ -0,0 +1,10 @@
+-- Lease para que una sola instancia (python -m app.worker) corra los jobs periódicos.
+
+CREATE TABLE leases_scheduler (
+    nombre VARCHAR(100) NOT NULL,
+    duenio VARCHAR(100) NULL,
+    vence_en DATETIME NULL,
+    PRIMARY KEY (nombre)
+);
+
+INSERT IGNORE INTO leases_scheduler (nombre) VALUES ('scheduler');
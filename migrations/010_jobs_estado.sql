@@ -0,0 +1,19 @@
+-- Métricas de los jobs periódicos (las escribe el worker líder, las lee GET /ready).
+
+CREATE TABLE jobs_estado (
+    job_id VARCHAR(100) NOT NULL,
+    instancia VARCHAR(100) NULL,
+    intervalo_seg INT NULL,
+    corridas BIGINT NOT NULL DEFAULT 0,
+    errores BIGINT NOT NULL DEFAULT 0,
+    superpuestas BIGINT NOT NULL DEFAULT 0,
+    perdidas BIGINT NOT NULL DEFAULT 0,
+    ultima_corrida_en DATETIME NULL,
+    ultima_duracion_ms INT NULL,
+    ultimas_filas INT NULL,
+    ultimo_lag_ms INT NULL,
+    ultimo_exito_en DATETIME NULL,
+    ultimo_error VARCHAR(500) NULL,
+    ultimo_error_en DATETIME NULL,
+    PRIMARY KEY (job_id)
+);
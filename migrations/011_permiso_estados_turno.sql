@@ -0,0 +1,11 @@
+-- POST /estados_turno/refrescar cambia estado del proceso: pide un permiso de edición, no el de lectura.
+
+INSERT IGNORE INTO permisos (codigo, descripcion) VALUES
+    ('estados_turno.editar', 'Recargar el catálogo de estados de turno');
+
+-- Se lo damos a los roles que ya administran usuarios y roles
+INSERT IGNORE INTO rol_permisos (rol_id, permiso_id, scope)
+SELECT rp.rol_id, p.id, 'ANY'
+FROM rol_permisos rp
+JOIN permisos admin ON admin.id = rp.permiso_id AND admin.codigo = 'auth.usuarios.editar_roles'
+JOIN permisos p ON p.codigo = 'estados_turno.editar';
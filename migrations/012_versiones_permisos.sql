@@ -0,0 +1,17 @@
+-- Versiones de permisos compartidas entre procesos (cache de permisos y tokens con permisos, ver rbac_service).
+
+ALTER TABLE usuarios
+    ADD COLUMN permisos_version INT NOT NULL DEFAULT 0,
+    ALGORITHM=INPLACE, LOCK=NONE;
+
+CREATE TABLE version_permisos (
+    id INT NOT NULL,
+    version INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (id)
+);
+
+INSERT IGNORE INTO version_permisos (id, version) VALUES (1, 0);
+
+-- Si se tocan roles, rol_permisos o permisos a mano (como en 011), subir la versión global
+-- para que ningún proceso siga usando permisos cacheados:
+--   UPDATE version_permisos SET version = version + 1 WHERE id = 1;
@@ -0,0 +1,9 @@
+-- Versión de la agenda de cada profesional (horario de atención y bloqueos recurrentes), compartida entre procesos.
+-- La validación de una reserva la lee junto con el profesional y la compara con la del cache en memoria.
+
+ALTER TABLE profesionales
+    ADD COLUMN agenda_version INT NOT NULL DEFAULT 0,
+    ALGORITHM=INPLACE, LOCK=NONE;
+
+-- Si se tocan horarios_atencion, excepciones_horario o bloqueos_recurrentes a mano, subir la versión del profesional:
+--   UPDATE profesionales SET agenda_version = agenda_version + 1 WHERE id = ...;
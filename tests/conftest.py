@@ -0,0 +1,66 @@
+# Los tests corren contra TEST_DATABASE_URL (ej: mysql+pymysql://.../turnero_test) o, si no está,
+# contra un SQLite temporal. El esquema se crea desde los modelos, así que incluye los índices de app/models.
+import os
+import tempfile
+
+os.environ["DATABASE_URL"] = os.getenv(
+    "TEST_DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'turnero_test.db')}"
+)
+
+import pytest
+from sqlalchemy import event
+
+import app.models  # noqa: F401  (registra todas las tablas en Base.metadata)
+from app.database import Base, engine, SessionLocal
+from app.models.estado_turno_model import EstadoTurno
+from app.services import bloqueos_cache, bloqueos_recurrentes_service, horarios_service, rbac_service
+from app.services.estados_turno_service import refrescar_estados_turno
+
+ESTADOS = ("RESERVADO", "CONFIRMADO", "CANCELADO", "NO_ASISTIO", "COMPLETADO")
+
+
+@pytest.fixture
+def db():
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    # los caches en memoria son por proceso: los ids y versiones se repiten entre tests con la base recreada
+    for modulo in (bloqueos_cache, bloqueos_recurrentes_service, horarios_service, rbac_service):
+        modulo._cache.clear()
+    sesion = SessionLocal()
+    sesion.add_all([EstadoTurno(id=i, codigo=c, descripcion=c.title()) for i, c in enumerate(ESTADOS, start=1)])
+    sesion.commit()
+    refrescar_estados_turno(sesion)
+    try:
+        yield sesion
+    finally:
+        sesion.close()
+
+
+class SentenciasSQL:
+    """
+    Junta las sentencias que se ejecutan contra `engine` mientras está activo (after_cursor_execute).
+    """
+    def __init__(self):
+        self.sentencias: list[tuple[str, object]] = []
+
+    def _registrar(self, conn, cursor, statement, parameters, context, executemany):
+        self.sentencias.append((statement, parameters))
+
+    def __enter__(self):
+        event.listen(engine, "after_cursor_execute", self._registrar)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(engine, "after_cursor_execute", self._registrar)
+
+    @property
+    def cantidad(self) -> int:
+        return len(self.sentencias)
+
+    def selects(self) -> list[tuple[str, object]]:
+        return [(s, p) for s, p in self.sentencias if s.lstrip().upper().startswith("SELECT")]
+
+
+@pytest.fixture
+def capturar_sql():
+    return SentenciasSQL
@@ -0,0 +1,11 @@
+# Latencia del poll de la cola a medida que crece el historial (ver benchmarks/cola_notificaciones.py,
+# que corre lo mismo hasta 10M filas). Acá alcanza con dos tamaños para que el test sea rápido.
+from benchmarks.cola_notificaciones import medir, FACTOR_MAX
+
+
+def test_latencia_del_poll_no_depende_del_historial(db):
+    (chico, ms_chico), (grande, ms_grande) = medir(db, (10_000, 200_000))
+
+    assert ms_grande <= ms_chico * FACTOR_MAX, (
+        f"poll con {grande} filas: {ms_grande:.3f} ms; con {chico}: {ms_chico:.3f} ms"
+    )
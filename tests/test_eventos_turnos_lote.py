@@ -0,0 +1,161 @@
+# Transiciones en bloque (aplicar_evento_turnos_lote) y el job que vence reservas / marca ausentes
+# (app/scheduler._procesar_turnos_sistema).
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+
+from app import scheduler
+from app.database import SessionLocal
+from app.models.notificacion_model import Notificacion
+from app.models.paciente_model import Paciente
+from app.models.profesional_model import Profesional
+from app.models.turno_model import Turno
+from app.services.estados_turno_service import codigo_por_estado_id, estado_id_por_codigo
+from app.services.turnos_service import (
+    EVENTO_CANCELAR,
+    EVENTO_NO_ASISTIO,
+    EVENTO_VENCER,
+    aplicar_evento_turnos_lote,
+)
+
+INICIO = datetime(2030, 3, 4, 10, 0)
+
+
+@pytest.fixture
+def crear_turnos(db):
+    profesional = Profesional(nombre="Ana", especialidad="Kinesiología")
+    paciente = Paciente(nombre="Juan", nombre_normalizado="juan", telefono="1", canal_contacto="whatsapp")
+    db.add_all([profesional, paciente])
+    db.commit()
+
+    def _crear(*estados: str, inicio: datetime = INICIO, creado_en: datetime | None = None) -> list[int]:
+        turnos = [
+            Turno(
+                paciente_id=paciente.id,
+                profesional_id=profesional.id,
+                estado_id=estado_id_por_codigo(db, estado),
+                fecha_hora_inicio=inicio + timedelta(hours=i),
+                fecha_hora_fin=inicio + timedelta(hours=i, minutes=45),
+                creado_en=creado_en or datetime.utcnow(),
+            )
+            for i, estado in enumerate(estados)
+        ]
+        db.add_all(turnos)
+        db.commit()
+        return [t.id for t in turnos]
+
+    return _crear
+
+
+def _estados(db, ids: list[int]) -> list[str]:
+    db.expire_all()
+    return [codigo_por_estado_id(db, db.get(Turno, i).estado_id) for i in ids]
+
+
+def _notificaciones(db, tipo: str, estado: str | None = None) -> dict[int, int]:
+    consulta = select(Notificacion.turno_id, func.count()).where(Notificacion.tipo == tipo).group_by(Notificacion.turno_id)
+    if estado:
+        consulta = consulta.where(Notificacion.estado == estado)
+    return dict(db.execute(consulta).all())
+
+
+def _pendiente(turno_id: int, paciente_id: int, tipo: str) -> Notificacion:
+    return Notificacion(
+        turno_id=turno_id, paciente_id=paciente_id, canal="whatsapp", tipo=tipo, mensaje="x",
+        programada_para=INICIO, estado="PENDIENTE", intentos=0, dedupe_key=f"turno:{turno_id}:{tipo}",
+    )
+
+
+def test_omite_transiciones_ilegales_y_cuenta_bien(db, crear_turnos):
+    ids = crear_turnos("RESERVADO", "CONFIRMADO", "CANCELADO", "COMPLETADO")
+
+    resultado = aplicar_evento_turnos_lote(db, ids + [999_999], EVENTO_CANCELAR, actor="sistema")
+
+    assert resultado == {"lote": 5, "actualizados": 2, "omitidos": 3}
+    assert _estados(db, ids) == ["CANCELADO", "CANCELADO", "CANCELADO", "COMPLETADO"]
+
+
+def test_evento_desconocido(db, crear_turnos):
+    with pytest.raises(HTTPException) as e:
+        aplicar_evento_turnos_lote(db, crear_turnos("RESERVADO"), "inventado")
+    assert e.value.status_code == 400
+
+
+def test_cancelar_encola_una_notificacion_por_turno(db, crear_turnos):
+    ids = crear_turnos("RESERVADO", "CONFIRMADO", "RESERVADO")
+    paciente_id = db.get(Turno, ids[0]).paciente_id
+    db.add_all([_pendiente(ids[0], paciente_id, "SOLICITUD_CONFIRMACION"), _pendiente(ids[1], paciente_id, "RECORDATORIO_24H")])
+    db.commit()
+
+    aplicar_evento_turnos_lote(db, ids, EVENTO_CANCELAR)
+    # repetir el evento no vuelve a encolar: ya no hay transición válida y dedupe_key evita duplicados
+    aplicar_evento_turnos_lote(db, ids, EVENTO_CANCELAR)
+
+    assert _notificaciones(db, "CANCELACION") == {i: 1 for i in ids}
+    assert _notificaciones(db, "SOLICITUD_CONFIRMACION", "CANCELADA") == {ids[0]: 1}
+    assert _notificaciones(db, "RECORDATORIO_24H", "CANCELADA") == {ids[1]: 1}
+
+
+def test_no_asistio_cancela_pendientes_sin_encolar(db, crear_turnos):
+    ids = crear_turnos("CONFIRMADO", "CONFIRMADO")
+    paciente_id = db.get(Turno, ids[0]).paciente_id
+    db.add_all([_pendiente(i, paciente_id, "RECORDATORIO_2H") for i in ids])
+    db.commit()
+
+    resultado = aplicar_evento_turnos_lote(db, ids, EVENTO_NO_ASISTIO)
+
+    assert resultado["actualizados"] == 2
+    assert _notificaciones(db, "RECORDATORIO_2H", "CANCELADA") == {i: 1 for i in ids}
+    assert db.scalar(select(func.count()).select_from(Notificacion).where(Notificacion.estado == "PENDIENTE")) == 0
+
+
+def test_saltea_turnos_bloqueados_por_otra_transaccion(db, crear_turnos):
+    if db.get_bind().dialect.name != "mysql":
+        pytest.skip("SKIP LOCKED necesita MySQL")
+    ids = crear_turnos("RESERVADO", "RESERVADO")
+
+    otra = SessionLocal()
+    try:
+        otra.execute(select(Turno.id).where(Turno.id == ids[0]).with_for_update())
+
+        resultado = aplicar_evento_turnos_lote(db, ids, EVENTO_CANCELAR)
+    finally:
+        otra.rollback()
+        otra.close()
+
+    assert resultado == {"lote": 2, "actualizados": 1, "omitidos": 1}
+    assert _estados(db, ids) == ["RESERVADO", "CANCELADO"]
+
+
+def test_job_vence_reservas_y_marca_ausentes_por_lotes(db, crear_turnos, monkeypatch):
+    viejo = datetime.utcnow() - timedelta(minutes=scheduler.TTL_RESERVA_MIN + 5)
+    vencidas = crear_turnos("RESERVADO", "RESERVADO", "RESERVADO", creado_en=viejo)
+    frescas = crear_turnos("RESERVADO", inicio=INICIO + timedelta(days=1))
+    ausentes = crear_turnos("CONFIRMADO", "CONFIRMADO", inicio=datetime.utcnow() - timedelta(days=1))
+    monkeypatch.setattr(scheduler, "TAMANIO_LOTE", 2)
+
+    assert scheduler._procesar_turnos_sistema() == 5
+
+    assert _estados(db, vencidas) == ["CANCELADO"] * 3
+    assert _estados(db, frescas) == ["RESERVADO"]
+    assert _estados(db, ausentes) == ["NO_ASISTIO"] * 2
+
+
+def test_job_sigue_con_los_lotes_siguientes_si_uno_falla(db, crear_turnos, monkeypatch):
+    viejo = datetime.utcnow() - timedelta(minutes=scheduler.TTL_RESERVA_MIN + 5)
+    ids = crear_turnos("RESERVADO", "RESERVADO", "RESERVADO", creado_en=viejo)
+    monkeypatch.setattr(scheduler, "TAMANIO_LOTE", 1)
+
+    original = scheduler.aplicar_evento_turnos_lote
+
+    def _falla_el_primero(db, lote, evento, **kwargs):
+        if lote == [ids[0]] and evento == EVENTO_VENCER:
+            raise RuntimeError("deadlock")
+        return original(db, lote, evento, **kwargs)
+
+    monkeypatch.setattr(scheduler, "aplicar_evento_turnos_lote", _falla_el_primero)
+
+    assert scheduler._procesar_turnos_sistema() == 2
+    assert _estados(db, ids) == ["RESERVADO", "CANCELADO", "CANCELADO"]
@@ -0,0 +1,36 @@
+# Importación masiva de pacientes (app/services/pacientes_import_service.py).
+import io
+
+from sqlalchemy import func, select
+
+from app.models.paciente_model import Paciente
+from app.services.pacientes_import_service import importar_pacientes
+
+ENCABEZADO = "nombre,dni,cuil,telefono,canal_contacto\n"
+
+
+def _csv(filas: int, desde: int = 0) -> str:
+    return "".join(f"Paciente {n},{30_000_000 + n},,11{n:08d},whatsapp\n" for n in range(desde, desde + filas))
+
+
+def test_bytes_no_utf8_a_mitad_de_archivo_devuelve_reporte_parcial(db):
+    # más de un bloque del decoder (8 KiB) de filas válidas antes de los bytes inválidos
+    validos = (ENCABEZADO + _csv(400)).encode("utf-8")
+    crudo = validos + "Peña,99999999,,1100000000,sms\n".encode("latin-1") + _csv(10, desde=400).encode("utf-8")
+    texto = io.TextIOWrapper(io.BytesIO(crudo), encoding="utf-8-sig", newline="")
+
+    resultado = importar_pacientes(db, texto, "csv", tamanio_chunk=100)
+
+    assert resultado["error"] and "UTF-8" in resultado["error"]
+    assert 0 < resultado["insertadas"] == resultado["procesadas"] < 400
+    assert resultado["rechazadas"] == 0
+    assert db.scalar(select(func.count()).select_from(Paciente)) == resultado["insertadas"]
+
+
+def test_archivo_completo_sin_error(db):
+    texto = io.StringIO(ENCABEZADO + _csv(5))
+
+    resultado = importar_pacientes(db, texto, "csv")
+
+    assert resultado["error"] is None
+    assert resultado["insertadas"] == 5
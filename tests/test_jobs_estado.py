@@ -0,0 +1,95 @@
+# Métricas de los jobs periódicos (jobs_estado_service) y GET /ready.
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import delete
+
+from app.models.job_estado_model import JobEstado
+from app.services.jobs_estado_service import (
+    FACTOR_ATRASO,
+    estado_jobs,
+    estado_ready,
+    registrar_corrida,
+    registrar_salteada,
+)
+
+AHORA = datetime(2030, 1, 1, 12)
+
+
+def _corrida(db, job_id: str = "notificaciones", *, inicio: datetime = AHORA, error: str | None = None, intervalo_seg: int = 30):
+    registrar_corrida(
+        db, job_id, instancia="w1", intervalo_seg=intervalo_seg, inicio=inicio,
+        duracion_seg=1.5, filas=10, lag_seg=0.25, error=error,
+    )
+
+
+def _estado(db, job_id: str = "notificaciones") -> dict:
+    return {j["job_id"]: j for j in estado_jobs(db, AHORA)}[job_id]
+
+
+def test_contadores(db):
+    _corrida(db)
+    _corrida(db, error="RuntimeError: se cayó el gateway")
+    _corrida(db)
+    registrar_salteada(db, "notificaciones", superpuesta=True)
+    registrar_salteada(db, "notificaciones", superpuesta=True)
+    registrar_salteada(db, "notificaciones", superpuesta=False)
+
+    estado = _estado(db)
+    assert (estado["corridas"], estado["errores"], estado["superpuestas"], estado["perdidas"]) == (3, 1, 2, 1)
+    assert (estado["ultima_duracion_ms"], estado["ultimas_filas"], estado["ultimo_lag_ms"]) == (1500, 10, 250)
+    assert estado["ultimo_error"] == "RuntimeError: se cayó el gateway"
+    assert estado["ultimo_exito_en"] == AHORA + timedelta(seconds=1.5)
+
+
+def test_salteada_antes_de_la_primera_corrida(db):
+    registrar_salteada(db, "turnos_sistema", superpuesta=False)
+
+    assert _estado(db, "turnos_sistema")["perdidas"] == 1
+
+
+def test_fila_borrada_se_vuelve_a_crear(db):
+    _corrida(db)
+    db.execute(delete(JobEstado))
+    db.commit()
+
+    _corrida(db)
+
+    assert _estado(db)["corridas"] == 1
+
+
+def test_atrasado(db):
+    limite = timedelta(seconds=FACTOR_ATRASO * 30)
+    _corrida(db, "al_dia", inicio=AHORA - limite + timedelta(seconds=10))
+    _corrida(db, "atrasado", inicio=AHORA - limite - timedelta(seconds=10))
+    _corrida(db, "sin_exitos", error="RuntimeError: x")
+
+    assert {j["job_id"]: j["atrasado"] for j in estado_jobs(db, AHORA)} == {
+        "al_dia": False,
+        "atrasado": True,
+        "sin_exitos": True,
+    }
+
+
+def test_ready_503_con_un_job_atrasado(db):
+    _corrida(db, "al_dia")
+    assert estado_ready(db, AHORA)[0] == 200
+
+    _corrida(db, "atrasado", inicio=AHORA - timedelta(hours=1))
+    status, cuerpo = estado_ready(db, AHORA)
+
+    assert status == 503
+    assert cuerpo["status"] == "degradado"
+    assert cuerpo["jobs_atrasados"] == ["atrasado"]
+
+
+def test_endpoint_ready(db):
+    pytest.importorskip("multipart")  # app.main registra endpoints con formularios
+    from app.main import readiness
+
+    registrar_corrida(
+        db, "notificaciones", instancia="w1", intervalo_seg=30, inicio=datetime.utcnow() - timedelta(hours=1),
+        duracion_seg=1, filas=0, lag_seg=None,
+    )
+
+    assert readiness().status_code == 503
@@ -0,0 +1,47 @@
+# El lease con que el despachador reclama un lote tiene que durar más que el peor caso del envío
+# (app/notificaciones_scheduler.lease_para).
+from datetime import datetime, timedelta
+
+from app.models.notificacion_model import Notificacion
+from app.models.paciente_model import Paciente
+from app.notificaciones_scheduler import lease_para
+from app.services.notificaciones_service import LEASE_ENVIO_SEG, reclamar_notificaciones
+from app.services.proveedores_notificacion import ProveedorConsola
+
+
+def test_lease_cubre_un_lote_con_todos_los_envios_en_timeout():
+    proveedor = ProveedorConsola("sms", max_concurrencia=4, timeout_seg=30)
+
+    # 200 mensajes de a 4 que agotan los 30 s: 1500 s, muy por encima del mínimo
+    assert lease_para(proveedor, 200) > 1500
+
+
+def test_lease_suma_la_espera_del_limitador_de_tasa():
+    sin_tasa = ProveedorConsola("sms", max_concurrencia=4, timeout_seg=10)
+    con_tasa = ProveedorConsola("sms", max_concurrencia=4, timeout_seg=10, tasa_por_segundo=1)
+
+    assert lease_para(con_tasa, 200) - lease_para(sin_tasa, 200) == 200
+
+
+def test_lote_chico_usa_el_lease_minimo():
+    proveedor = ProveedorConsola("sms", max_concurrencia=4, timeout_seg=1)
+
+    assert lease_para(proveedor, 4) == LEASE_ENVIO_SEG
+
+
+def test_reclamar_usa_el_lease_pedido(db):
+    paciente = Paciente(nombre="Juan", nombre_normalizado="juan", telefono="1", canal_contacto="sms")
+    db.add(paciente)
+    db.commit()
+    ahora = datetime(2030, 1, 1, 12)
+    db.add(Notificacion(
+        paciente_id=paciente.id, canal="sms", tipo="RECORDATORIO", mensaje="hola",
+        programada_para=ahora, estado="PENDIENTE", intentos=0, dedupe_key="test:lease",
+    ))
+    db.commit()
+
+    [fila] = reclamar_notificaciones(db, ahora, worker_id="w1", lease_seg=1800, canal="sms")
+
+    assert db.get(Notificacion, fila.id).reclamada_hasta == ahora + timedelta(seconds=1800)
+    # dentro del lease nadie más la toma
+    assert reclamar_notificaciones(db, ahora + timedelta(seconds=1700), worker_id="w2", canal="sms") == []
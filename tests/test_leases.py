@@ -0,0 +1,29 @@
+# Leases del scheduler (app/services/leases_service.py): vencimiento con el reloj de la base.
+from datetime import timedelta
+
+from sqlalchemy import select, update
+
+from app.models.lease_scheduler_model import LeaseScheduler
+from app.services.leases_service import adquirir_lease, ahora_db_mas, liberar_lease
+
+
+def test_vence_con_el_reloj_de_la_base(db):
+    antes = db.scalar(select(ahora_db_mas(0)))
+    assert adquirir_lease(db, "scheduler", "a", 30)
+    despues = db.scalar(select(ahora_db_mas(0)))
+
+    vence_en = db.scalar(select(LeaseScheduler.vence_en))
+    assert antes + timedelta(seconds=30) <= vence_en <= despues + timedelta(seconds=30)
+
+
+def test_solo_se_toma_vencido_o_liberado(db):
+    assert adquirir_lease(db, "scheduler", "a", 30)
+    assert not adquirir_lease(db, "scheduler", "b", 30)
+    assert adquirir_lease(db, "scheduler", "a", 30)  # renovar
+
+    db.execute(update(LeaseScheduler).values(vence_en=ahora_db_mas(-1)))
+    db.commit()
+    assert adquirir_lease(db, "scheduler", "b", 30)
+
+    liberar_lease(db, "scheduler", "b")
+    assert adquirir_lease(db, "scheduler", "a", 30)
@@ -0,0 +1,20 @@
+# Backfill de pacientes.nombre_normalizado (app/normalizar_nombres_pacientes.py).
+from sqlalchemy import select
+
+from app.models.paciente_model import Paciente
+from app.normalizar_nombres_pacientes import normalizar_nombres
+from app.services.pacientes_service import normalizar_nombre
+
+NOMBRES = ("  José  María Pérez-Gómez ", "O'Brien, Ñandú", "ANA", "Lucía D.", "María  José")
+
+
+def test_backfill_coincide_con_normalizar_nombre(db):
+    db.add_all([Paciente(nombre=n, telefono=str(i)) for i, n in enumerate(NOMBRES)])
+    db.add(Paciente(nombre="Zoë", nombre_normalizado="zoë", telefono="9"))  # como lo dejaba el LOWER() de 005
+    db.commit()
+
+    assert normalizar_nombres(db, tamanio_lote=2) == len(NOMBRES) + 1
+    for nombre, normalizado in db.execute(select(Paciente.nombre, Paciente.nombre_normalizado)).all():
+        assert normalizado == normalizar_nombre(nombre)
+
+    assert normalizar_nombres(db) == 0
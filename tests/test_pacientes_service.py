@@ -0,0 +1,70 @@
+# Alta y edición de pacientes: los routers sync y async comparten la lógica de pacientes_service.
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from app.database import engine
+from app.schemas.paciente_schema import PacienteCreate, PacienteUpdate
+from app.services.pacientes_service import (
+    crear_paciente,
+    editar_paciente,
+    crear_paciente_async,
+    editar_paciente_async,
+    obtener_paciente_async,
+)
+
+NUEVO = PacienteCreate(nombre="José Pérez-Gómez", telefono="1", canal_contacto="whatsapp")
+CAMBIO = PacienteUpdate(nombre="María  Ñandú")
+
+
+def _correr_async(funcion):
+    # mismo archivo SQLite (o la misma base MySQL) que la sesión sync, con el driver async
+    url = engine.url
+    if url.get_backend_name() != "sqlite":
+        pytest.skip("el test async corre solo contra SQLite (aiosqlite)")
+    pytest.importorskip("aiosqlite")
+
+    async def _correr():
+        motor = create_async_engine(url.set(drivername="sqlite+aiosqlite"))
+        try:
+            async with async_sessionmaker(bind=motor, expire_on_commit=False)() as db:
+                return await funcion(db)
+        finally:
+            await motor.dispose()
+
+    return asyncio.run(_correr())
+
+
+def test_sync_y_async_normalizan_igual(db):
+    sync = editar_paciente(db, crear_paciente(db, NUEVO).id, CAMBIO)
+
+    async def _crear_y_editar(adb):
+        creado = await crear_paciente_async(adb, NUEVO.model_copy(update={"telefono": "2"}))
+        return await editar_paciente_async(adb, creado.id, CAMBIO)
+
+    asincrono = _correr_async(_crear_y_editar)
+
+    assert sync.nombre_normalizado == "maria nandu"
+    db.expire_all()
+    assert editar_paciente(db, asincrono.id, PacienteUpdate(telefono="3")).nombre_normalizado == sync.nombre_normalizado
+
+
+def test_errores_iguales(db):
+    with pytest.raises(HTTPException) as sync:
+        editar_paciente(db, crear_paciente(db, NUEVO).id, PacienteUpdate())
+
+    async def _vacio(adb):
+        return await editar_paciente_async(adb, 1, PacienteUpdate())
+
+    with pytest.raises(HTTPException) as asincrono:
+        _correr_async(_vacio)
+    assert (sync.value.status_code, sync.value.detail) == (asincrono.value.status_code, asincrono.value.detail)
+
+    async def _inexistente(adb):
+        return await obtener_paciente_async(adb, 999)
+
+    with pytest.raises(HTTPException) as no_existe:
+        _correr_async(_inexistente)
+    assert no_existe.value.status_code == 404
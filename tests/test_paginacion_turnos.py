@@ -0,0 +1,153 @@
+# Paginación por cursor (keyset sobre fecha_hora_inicio, id) y exportación en streaming de turnos.
+import asyncio
+import json
+from datetime import datetime, timedelta
+from itertools import cycle
+
+import pytest
+from fastapi import HTTPException, Request
+from sqlalchemy.orm import sessionmaker
+
+from app import database
+
+from app.api.turnos_router import exportar_turnos
+from app.models.paciente_model import Paciente
+from app.models.profesional_model import Profesional
+from app.models.turno_model import Turno
+from app.models.usuario_model import Usuario
+from app.services.rbac_service import UsuarioAutenticado
+from app.services.turnos_service import codificar_cursor, decodificar_cursor, pagina_turnos
+
+INICIO = datetime(2030, 3, 4, 9, 0)
+FILTROS = {"profesional_id": None, "paciente_id": None, "desde": None, "hasta": None, "solo_activos": False}
+
+
+@pytest.fixture
+def turnos(db):
+    # 5 profesionales y 5 pacientes: 5 turnos por horario con el mismo fecha_hora_inicio
+    profesionales = [Profesional(nombre=f"Prof {i}", especialidad="Kinesiología") for i in range(5)]
+    pacientes = [
+        Paciente(nombre=f"Pac {i}", nombre_normalizado=f"pac {i}", telefono=str(i), canal_contacto="whatsapp")
+        for i in range(5)
+    ]
+    usuario = Usuario(username="recepcion", password_hash="x", activo=True)
+    db.add_all([*profesionales, *pacientes, usuario])
+    db.flush()
+    db.add_all([
+        Turno(
+            paciente_id=pacientes[(i + hora) % 5].id,
+            profesional_id=profesional.id,
+            estado_id=1,
+            fecha_hora_inicio=INICIO + timedelta(hours=hora),
+            fecha_hora_fin=INICIO + timedelta(hours=hora, minutes=30),
+            creado_en=INICIO - timedelta(days=1),
+        )
+        for hora in range(3)
+        for i, profesional in enumerate(profesionales)
+    ])
+    db.commit()
+    user = UsuarioAutenticado(id=usuario.id, username=usuario.username, profesional_id=None, perms_map={})
+    orden = [(t.fecha_hora_inicio, t.id) for t in db.query(Turno).order_by(Turno.fecha_hora_inicio, Turno.id)]
+    return user, [turno_id for _, turno_id in orden]
+
+
+def test_cursor_ida_y_vuelta():
+    inicio = datetime(2030, 3, 4, 9, 30, 15, 250)
+
+    assert decodificar_cursor(codificar_cursor(inicio, 42)) == (inicio, 42)
+    assert "=" not in codificar_cursor(inicio, 42)  # va en la query string
+
+
+@pytest.mark.parametrize("cursor", ["no-es-base64!", "bm8tc2VwYXJhZG9y", codificar_cursor(INICIO, 1)[:-4], "fHg"])
+def test_cursor_malformado_da_400(cursor):
+    with pytest.raises(HTTPException) as e:
+        decodificar_cursor(cursor)
+    assert e.value.status_code == 400
+
+
+@pytest.mark.parametrize("limit", [1, 3, 5, 7])
+def test_paginas_sin_repetir_ni_saltear_con_inicios_iguales(db, turnos, limit):
+    user, esperados = turnos
+
+    vistos, cursor = [], None
+    while True:
+        items, cursor = pagina_turnos(db, limit=limit, cursor=cursor, user=user, scope="ANY", **FILTROS)
+        assert len(items) <= limit
+        vistos += [t["id"] for t in items]
+        if cursor is None:
+            break
+
+    assert vistos == esperados
+
+
+def _request(**headers) -> Request:
+    return Request({"type": "http", "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()]})
+
+
+def _exportar(db, user, formato: str, request: Request | None = None) -> tuple[str, str]:
+    respuesta = exportar_turnos(request or _request(), db=db, formato=formato, user=user, scope="ANY", **FILTROS)
+
+    async def _leer():
+        return "".join([parte async for parte in respuesta.body_iterator])
+
+    return respuesta.media_type, asyncio.run(_leer())
+
+
+def test_exportar_ndjson(db, turnos):
+    user, esperados = turnos
+
+    media_type, cuerpo = _exportar(db, user, "ndjson")
+
+    assert media_type == "application/x-ndjson"
+    filas = [json.loads(linea) for linea in cuerpo.splitlines()]
+    assert [f["id"] for f in filas] == esperados
+    assert filas[0]["estado"]["codigo"] == "RESERVADO"
+    assert filas[0]["fecha_hora_inicio"] == INICIO.isoformat()
+
+
+def test_exportar_json(db, turnos):
+    user, esperados = turnos
+
+    media_type, cuerpo = _exportar(db, user, "json")
+
+    assert media_type == "application/json"
+    assert [f["id"] for f in json.loads(cuerpo)] == esperados
+
+
+def test_exportar_json_vacio(db):
+    user = UsuarioAutenticado(id=1, username="x", profesional_id=None, perms_map={})
+
+    assert json.loads(_exportar(db, user, "json")[1]) == []
+
+
+@pytest.fixture
+def replica(monkeypatch):
+    # una "réplica" que apunta a la misma base, para ver qué fábrica usa el stream
+    fabrica = sessionmaker(bind=database.engine, autocommit=False, autoflush=False)
+    usos = []
+
+    def _sesion():
+        usos.append(1)
+        return fabrica()
+
+    monkeypatch.setattr(database, "replica_engines", [database.engine])
+    monkeypatch.setattr(database, "_replicas_ciclo", cycle([_sesion]))
+    return usos
+
+
+def test_exportar_lee_de_la_replica(db, turnos, replica):
+    user, esperados = turnos
+
+    _, cuerpo = _exportar(db, user, "json")
+
+    assert [f["id"] for f in json.loads(cuerpo)] == esperados
+    assert replica == [1]
+
+
+def test_exportar_respeta_el_pin_al_primario(db, turnos, replica):
+    user, esperados = turnos
+
+    _, cuerpo = _exportar(db, user, "json", _request(**{database.HEADER_LEER_PRIMARIO: "1"}))
+
+    assert [f["id"] for f in json.loads(cuerpo)] == esperados
+    assert replica == []
@@ -0,0 +1,159 @@
+# Regresión de planes de consulta: las búsquedas de solapamiento, agenda y bloqueos tienen que ir
+# por los índices de rango (migrations/001_indices_rango_turnos.sql), nunca recorrer la tabla entera.
+# Se carga un historial con la forma de producción (años de turnos ya terminados y pocos activos a futuro)
+# y se corre ANALYZE, para que el optimizador elija con estadísticas y no con sus supuestos por defecto.
+import random
+import re
+from datetime import datetime, timedelta
+
+import pytest
+
+from sqlalchemy import insert, text
+
+from app.database import engine
+from app.models.bloqueo_agenda_model import BloqueoAgenda
+from app.models.paciente_model import Paciente
+from app.models.profesional_model import Profesional
+from app.models.turno_model import Turno
+from app.services.turnos_service import (
+    validar_solapamiento_paciente,
+    validar_solapamiento_profesional,
+    hay_bloqueo_agenda,
+    validar_reserva,
+    query_turnos_filtrados,
+)
+
+INICIO = datetime(2030, 3, 4, 10, 0)
+FIN = INICIO + timedelta(hours=1)
+LIBRE = INICIO.replace(hour=20)  # la agenda cargada va de 8 a 16
+
+_PLAN_SQLITE = re.compile(r"^(SCAN|SEARCH) (\w+)(?: AS \w+)?(?: USING (?:COVERING )?INDEX (\w+))?")
+
+
+def plan(sentencia: str, parametros) -> list[tuple[str, str, str | None]]:
+    """
+    [(acceso, tabla, índice)] con acceso "SCAN" (recorre la tabla o un índice entero) o "SEARCH".
+    """
+    with engine.connect() as conn:
+        if engine.dialect.name == "sqlite":
+            filas = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sentencia}", parametros).all()
+            pasos = []
+            for fila in filas:
+                m = _PLAN_SQLITE.match(fila[-1])
+                if m:
+                    pasos.append((m.group(1), m.group(2), m.group(3)))
+            return pasos
+
+        filas = conn.exec_driver_sql(f"EXPLAIN {sentencia}", parametros).mappings().all()
+        return [
+            ("SCAN" if f["type"] in ("ALL", "index") else "SEARCH", f["table"], f["key"])
+            for f in filas if f["table"]
+        ]
+
+
+def planes_de(capturadas, tabla: str) -> list[tuple[str, str, str | None]]:
+    pasos = []
+    for sentencia, parametros in capturadas.selects():
+        pasos += [p for p in plan(sentencia, parametros) if p[1] == tabla]
+    return pasos
+
+
+PROFESIONALES = 3
+PACIENTES = 30  # pacientes crónicos: cientos de sesiones cada uno a lo largo de los años
+DIAS_HISTORIAL = 730
+TURNOS_POR_DIA = 8
+
+
+@pytest.fixture
+def agenda(db):
+    db.add_all([Profesional(id=i, nombre=f"Prof {i}", especialidad="Kinesiología") for i in range(1, PROFESIONALES + 1)])
+    db.add_all([Paciente(id=i, nombre=f"Pac {i}", nombre_normalizado=f"pac {i}", telefono=str(i)) for i in range(1, PACIENTES + 1)])
+    db.flush()
+
+    # Dos años hacia atrás desde INICIO (COMPLETADO / CANCELADO / NO_ASISTIO) y dos semanas activas hacia adelante.
+    # Cada profesional arranca corrido un minuto para que (paciente, inicio) no se repita.
+    azar = random.Random(2030)
+    filas = []
+    for dia in range(-DIAS_HISTORIAL, 14):
+        for hora in range(TURNOS_POR_DIA):
+            for prof in range(1, PROFESIONALES + 1):
+                inicio = INICIO + timedelta(days=dia, hours=hora - 2, minutes=prof)
+                estado = azar.choice((1, 2)) if dia >= 0 else azar.choice((5, 5, 5, 5, 5, 5, 5, 3, 3, 4))
+                filas.append({
+                    "paciente_id": azar.randint(1, PACIENTES),
+                    "profesional_id": prof,
+                    "estado_id": estado,
+                    "fecha_hora_inicio": inicio,
+                    "fecha_hora_fin": inicio + timedelta(minutes=50),
+                    "creado_en": inicio - timedelta(days=7),
+                })
+    db.execute(insert(Turno), filas)
+    db.execute(insert(BloqueoAgenda), [
+        {
+            "profesional_id": 1 + d % PROFESIONALES,
+            "fecha_hora_inicio": INICIO + timedelta(days=d),
+            "fecha_hora_fin": INICIO + timedelta(days=d, hours=3),
+            "creado_en": INICIO,
+            "activo": d % 4 != 0,
+        }
+        for d in range(-DIAS_HISTORIAL, 14)
+    ])
+    db.commit()
+
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE" if engine.dialect.name == "sqlite" else "ANALYZE TABLE turnos, bloqueos_agenda"))
+
+    return db.get(Profesional, 1), db.get(Paciente, 1)
+
+
+def test_solapamiento_profesional_usa_indice_de_rango(db, agenda, capturar_sql):
+    profesional, _ = agenda
+    with capturar_sql() as sql:
+        validar_solapamiento_profesional(db, profesional.id, INICIO, FIN)
+
+    pasos = planes_de(sql, "turnos")
+    assert pasos and all(acceso == "SEARCH" for acceso, _, _ in pasos), pasos
+    assert {indice for _, _, indice in pasos} == {"idx_turno_prof_estado_rango"}
+
+
+def test_solapamiento_paciente_usa_indice_de_rango(db, agenda, capturar_sql):
+    _, paciente = agenda
+    with capturar_sql() as sql:
+        validar_solapamiento_paciente(db, paciente.id, INICIO, FIN)
+
+    pasos = planes_de(sql, "turnos")
+    assert pasos and all(acceso == "SEARCH" for acceso, _, _ in pasos), pasos
+    assert {indice for _, _, indice in pasos} == {"idx_turno_pac_estado_rango"}
+
+
+def test_bloqueo_agenda_usa_indice_de_rango(db, agenda, capturar_sql):
+    profesional, _ = agenda
+    with capturar_sql() as sql:
+        hay_bloqueo_agenda(db, profesional.id, INICIO, FIN)
+
+    pasos = planes_de(sql, "bloqueos_agenda")
+    assert pasos and all(acceso == "SEARCH" for acceso, _, _ in pasos), pasos
+    assert {indice for _, _, indice in pasos} == {"idx_bloq_prof_activo_rango"}
+
+
+def test_validar_reserva_no_recorre_turnos(db, agenda, capturar_sql):
+    profesional, paciente = agenda
+    with capturar_sql() as sql:
+        validar_reserva(
+            db, paciente_id=paciente.id, profesional_id=profesional.id, inicio=LIBRE, fin=LIBRE + timedelta(hours=1),
+        )
+
+    for tabla in ("turnos", "bloqueos_agenda"):
+        pasos = planes_de(sql, tabla)
+        assert all(acceso == "SEARCH" for acceso, _, _ in pasos), (tabla, pasos)
+
+
+def test_listado_de_agenda_no_recorre_turnos(db, agenda, capturar_sql):
+    profesional, _ = agenda
+    with capturar_sql() as sql:
+        query_turnos_filtrados(
+            db, profesional_id=profesional.id, desde=INICIO, hasta=INICIO + timedelta(days=7), solo_activos=True,
+        ).all()
+
+    pasos = planes_de(sql, "turnos")
+    assert pasos and all(acceso == "SEARCH" for acceso, _, _ in pasos), pasos
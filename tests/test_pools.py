@@ -0,0 +1,86 @@
+# Pools de conexiones (app/database.py): métricas de GET /health/pool y configuración. Los engines se
+# arman al importar el módulo, así que cada configuración se prueba importándolo en un proceso aparte.
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from app.database import PoolInstrumentado, engine, metricas_pools
+
+RAIZ = Path(__file__).resolve().parents[1]
+
+_LEER_CONFIG = """
+import json
+from app import database
+print(json.dumps({
+    "url_async": database.async_engine.url.render_as_string(hide_password=False),
+    "api": [database.engine.pool.size(), database.engine.pool._max_overflow],
+    "async": [database.async_engine.pool.size(), database.async_engine.pool._max_overflow],
+}))
+"""
+
+
+def _config(**entorno) -> dict:
+    pytest.importorskip("aiosqlite")
+    env = {k: v for k, v in os.environ.items() if not k.startswith("DB_")}
+    env.update(DATABASE_URL="sqlite:////tmp/turnero_pools.db", DB_ASYNC_METHOD="sqlite+aiosqlite", **entorno)
+    salida = subprocess.run(
+        [sys.executable, "-c", _LEER_CONFIG], cwd=RAIZ, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(salida.stdout)
+
+
+def test_motor_async_sale_de_database_url():
+    assert _config()["url_async"] == "sqlite+aiosqlite:////tmp/turnero_pools.db"
+
+
+def test_sin_config_propia_sync_y_async_se_reparten_el_pool():
+    config = _config(DB_POOL_SIZE="10", DB_MAX_OVERFLOW="6")
+
+    assert config["api"] == config["async"] == [5, 3]
+
+
+def test_pool_async_propio():
+    config = _config(DB_POOL_SIZE="10", DB_MAX_OVERFLOW="6", DB_ASYNC_POOL_SIZE="4", DB_ASYNC_MAX_OVERFLOW="2")
+
+    assert config["api"] == [10, 6]
+    assert config["async"] == [4, 2]
+
+
+def test_metricas_siguen_las_conexiones_en_uso(db):
+    antes = metricas_pools()["api"]
+
+    with engine.connect() as a, engine.connect() as b:
+        a.execute(text("SELECT 1"))
+        b.execute(text("SELECT 1"))
+        durante = metricas_pools()["api"]
+
+    despues = metricas_pools()["api"]
+    assert durante["en_uso"] == antes["en_uso"] + 2
+    assert durante["checkouts"] == antes["checkouts"] + 2
+    assert despues["en_uso"] == antes["en_uso"]
+
+
+def test_overflow_y_espera_con_el_pool_agotado(tmp_path):
+    motor = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", poolclass=PoolInstrumentado, pool_size=1, max_overflow=1, pool_timeout=0.2,
+    )
+    try:
+        with motor.connect(), motor.connect():
+            metricas = motor.pool.metricas()
+            assert (metricas["en_uso"], metricas["overflow"]) == (2, 1)
+
+            with pytest.raises(exc.TimeoutError):
+                motor.connect()
+
+        metricas = motor.pool.metricas()
+        assert metricas["timeouts"] == 1
+        assert metricas["espera_max_ms"] >= 200
+        assert metricas["checkouts"] == 3
+        assert (metricas["en_uso"], metricas["libres"]) == (0, 1)  # la de overflow se cierra al devolverla
+    finally:
+        motor.dispose()
@@ -0,0 +1,108 @@
+# Invalidación de permisos cacheados y de tokens con permisos: las versiones viven en la base,
+# así que un cambio hecho desde otra sesión (otro worker) se ve en el próximo request de este proceso.
+import pytest
+from sqlalchemy import update
+
+from app.database import SessionLocal
+from app.models.permiso_model import Permiso
+from app.models.rol_model import Rol
+from app.models.rol_permiso_model import RolPermiso
+from app.models.usuario_model import Usuario
+from app.models.version_permisos_model import VersionPermisos
+from app.services import rbac_service
+from app.services.rbac_service import (
+    obtener_usuario_autenticado,
+    invalidar_permisos_usuario,
+    claims_de_permisos,
+    autenticar,
+)
+
+
+@pytest.fixture
+def usuario(db):
+    rbac_service._cache.clear()  # los ids se repiten entre tests (la base se recrea en cada uno)
+    ver = Permiso(codigo="turnos.ver")
+    crear = Permiso(codigo="turnos.crear")
+    recepcion = Rol(nombre="recepcion")
+    admin = Rol(nombre="admin")
+    db.add_all([ver, crear, recepcion, admin, VersionPermisos(id=1, version=0)])
+    db.flush()
+    db.add_all([
+        RolPermiso(rol_id=recepcion.id, permiso_id=ver.id, scope="ANY"),
+        RolPermiso(rol_id=admin.id, permiso_id=crear.id, scope="ANY"),
+    ])
+    u = Usuario(username="ana", password_hash="x", activo=True)
+    u.roles = [recepcion]
+    db.add(u)
+    db.commit()
+    return u.id
+
+
+def _otro_worker():
+    return SessionLocal()
+
+
+def test_cambio_de_roles_en_otro_worker_invalida_el_cache(db, usuario):
+    antes = obtener_usuario_autenticado(db, usuario)
+    assert set(antes.perms_map) == {"turnos.ver"}
+    assert obtener_usuario_autenticado(db, usuario) is antes  # cacheado
+
+    otro = _otro_worker()
+    u = otro.get(Usuario, usuario)
+    u.roles = otro.query(Rol).all()
+    invalidar_permisos_usuario(otro, usuario)
+    otro.commit()
+    otro.close()
+
+    despues = obtener_usuario_autenticado(db, usuario)
+    assert set(despues.perms_map) == {"turnos.ver", "turnos.crear"}
+
+
+def test_cambio_global_invalida_el_cache(db, usuario):
+    antes = obtener_usuario_autenticado(db, usuario)
+
+    otro = _otro_worker()
+    # lo que corre una migración que toca roles/permisos (ver migrations/012_versiones_permisos.sql)
+    otro.execute(update(VersionPermisos).where(VersionPermisos.id == 1).values(version=VersionPermisos.version + 1))
+    otro.commit()
+    otro.close()
+
+    despues = obtener_usuario_autenticado(db, usuario)
+    assert despues is not antes and despues.versiones[0] == antes.versiones[0] + 1
+
+
+def test_usuario_desactivado_deja_de_autenticar(db, usuario):
+    assert obtener_usuario_autenticado(db, usuario) is not None
+
+    otro = _otro_worker()
+    otro.execute(update(Usuario).where(Usuario.id == usuario).values(activo=False))
+    otro.commit()
+    otro.close()
+
+    assert obtener_usuario_autenticado(db, usuario) is None
+
+
+def test_token_con_permisos_se_revoca_al_cambiar_versiones(db, usuario):
+    claims = claims_de_permisos(obtener_usuario_autenticado(db, usuario))
+    assert set(autenticar(db, usuario, claims, permisos_en_token=True).perms_map) == {"turnos.ver"}
+
+    otro = _otro_worker()
+    u = otro.get(Usuario, usuario)
+    u.roles = []
+    invalidar_permisos_usuario(otro, usuario)
+    otro.commit()
+    otro.close()
+
+    # el token viejo ya no se usa: se recompila desde la base
+    assert autenticar(db, usuario, claims, permisos_en_token=True).perms_map == {}
+
+
+def test_token_con_permisos_de_usuario_desactivado_no_autentica(db, usuario):
+    claims = claims_de_permisos(obtener_usuario_autenticado(db, usuario))
+
+    otro = _otro_worker()
+    otro.execute(update(Usuario).where(Usuario.id == usuario).values(activo=False))
+    otro.commit()
+    otro.close()
+
+    assert autenticar(db, usuario, claims, permisos_en_token=True) is None
@@ -0,0 +1,116 @@
+# Reintentos de la cola de notificaciones: backoff exponencial con tope, dead letter (FALLIDA) y reencolado.
+import itertools
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.notificacion_model import Notificacion
+from app.models.paciente_model import Paciente
+from app.services import notificaciones_service
+from app.services.notificaciones_service import (
+    BACKOFF_BASE_SEG,
+    BACKOFF_MAX_SEG,
+    MAX_INTENTOS,
+    _backoff_seg,
+    reclamar_notificaciones,
+    reencolar_notificaciones,
+    registrar_resultados_envio,
+)
+
+AHORA = datetime(2030, 1, 1, 12)
+
+
+@pytest.fixture
+def sin_jitter(monkeypatch):
+    monkeypatch.setattr(notificaciones_service.random, "uniform", lambda a, b: b)
+
+
+@pytest.fixture
+def encolar(db):
+    paciente = Paciente(nombre="Juan", nombre_normalizado="juan", telefono="1", canal_contacto="sms")
+    db.add(paciente)
+    db.commit()
+    claves = itertools.count()
+
+    def _encolar(n: int = 1, **valores) -> list[int]:
+        notificaciones = [
+            Notificacion(
+                paciente_id=paciente.id, canal="sms", tipo="RECORDATORIO", mensaje="hola",
+                programada_para=AHORA, dedupe_key=f"test:{next(claves)}",
+                **{"estado": "PENDIENTE", "intentos": 0, **valores},
+            )
+            for _ in range(n)
+        ]
+        db.add_all(notificaciones)
+        db.commit()
+        return [x.id for x in notificaciones]
+
+    return _encolar
+
+
+def test_backoff_se_duplica_hasta_el_tope(sin_jitter):
+    esperas = [_backoff_seg(intentos) for intentos in range(1, 20)]
+
+    assert esperas[:3] == [BACKOFF_BASE_SEG, 2 * BACKOFF_BASE_SEG, 4 * BACKOFF_BASE_SEG]
+    assert max(esperas) == esperas[-1] == BACKOFF_MAX_SEG
+    assert esperas == sorted(esperas)
+
+
+def test_jitter_entre_la_mitad_y_la_espera_completa():
+    esperas = [_backoff_seg(3) for _ in range(200)]
+
+    assert all(2 * BACKOFF_BASE_SEG <= e <= 4 * BACKOFF_BASE_SEG for e in esperas)
+    assert len(set(esperas)) > 1
+
+
+def test_fallo_reprograma_con_backoff(db, encolar, sin_jitter):
+    [nid] = encolar()
+    reclamar_notificaciones(db, AHORA, worker_id="w1", canal="sms")
+    antes = datetime.utcnow()
+
+    registrar_resultados_envio(db, [{"id": nid, "ok": False, "error": "timeout"}], "w1")
+
+    n = db.get(Notificacion, nid)
+    assert (n.estado, n.intentos, n.ultimo_error, n.reclamada_por) == ("PENDIENTE", 1, "timeout", None)
+    assert n.programada_para >= antes + timedelta(seconds=BACKOFF_BASE_SEG)
+
+
+def test_ultimo_intento_fallido_pasa_a_fallida(db, encolar):
+    [nid] = encolar(intentos=MAX_INTENTOS - 1)
+    reclamar_notificaciones(db, AHORA, worker_id="w1", canal="sms")
+
+    registrar_resultados_envio(db, [{"id": nid, "ok": False, "error": "rechazado"}], "w1")
+
+    n = db.get(Notificacion, nid)
+    assert (n.estado, n.intentos, n.ultimo_error) == ("FALLIDA", MAX_INTENTOS, "rechazado")
+
+
+def test_agotadas_sin_resultado_pasan_a_fallida_al_reclamar(db, encolar):
+    # el worker reclamó el último intento y se cayó: vencido el lease, el próximo reclamo la da por fallida
+    agotadas = encolar(2, intentos=MAX_INTENTOS, reclamada_por="caido", reclamada_hasta=AHORA - timedelta(seconds=1))
+    en_lease = encolar(intentos=MAX_INTENTOS, reclamada_por="vivo", reclamada_hasta=AHORA + timedelta(seconds=60))
+    vivas = encolar()
+
+    filas = reclamar_notificaciones(db, AHORA, worker_id="w1", canal="sms")
+
+    assert [f.id for f in filas] == vivas
+    db.expire_all()
+    assert {db.get(Notificacion, i).estado for i in agotadas} == {"FALLIDA"}
+    assert all(db.get(Notificacion, i).ultimo_error for i in agotadas)
+    assert db.get(Notificacion, en_lease[0]).estado == "PENDIENTE"
+
+
+def test_reencolar_reinicia_intentos(db, encolar):
+    fallidas = encolar(2, estado="FALLIDA", intentos=MAX_INTENTOS, ultimo_error="rechazado")
+    agotada = encolar(intentos=MAX_INTENTOS)
+    enviada = encolar(estado="ENVIADA", intentos=1)
+
+    assert reencolar_notificaciones(db, fallidas + agotada + enviada) == 3
+
+    db.expire_all()
+    for nid in fallidas + agotada:
+        n = db.get(Notificacion, nid)
+        assert (n.estado, n.intentos, n.reclamada_por) == ("PENDIENTE", 0, None)
+    assert db.get(Notificacion, enviada[0]).estado == "ENVIADA"
+    # vuelven a la cola: el próximo reclamo las toma
+    assert len(reclamar_notificaciones(db, datetime.utcnow(), worker_id="w1", canal="sms")) == 3
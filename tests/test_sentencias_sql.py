@@ -0,0 +1,193 @@
+# Cantidad de sentencias SQL por endpoint (perfiles de carga, ver app/services/perfiles_carga.py).
+# Se llama al handler con las dependencias ya resueltas y se serializa con su response_model, que es
+# donde aparecerían las cargas lazy; la autenticación (get_current_user) queda afuera de la cuenta.
+# Los listados se miden con varios turnos para detectar N+1: el presupuesto no depende de cuántos haya.
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.api.bloqueos_agenda_router import obtener_bloqueos_agenda, obtener_bloqueo_por_id
+from app.api.turnos_router import (
+    crear_turno,
+    crear_turnos_en_lote,
+    obtener_turnos,
+    obtener_turnos_paginados,
+    obtener_turno_por_id,
+    confirmar_turno,
+    cancelar_turno,
+)
+from app.models.bloqueo_agenda_model import BloqueoAgenda
+from app.models.paciente_model import Paciente
+from app.models.profesional_model import Profesional
+from app.models.turno_model import Turno
+from app.models.usuario_model import Usuario
+from app.schemas.bloqueo_agenda_schema import BloqueoAgendaOut
+from app.schemas.turno_schema import SlotTurno, TurnoCreate, TurnoLoteCreate, TurnoLoteOut, TurnoOut, TurnoPaginaOut
+from app.services.rbac_service import UsuarioAutenticado
+from app.services.turnos_service import validar_reserva
+
+LUNES = datetime(2030, 3, 4, 9, 0)
+TURNOS = 12
+
+
+@pytest.fixture
+def datos(db):
+    usuario = Usuario(username="recepcion", password_hash="x", activo=True)
+    profesional = Profesional(nombre="Ana", especialidad="Kinesiología", duracion_turno_min=30)
+    pacientes = [
+        Paciente(nombre=f"Pac {i}", nombre_normalizado=f"pac {i}", telefono=str(i), canal_contacto="whatsapp")
+        for i in range(TURNOS + 1)
+    ]
+    db.add_all([usuario, profesional, *pacientes])
+    db.flush()
+    turnos = [
+        Turno(
+            paciente_id=pacientes[i].id,
+            profesional_id=profesional.id,
+            estado_id=1,
+            fecha_hora_inicio=LUNES + timedelta(hours=i),
+            fecha_hora_fin=LUNES + timedelta(hours=i, minutes=30),
+            creado_en=LUNES - timedelta(days=1),
+            creado_por_usuario_id=usuario.id,
+            actualizado_por_usuario_id=usuario.id,
+        )
+        for i in range(TURNOS)
+    ]
+    bloqueos = [
+        BloqueoAgenda(
+            profesional_id=profesional.id,
+            fecha_hora_inicio=LUNES + timedelta(days=d),
+            fecha_hora_fin=LUNES + timedelta(days=d, hours=1),
+            creado_en=LUNES,
+            creado_por_usuario_id=usuario.id,
+            activo=True,
+        )
+        for d in range(1, 6)
+    ]
+    db.add_all(turnos + bloqueos)
+    db.commit()
+    user = UsuarioAutenticado(id=usuario.id, username=usuario.username, profesional_id=None, perms_map={})
+    ids = {
+        "profesional": profesional.id,
+        "paciente_libre": pacientes[-1].id,
+        "turno": turnos[0].id,
+        "bloqueo": bloqueos[0].id,
+    }
+    db.expunge_all()  # cada endpoint arranca con la sesión vacía, como en un request
+    return user, ids
+
+
+def _calentar_caches(db, ids):
+    # horario y reglas recurrentes en memoria (se recargan solo cuando cambia agenda_version): régimen estable
+    validar_reserva(
+        db, paciente_id=ids["paciente_libre"], profesional_id=ids["profesional"],
+        inicio=LUNES + timedelta(weeks=50), fin=LUNES + timedelta(weeks=50, minutes=30),
+    )
+
+
+def _contar(capturar_sql, db, llamada, serializar) -> int:
+    db.expunge_all()
+    with capturar_sql() as sql:
+        serializar(llamada())
+    return sql.cantidad
+
+
+def test_get_turnos(db, datos, capturar_sql):
+    user, ids = datos
+    n = _contar(capturar_sql, db, lambda: obtener_turnos(
+        db=db, profesional_id=ids["profesional"], paciente_id=None, desde=None, hasta=None,
+        solo_activos=True, limit=200, user=user, scope="ANY",
+    ), lambda turnos: [TurnoOut.model_validate(t) for t in turnos])
+    assert n == 1
+
+
+def test_get_turnos_pagina(db, datos, capturar_sql):
+    user, ids = datos
+    n = _contar(capturar_sql, db, lambda: obtener_turnos_paginados(
+        db=db, profesional_id=ids["profesional"], paciente_id=None, desde=None, hasta=None,
+        solo_activos=False, cursor=None, limit=5, user=user, scope="ANY",
+    ), TurnoPaginaOut.model_validate)
+    assert n == 1
+
+
+def test_get_turno_por_id(db, datos, capturar_sql):
+    user, ids = datos
+    n = _contar(capturar_sql, db, lambda: obtener_turno_por_id(
+        turno_id=ids["turno"], db=db, user=user, scope="ANY",
+    ), TurnoOut.model_validate)
+    assert n == 1
+
+
+def test_post_turno(db, datos, capturar_sql):
+    user, ids = datos
+    payload = TurnoCreate(
+        paciente_id=ids["paciente_libre"],
+        profesional_id=ids["profesional"],
+        fecha_hora_inicio=LUNES + timedelta(days=14),
+        fecha_hora_fin=LUNES + timedelta(days=14, minutes=30),
+    )
+    _calentar_caches(db, ids)
+    n = _contar(capturar_sql, db, lambda: crear_turno(
+        payload=payload, db=db, user=user, scope="ANY",
+    ), TurnoOut.model_validate)
+    # validación (paciente/profesional con agenda_version, solapamientos, bloqueos), INSERT turno,
+    # INSERT notificación, relectura. Horario y reglas recurrentes salen del cache.
+    assert n == 4, n
+
+
+def _contar_lote(capturar_sql, db, user, ids, inicio: datetime, semanas: int) -> int:
+    payload = TurnoLoteCreate(
+        paciente_id=ids["paciente_libre"],
+        profesional_id=ids["profesional"],
+        slots=[
+            SlotTurno(fecha_hora_inicio=inicio + timedelta(weeks=s), fecha_hora_fin=inicio + timedelta(weeks=s, minutes=30))
+            for s in range(semanas)
+        ],
+    )
+    return _contar(capturar_sql, db, lambda: crear_turnos_en_lote(
+        payload=payload, db=db, user=user, scope="ANY",
+    ), TurnoLoteOut.model_validate)
+
+
+def test_post_turnos_lote_no_crece_por_slot(db, datos, capturar_sql):
+    user, ids = datos
+    # validación del lote, INSERT de turnos, INSERT multi-fila de notificaciones y relectura: nada por slot
+    _calentar_caches(db, ids)
+    pocos = _contar_lote(capturar_sql, db, user, ids, LUNES + timedelta(weeks=4), 2)
+    muchos = _contar_lote(capturar_sql, db, user, ids, LUNES + timedelta(weeks=10), 8)
+    assert muchos == pocos, (pocos, muchos)
+
+
+def test_confirmar_turno(db, datos, capturar_sql):
+    user, ids = datos
+    n = _contar(capturar_sql, db, lambda: confirmar_turno(
+        turno_id=ids["turno"], db=db, user=user, scope="ANY",
+    ), TurnoOut.model_validate)
+    # SELECT ... FOR UPDATE, paciente, profesional, 3 INSERT de notificaciones (confirmación y dos
+    # recordatorios), UPDATE, relectura
+    assert n == 8, n
+
+
+def test_cancelar_turno(db, datos, capturar_sql):
+    user, ids = datos
+    n = _contar(capturar_sql, db, lambda: cancelar_turno(
+        turno_id=ids["turno"], db=db, user=user, scope="ANY",
+    ), TurnoOut.model_validate)
+    assert n <= 8, n
+
+
+def test_get_bloqueos(db, datos, capturar_sql):
+    user, ids = datos
+    n = _contar(capturar_sql, db, lambda: obtener_bloqueos_agenda(
+        profesional_id=ids["profesional"], desde=None, hasta=None, limit=200, offset=0,
+        db=db, user=user, scope="ANY",
+    ), lambda bloqueos: [BloqueoAgendaOut.model_validate(b) for b in bloqueos])
+    assert n == 1
+
+
+def test_get_bloqueo_por_id(db, datos, capturar_sql):
+    user, ids = datos
+    n = _contar(capturar_sql, db, lambda: obtener_bloqueo_por_id(
+        bloqueo_id=ids["bloqueo"], db=db, user=user, scope="ANY",
+    ), BloqueoAgendaOut.model_validate)
+    assert n == 1
@@ -0,0 +1,94 @@
+# Alta de turnos en lote (crear_turnos_lote): modos todo_o_nada y mejor_esfuerzo.
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+
+from app.models.bloqueo_agenda_model import BloqueoAgenda
+from app.models.notificacion_model import Notificacion
+from app.models.paciente_model import Paciente
+from app.models.profesional_model import Profesional
+from app.models.turno_model import Turno
+from app.services.turnos_service import crear_turnos_lote
+
+LUNES = datetime(2030, 3, 4, 9, 0)
+HORA = timedelta(hours=1)
+
+
+@pytest.fixture
+def agenda(db):
+    profesional = Profesional(nombre="Ana", especialidad="Kinesiología")
+    paciente = Paciente(nombre="Juan", nombre_normalizado="juan", telefono="1", canal_contacto="whatsapp")
+    otro = Paciente(nombre="Eva", nombre_normalizado="eva", telefono="2", canal_contacto="sms")
+    db.add_all([profesional, paciente, otro])
+    db.flush()
+    # ocupado a las 11 por otro paciente y bloqueado a las 14
+    db.add_all([
+        Turno(paciente_id=otro.id, profesional_id=profesional.id, estado_id=1,
+              fecha_hora_inicio=LUNES + 2 * HORA, fecha_hora_fin=LUNES + 3 * HORA),
+        BloqueoAgenda(profesional_id=profesional.id, fecha_hora_inicio=LUNES + 5 * HORA,
+                      fecha_hora_fin=LUNES + 6 * HORA, creado_en=LUNES, activo=True),
+    ])
+    db.commit()
+    return {"paciente_id": paciente.id, "profesional_id": profesional.id}
+
+
+def _slot(horas: float, duracion: float = 1) -> tuple[datetime, datetime]:
+    inicio = LUNES + timedelta(hours=horas)
+    return inicio, inicio + timedelta(hours=duracion)
+
+
+SLOTS = [
+    _slot(0),       # 9: libre
+    _slot(2),       # 11: turno de otro paciente
+    _slot(3.5),     # 12:30: libre
+    _slot(4, 0.5),  # 13: se superpone con el de 12:30 del mismo lote
+    _slot(5),       # 14: bloqueado
+    _slot(7),       # 16: libre
+]
+
+
+def _cantidad(db, modelo) -> int:
+    return db.scalar(select(func.count()).select_from(modelo))
+
+
+def test_todo_o_nada_con_conflictos_da_409_y_no_inserta(db, agenda):
+    with pytest.raises(HTTPException) as e:
+        crear_turnos_lote(db, **agenda, slots=SLOTS, modo="todo_o_nada")
+
+    assert e.value.status_code == 409
+    assert len(e.value.detail["conflictos"]) == 3
+    db.rollback()
+    assert _cantidad(db, Turno) == 1
+    assert _cantidad(db, Notificacion) == 0
+
+
+def test_todo_o_nada_sin_conflictos_crea_todos(db, agenda):
+    creados, conflictos = crear_turnos_lote(db, **agenda, slots=[_slot(0), _slot(1), _slot(3)], modo="todo_o_nada")
+
+    assert conflictos == []
+    assert len(creados) == 3 and all(t.id for t in creados)
+    assert _cantidad(db, Turno) == 4
+
+
+def test_mejor_esfuerzo_crea_los_libres_y_detalla_cada_conflicto(db, agenda):
+    creados, conflictos = crear_turnos_lote(db, **agenda, slots=SLOTS, modo="mejor_esfuerzo")
+
+    assert [(t.fecha_hora_inicio, t.fecha_hora_fin) for t in creados] == [SLOTS[0], SLOTS[2], SLOTS[5]]
+    assert {(c["fecha_hora_inicio"], c["detalle"]) for c in conflictos} == {
+        (SLOTS[1][0], "El profesional ya tiene un turno en ese horario"),
+        (SLOTS[3][0], "Se superpone con otro turno del mismo lote."),
+        (SLOTS[4][0], "Horario bloqueado en agenda para ese profesional."),
+    }
+    assert _cantidad(db, Turno) == 4
+    # una solicitud de confirmación por turno creado
+    assert db.scalars(select(Notificacion.turno_id).order_by(Notificacion.turno_id)).all() == sorted(t.id for t in creados)
+
+
+def test_mejor_esfuerzo_sin_ningun_slot_libre(db, agenda):
+    creados, conflictos = crear_turnos_lote(db, **agenda, slots=[_slot(2), _slot(5)], modo="mejor_esfuerzo")
+
+    assert creados == []
+    assert len(conflictos) == 2
+    assert _cantidad(db, Turno) == 1
@@ -0,0 +1,117 @@
+# validar_reserva tiene que ver en el acto lo que se cargó desde otra réplica, aunque los caches en
+# memoria de esta instancia (bloqueos_cache, horarios_service) estén calientes y sin invalidar: la otra
+# réplica solo deja en la base la versión nueva de la agenda del profesional.
+from datetime import datetime, time, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import update
+
+from app.models.bloqueo_agenda_model import BloqueoAgenda
+from app.models.bloqueo_recurrente_model import BloqueoRecurrente
+from app.models.horario_atencion_model import HorarioAtencion
+from app.models.paciente_model import Paciente
+from app.models.profesional_model import Profesional
+from app.services.disponibilidad_service import intervalos_ocupados
+from app.services.horarios_service import obtener_horario
+from app.services.turnos_service import crear_turnos_lote, validar_reserva
+
+LUNES = datetime(2030, 3, 4, 10, 0)
+
+
+@pytest.fixture
+def reserva(db):
+    profesional = Profesional(nombre="Ana", especialidad="Kinesiología")
+    paciente = Paciente(nombre="Juan", nombre_normalizado="juan", telefono="1", canal_contacto="whatsapp")
+    db.add_all([profesional, paciente])
+    db.commit()
+    datos = {"paciente_id": paciente.id, "profesional_id": profesional.id, "inicio": LUNES, "fin": LUNES + timedelta(hours=1)}
+    # calienta los caches de esta instancia
+    validar_reserva(db, **datos)
+    intervalos_ocupados(db, profesional.id, LUNES - timedelta(days=1), LUNES + timedelta(days=7))
+    assert obtener_horario(db, profesional.id) is None  # sin horario cargado: queda en cache "sin restricción"
+    return datos
+
+
+def _rechazo(db, datos) -> str:
+    with pytest.raises(HTTPException) as e:
+        validar_reserva(db, **datos)
+    assert e.value.status_code == 409
+    return e.value.detail
+
+
+def test_bloqueo_de_otra_replica(db, reserva):
+    db.add(BloqueoAgenda(
+        profesional_id=reserva["profesional_id"],
+        fecha_hora_inicio=LUNES - timedelta(minutes=30),
+        fecha_hora_fin=LUNES + timedelta(minutes=30),
+        creado_en=LUNES,
+        activo=True,
+    ))
+    db.commit()  # sin invalidar_bloqueos: como si lo hubiera creado otra instancia
+
+    assert "bloqueado" in _rechazo(db, reserva)
+
+
+def test_bloqueo_recurrente_de_otra_replica(db, reserva):
+    db.add(BloqueoRecurrente(
+        profesional_id=reserva["profesional_id"],
+        dias_semana="0",  # lunes
+        hora_inicio=time(9, 30),
+        hora_fin=time(10, 30),
+        vigente_desde=LUNES.date() - timedelta(days=7),
+        creado_en=LUNES,
+        activo=True,
+    ))
+    _subir_version_agenda(db, reserva["profesional_id"])
+    db.commit()
+
+    assert "bloqueado" in _rechazo(db, reserva)
+
+
+def _subir_version_agenda(db, profesional_id: int):
+    # lo que hace invalidar_horarios en la otra réplica, sin tocar el cache de esta
+    db.execute(
+        update(Profesional).where(Profesional.id == profesional_id).values(agenda_version=Profesional.agenda_version + 1)
+    )
+
+
+def _horario_de_tarde(db, profesional_id: int):
+    # lunes de 14 a 18: el turno de las 10 queda afuera
+    db.add(HorarioAtencion(profesional_id=profesional_id, dia_semana=0, hora_inicio=time(14), hora_fin=time(18)))
+    _subir_version_agenda(db, profesional_id)
+    db.commit()
+
+
+def test_horario_de_otra_replica(db, reserva):
+    _horario_de_tarde(db, reserva["profesional_id"])
+
+    assert "horario de atención" in _rechazo(db, reserva)
+
+
+def test_horario_de_otra_replica_en_lote(db, reserva):
+    _horario_de_tarde(db, reserva["profesional_id"])
+
+    creados, conflictos = crear_turnos_lote(
+        db,
+        paciente_id=reserva["paciente_id"],
+        profesional_id=reserva["profesional_id"],
+        slots=[(reserva["inicio"], reserva["fin"]), (LUNES.replace(hour=15), LUNES.replace(hour=16))],
+        modo="mejor_esfuerzo",
+    )
+
+    assert [t.fecha_hora_inicio.hour for t in creados] == [15]
+    assert [c["detalle"] for c in conflictos] == ["Fuera del horario de atención del profesional."]
+
+
+def test_horario_sale_del_cache_mientras_no_cambia_la_version(db, reserva, capturar_sql):
+    def _lee_horario() -> bool:
+        with capturar_sql() as sql:
+            validar_reserva(db, **reserva)
+        return any("horarios_atencion" in sentencia for sentencia, _ in sql.sentencias)
+
+    assert not _lee_horario()
+    _subir_version_agenda(db, reserva["profesional_id"])
+    db.commit()
+    assert _lee_horario()
+    assert not _lee_horario()